@@ -0,0 +1,51 @@
+"""
+Times building a Columnar.ClientColumns table from a synthetic 10k-client sweep of RF
+responses, and a per-AP percentile over it.
+Run from the repository root with: python -m benchmarks.bench_columnar
+"""
+
+import random
+from time import perf_counter
+
+# pylint: disable=import-error
+from src.cisco_wlc_api.Columnar import ClientColumns
+
+CLIENTS = 10_000
+APS = 200
+
+
+def rf_response(n: int) -> dict:
+    """Builds an Endpoints.Clients.Client.RF response for the nth client"""
+    values = {
+        "Hostname": f"host{n}",
+        "SSID": "corp",
+        "AP Name": f"ap{n % APS}",
+        "Channel": str(random.choice((1, 6, 11, 36, 44, 149))),
+        "ConnRate": str(random.choice((72, 144, 433, 866))),
+        "RSSI": str(-random.randint(30, 90)),
+        "SNR": str(random.randint(5, 60)),
+        "volume": str(random.randint(0, 10**9)),
+        "ConnScore": str(random.randint(0, 100)),
+    }
+    return {"data": [{"key": k, "value": v} for (k, v) in values.items()]}
+
+
+def main():
+    """Prints how long building and aggregating the table took"""
+    details = {
+        f"02:00:00:00:{n >> 8:02x}:{n & 255:02x}": rf_response(n)
+        for n in range(CLIENTS)
+    }
+    start = perf_counter()
+    table = ClientColumns.from_responses(details)
+    built = perf_counter()
+    medians = {
+        ap: t.percentile("rf_rssi", 50) for (ap, t) in table.group_by("ap").items()
+    }
+    grouped = perf_counter()
+    print(f"built {table!r} in {1000 * (built - start):.1f} ms")
+    print(f"median RSSI for {len(medians)} APs in {1000 * (grouped - built):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
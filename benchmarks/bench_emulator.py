@@ -0,0 +1,62 @@
+"""
+Times listing and refreshing every client of an emulated WLC with realistic latency,
+answered in-process and over local HTTP, as a reproducible load target.
+Run from the repository root with: python -m benchmarks.bench_emulator
+"""
+
+from time import perf_counter
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import CiscoWLCAPI
+from src.cisco_wlc_api.Emulator import Fixtures, WLCEmulator
+
+CLIENTS = 500
+LATENCY = 0.02
+JITTER = 0.01
+MAX_IN_FLIGHT = 8
+
+
+def run(name: str, wlc: CiscoWLCAPI):
+    """Prints how long listing and refreshing every client took"""
+    start = perf_counter()
+    clients = wlc.clients
+    listed = perf_counter()
+    result = wlc.refresh_all_clients(clients)
+    refreshed = perf_counter()
+    print(
+        f"{name}: listed {len(clients)} clients in {1000 * (listed - start):.0f} ms, "
+        f"refreshed them in {refreshed - listed:.1f} s ({result!r})"
+    )
+    print(f"  {wlc.session.stats!r}")
+
+
+def main():
+    """Runs the benchmark against the emulator in-process, then over HTTP"""
+    emulator = WLCEmulator(
+        Fixtures(clients=CLIENTS, aps=50, apps=40),
+        latency=LATENCY,
+        jitter=JITTER,
+        seed=0,
+    )
+    run(
+        "in-process",
+        CiscoWLCAPI(
+            base_uri="https://127.0.0.1",
+            credentials=("admin", "password"),
+            max_in_flight=MAX_IN_FLIGHT,
+            transport=emulator.adapter(),
+        ),
+    )
+    with emulator.serve() as server:
+        run(
+            "HTTP",
+            CiscoWLCAPI(
+                base_uri=server.base_uri,
+                credentials=("admin", "password"),
+                max_in_flight=MAX_IN_FLIGHT,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
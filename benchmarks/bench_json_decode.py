@@ -0,0 +1,91 @@
+"""
+Compares decoding large client-table.html payloads with requests' Response.json() against
+the session's decode(), with orjson and with the standard library, including the cost of
+a second caller decoding the same response.
+Run from the repository root with: python -m benchmarks.bench_json_decode
+"""
+
+import json
+from time import perf_counter
+
+import requests
+
+# pylint: disable=import-error
+from src.cisco_wlc_api.Core import decode_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+COUNTS = (10_000, 50_000)
+REPEATS = 5
+
+
+def client_table(count: int) -> bytes:
+    """Builds a body shaped like a page of Endpoints.Clients.List with count rows"""
+    rows = [
+        {
+            "macaddr": f"02:00:00:{n >> 16 & 255:02x}:{n >> 8 & 255:02x}:{n & 255:02x}",
+            "HN": f"host-{n}.example.com",
+            "IP": f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}",
+            "devtype": "Apple-iPhone" if n % 3 else "Windows10-Workstation",
+            "ap_name": f"AP-{n % 400:04d}",
+            "ssid": "corp" if n % 4 else "guest",
+            "bytes_total": str(n * 1043),
+            "usage": str(n * 31),
+            "status": "Associated",
+            "protocol": "802.11ac(5 GHz)",
+            "icon": "iphone",
+        }
+        for n in range(count)
+    ]
+    return json.dumps({"total": count, "data": rows}).encode("utf-8")
+
+
+def response(body: bytes) -> requests.Response:
+    """Wraps a body in a requests.Response, as received from the WLC"""
+    result = requests.Response()
+    result.status_code = 200
+    result.encoding = "utf-8"
+    # pylint: disable=protected-access
+    result._content = body
+    return result
+
+
+def best(function) -> float:
+    """Returns the quickest of several timings of function, in milliseconds"""
+    timings = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+    return 1000 * min(timings)
+
+
+def twice(decode, body: bytes):
+    """Decodes a fresh response twice, as the model code did before decode()"""
+    result = response(body)
+    decode(result)
+    decode(result)
+
+
+def main():
+    """Prints how long decoding took with each method at each payload size"""
+    methods = {
+        "Response.json() twice": lambda r: r.json(),
+        "decode() json.loads": lambda r: decode_json(r, json.loads),
+    }
+    if orjson is not None:
+        methods["decode() orjson.loads"] = lambda r: decode_json(r, orjson.loads)
+    else:
+        print("orjson isn't installed; only the standard library is compared")
+    for count in COUNTS:
+        body = client_table(count)
+        print(f"{count} clients, {len(body) / 1e6:.1f} MB:")
+        for (name, decode) in methods.items():
+            print(f"  {name:<24}{best(lambda d=decode: twice(d, body)):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares the memory used by the __slots__-based Client and Application models against
+equivalent dict-based models laid out like the ones they replaced.
+Run from the repository root with: python -m benchmarks.bench_model_memory
+"""
+
+import gc
+import tracemalloc
+
+# pylint: disable=import-error
+from src.cisco_wlc_api.Models import Application, Client
+
+COUNTS = (10_000, 100_000)
+
+
+# pylint: disable=too-many-instance-attributes,too-few-public-methods
+class LegacyClient:
+    """A Client laid out as it was before __slots__: every attribute in a __dict__,
+    and the raw responses of every refresh kept in _last"""
+
+    def __init__(self, session, macaddr, ip4=None, hostname=None, devtype=None):
+        self._session = session
+        self.MAC = macaddr
+        self.IP4 = ip4
+        self.IP6 = None
+        self.Hostname = hostname
+        self.Icon = None
+        self.Type = devtype
+        for name in (
+            "VLAN is_fastlane mobility_role qos_wmm qos_apsd qos_level rf_width "
+            "rf_width_max rf_rate rf_spatial_streams rf_spatial_streams_max rf_channel "
+            "rf_capability rf_rssi rf_snr rf_connection_score security_acl_v4 "
+            "security_acl_v6 security_cipher security_kmp security_policy"
+        ).split():
+            setattr(self, name, None)
+        self._last = {
+            "apps": [],
+            "mobility": [],
+            "network": {},
+            "qos": {},
+            "rf": {},
+            "security": {},
+        }
+
+
+class LegacyApplication:
+    """An Application laid out as it was before __slots__"""
+
+    def __init__(self, name, bytes_total, session, mac_address=None):
+        self.Name = name
+        self.Icon = None
+        self.BytesTotal = bytes_total
+        self.BytesRecently = None
+        self.MAC = mac_address
+        self._session = session
+        self._last = {"client_apps": {}, "network_apps": {}}
+
+
+def measure(factory, count: int) -> int:
+    """Returns the number of bytes allocated while creating count models"""
+    gc.collect()
+    tracemalloc.start()
+    models = [factory(n) for n in range(count)]
+    (used, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+    return used
+
+
+def mac(n: int) -> str:
+    """Builds a distinct MAC address for the nth model"""
+    return ":".join(f"{b:02x}" for b in n.to_bytes(6, "big"))
+
+
+def main():
+    """Prints the memory used by old and new models at each count"""
+    factories = {
+        "Client": (
+            lambda n: LegacyClient(None, mac(n), "10.0.0.1", "host", "phone"),
+            lambda n: Client(
+                None, mac(n), ip4="10.0.0.1", hostname="host", devtype="phone"
+            ),
+        ),
+        "Application": (
+            lambda n: LegacyApplication(f"app{n}", n, None, mac(n)),
+            lambda n: Application(f"app{n}", n, None, mac_address=mac(n)),
+        ),
+    }
+    for (name, (legacy, compact)) in factories.items():
+        for count in COUNTS:
+            old = measure(legacy, count)
+            new = measure(compact, count)
+            print(
+                f"{name:<12}{count:>8} models: dict-based {old / 2**20:8.1f} MiB "
+                f"({old // count} B each), slots {new / 2**20:8.1f} MiB "
+                f"({new // count} B each), {100 * (old - new) / old:5.1f}% smaller"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,504 @@
+# pylint: disable=invalid-name
+
+"""
+asyncio counterparts to CiscoWLCAPI, CiscoWLCAPISession and the models that make requests.
+These share endpoints, parsing and validation with the requests-based classes, but perform
+their requests over a pooled httpx.AsyncClient, which must be installed separately.
+"""
+
+import asyncio
+from math import ceil
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# pylint: disable=relative-beyond-top-level
+from . import Cache, Endpoints, Exceptions, Models, Pagination, Validators
+from .Core import DEFAULT_DECODER, CiscoWLCAPISession, decode_json
+from .Decorators import must_auth_async
+from .WLC import CLIENTS_QUERY, TOP_APPS_QUERY
+
+
+class AsyncCiscoWLCAPISession:
+    """httpx.AsyncClient wrapper with methods specifically for dealing with requests
+    to the Cisco WLC web interface"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        base_uri: str = "",
+        credentials: tuple = None,
+        verify_tls: bool = True,
+        max_in_flight: int = None,
+        json_decoder=DEFAULT_DECODER,
+        table_ttl: float = Cache.DEFAULT_TTL,
+        **kwargs,
+    ):
+        """
+        Asynchronous session object with method changes specific to the Cisco WLC's API
+        :param base_uri:
+        A URI corresponding to the base address of a Cisco WLC, including protocol,
+        but NOT any sub-paths or trailing slashes
+        :param credentials:
+        A tuple containing a string with the administrator username and a string with
+        the corresponding password
+        :param verify_tls:
+        A boolean indicating whether the TLS certificate should be verified.
+        :param max_in_flight:
+        The maximum number of requests that may be in progress over this session at any
+        one time. Defaults to no limit.
+        :param json_decoder:
+        A function taking a response body as bytes and returning the decoded object, used
+        by decode(). Defaults to orjson.loads if orjson is installed, else json.loads.
+        :param table_ttl:
+        The time in seconds for which tables fetched on behalf of models, such as each
+        client's applications, are shared between every model using this session
+        :param kwargs:
+        Keyword arguments passed directly to the httpx.AsyncClient constructor, such as
+        limits to size its connection pool, or timeout
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncCiscoWLCAPISession requires httpx, which is not installed"
+            )
+        Validators.baseurl(base_uri)
+        self._base_uri = base_uri
+        Validators.credential(credentials)
+        self._client = httpx.AsyncClient(auth=credentials, verify=verify_tls, **kwargs)
+        self._last_url = None
+        self._last_method = None
+        self._last_kwargs = None
+        self.authed = False
+        # asyncio primitives are created on first use, inside the event loop that uses
+        #  them, since before Python 3.10 they bind to the loop current when created
+        self._auth_lock = None
+        self._auth_ready = None
+        # counts login attempts, like CiscoWLCAPISession's, along with the latest one
+        #  known to have been accepted by the WLC
+        self._auth_generation = 0
+        self._auth_proven = 0
+        self.response = None
+        self.json_decoder = json_decoder
+        self.tables = Cache.ModelCache(
+            ttl=table_ttl, maxsize=Cache.DEFAULT_RESPONSE_SIZE
+        )
+        self.max_in_flight = max_in_flight
+        self._in_flight = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes every pooled connection held by the session"""
+        await self._client.aclose()
+
+    async def retry_last(self):
+        """
+        Simple function to perform the most recently-performed request again
+        :return:
+        An httpx.Response object with the response data
+        """
+        if self._last_url is None:
+            raise Exceptions.NoPreviousRequestError("No previous request to retry.")
+        return await self.request(
+            method=self._last_method, url=self._last_url, **self._last_kwargs
+        )
+
+    async def request(self, method: str, url: str, **kwargs):
+        """
+        Performs a request with the given method against the given endpoint
+        :param method:
+        HTTP method to perform the request using, such as 'GET' or 'POST'
+        :param url:
+        Cisco WLC API endpoint to perform the request against, relative to the base URL.
+        This should be a string from the cisco_wlc_api.Endpoints class
+        :param kwargs:
+        Keyword arguments passed directly to httpx.AsyncClient.request()
+        :return:
+        An httpx.Response object with the response data
+        """
+        self._last_url = url
+        self._last_method = method
+        self._last_kwargs = kwargs
+        generation = await self._settled_generation()
+        response = await self._send(method, url, **kwargs)
+        replayed = False
+        while response.status_code == 401:
+            if generation == self._auth_generation and not self.authed:
+                # never logged in, or the last attempt failed; nothing to renew
+                break
+            if (
+                replayed
+                and generation == self._auth_generation
+                and generation != self._auth_proven
+            ):
+                # a fresh login the WLC rejected outright, not one that's expired since
+                self.response = response
+                raise Exceptions.SessionExpiredError(
+                    "Session authentication has timed out and could not be renewed."
+                )
+            # the session expired, or another task started logging in again after
+            #  this request was sent; wait for a single login and replay the request
+            await self._reauthenticate(generation)
+            generation = await self._settled_generation()
+            response = await self._send(method, url, **kwargs)
+            replayed = True
+        if response.status_code != 401 and generation > self._auth_proven:
+            self._auth_proven = generation
+        self.response = response
+        return response
+
+    def _limit(self):
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        return self._in_flight
+
+    def _lock(self) -> asyncio.Lock:
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        return self._auth_lock
+
+    def _ready(self) -> asyncio.Event:
+        if self._auth_ready is None:
+            self._auth_ready = asyncio.Event()
+            self._auth_ready.set()
+        return self._auth_ready
+
+    async def _settled_generation(self) -> int:
+        # waits out any login in progress, and returns the generation of the last one
+        while True:
+            await self._ready().wait()
+            if self._ready().is_set():
+                return self._auth_generation
+
+    async def _send(self, method: str, url: str, **kwargs):
+        # contextlib.nullcontext can't be used asynchronously before Python 3.10
+        if self.max_in_flight is None:
+            return await self._client.request(
+                method=method, url=f"{self._base_uri}/{url}", **kwargs
+            )
+        async with self._limit():
+            return await self._client.request(
+                method=method, url=f"{self._base_uri}/{url}", **kwargs
+            )
+
+    async def login(self) -> bool:
+        """
+        Authenticates with the WLC, usually in a single round-trip; the request is only
+        repeated if the WLC answers it with a 401 challenge
+        :return:
+        True once authenticated; an exception is raised otherwise
+        """
+        async with self._lock():
+            return await self._login()
+
+    async def _login(self) -> bool:
+        self._ready().clear()
+        try:
+            self.authed = False
+            self._auth_generation += 1
+            response = await self._send("GET", Endpoints.Dashboard)
+            if response.status_code == 401:
+                response = await self._send("GET", Endpoints.Dashboard)
+            self.response = response
+            Validators.response_code(response=response, response_type=httpx.Response)
+            self.authed = True
+            return self.authed
+        finally:
+            self._ready().set()
+
+    async def _reauthenticate(self, generation: int):
+        async with self._lock():
+            if self._auth_generation != generation:
+                # somebody else tried logging in again while this task was waiting
+                if self.authed:
+                    return
+                raise Exceptions.SessionExpiredError(
+                    "Session authentication has timed out and logging in again failed."
+                )
+            try:
+                await self._login()
+            except Exceptions.UnexpectedResponseStatusError as exc:
+                raise Exceptions.SessionExpiredError(
+                    "Session authentication has timed out and logging in again failed."
+                ) from exc
+
+    async def get(self, url: str, **kwargs):
+        """Performs a GET request against the given endpoint"""
+        return await self.request("GET", url, **kwargs)
+
+    def decode(self, response=None):
+        """
+        Decodes the JSON body of a response using the session's json_decoder, only once.
+        Responses with any status other than 200 raise UnexpectedResponseStatusError.
+        :param response:
+        The response to decode; defaults to the most recent response
+        :return:
+        The decoded body
+        """
+        response = response if response is not None else self.response
+        Validators.response_code(response=response, response_type=httpx.Response)
+        return decode_json(response, self.json_decoder)
+
+    async def get_json(self, url: str, **kwargs):
+        """Performs a GET request against the given endpoint and returns its decoded
+        body; keyword arguments are passed directly to get()"""
+        return self.decode(await self.get(url, **kwargs))
+
+    map_kv = CiscoWLCAPISession.map_kv
+
+
+async def paginate(session, endpoint: str, query: Pagination.Query = None) -> list:
+    """
+    Requests every row of a list endpoint. Once the first page has given the total
+    number of rows, the remaining pages are requested concurrently, limited only by the
+    session's max_in_flight.
+    :param session:
+    An AsyncCiscoWLCAPISession object provided from the caller
+    :param endpoint:
+    The list endpoint to request, from the Endpoints class
+    :param query:
+    The Query to request; defaults to one with no sorting or filtering
+    :return:
+    A list of every row, in the order the WLC returned them
+    """
+    query = query if query is not None else Pagination.Query()
+
+    async def fetch(page: int) -> dict:
+        return await session.get_json(endpoint, params=query.params(page))
+
+    first = await fetch(1)
+    rows = list(first.get("data", None) or [])
+    if "total" in first:
+        pages = range(2, ceil(int(first["total"]) / query.page_size) + 1)
+        for body in await asyncio.gather(*(fetch(page) for page in pages)):
+            rows += body.get("data", None) or []
+        return rows
+    # without a total there's no telling how many pages there are, so walk them
+    page = 1
+    while len(rows) == page * query.page_size:
+        page += 1
+        rows += (await fetch(page)).get("data", None) or []
+    return rows
+
+
+async def client_apps(session, mac: str) -> list:
+    """Returns every application used by a client, sharing the table through
+    session.tables in the same way as Models.client_apps()"""
+    data = session.tables.get(Endpoints.Clients.Client.Apps, mac)
+    if data is None:
+        data = await paginate(
+            session, Endpoints.Clients.Client.Apps, Models.client_apps_query(mac)
+        )
+        session.tables.set(Endpoints.Clients.Client.Apps, mac, data)
+    return data
+
+
+class AsyncApplication(Models.Application):
+    """Application model whose refresh is performed asynchronously"""
+
+    __slots__ = ()
+
+    async def refresh(self):
+        """Refreshes the Application data if possible"""
+        if self.MAC is not None:
+            self._apply_client_app(await client_apps(self._session, self.MAC))
+            return
+        (endpoint, params) = self._query()
+        data = self._cache.get(endpoint, self.Name)
+        if data is None:
+            data = (await self._session.get_json(endpoint, params=params))["data"]
+            self._cache.set(endpoint, self.Name, data)
+        self._apply_global_app(data)
+
+
+class AsyncClient(Models.Client):
+    """Client model whose refresh methods are performed asynchronously"""
+
+    __slots__ = ()
+
+    async def refresh(self, fields: list = None):
+        """
+        Refreshes all data related to the client, requesting every detail endpoint
+        at once. If any request fails, the exception is raised and no data is changed.
+        :param fields:
+        Optional list of attribute or property names, such as ['rf_rssi', 'VLAN'];
+        if given, only the endpoints those fields are read from are requested
+        """
+        calls = self._refresh_calls(
+            self.groups_for(fields) if fields is not None else None
+        )
+        bodies = await asyncio.gather(*(call() for call in calls.values()))
+        self._apply_refresh(dict(zip(calls, bodies)))
+
+    async def _fetch(self, group: str) -> dict:
+        if group == "apps":
+            return {"data": await client_apps(self._session, self.MAC)}
+        body = self._cache.get(self._GROUPS[group], self.MAC)
+        if body is None:
+            body = await self._session.get_json(
+                self._GROUPS[group], params=self._params(group)
+            )
+            self._cache.set(self._GROUPS[group], self.MAC, body)
+        return body
+
+    async def _refresh_group(self, group: str):
+        self._commit(group, self._parse(group, await self._fetch(group)))
+
+    async def refresh_apps(self):
+        """Refreshes the application-specific bandwidth usage data"""
+        await self._refresh_group("apps")
+
+    async def refresh_mobility(self):
+        """Refreshes the Cisco Mobility-related data for the client"""
+        await self._refresh_group("mobility")
+
+    async def refresh_network(self):
+        """Refreshes the network-related data for the client"""
+        await self._refresh_group("network")
+
+    async def refresh_qos(self):
+        """Refreshes the QoS-related data for the client"""
+        await self._refresh_group("qos")
+
+    async def refresh_rf(self):
+        """Refreshes the RF-related data for the client"""
+        await self._refresh_group("rf")
+
+    async def refresh_security(self):
+        """Refreshes the client's security-related data from the WLC"""
+        await self._refresh_group("security")
+
+    @property
+    async def associated(self) -> bool:
+        """Returns a boolean indicating whether the client is currently associated"""
+        try:
+            await self.refresh_rf()
+        except Exceptions.QueryReturnedNoResultsError:
+            return False
+        return True
+
+    @property
+    async def bytes_total(self) -> int:
+        """The total count of bytes transmitted or received by the client"""
+        await self.refresh_rf()
+        return self._bytes_total
+
+    @property
+    async def uptime(self) -> int:
+        """The time in seconds that a client has been associated to the AP"""
+        await self.refresh_rf()
+        return self._uptime
+
+    @property
+    async def apps(self) -> list[AsyncApplication]:
+        """Fetch application-specific bandwidth usage for this client"""
+        await self.refresh_apps()
+        return [
+            AsyncApplication(
+                name=app["name"],
+                bytes_total=int(app["bytes_total"]),
+                session=self._session,
+                mac_address=self.MAC,
+            )
+            for app in self._apps
+        ]
+
+
+class AsyncCiscoWLCAPI:
+    """
+    Class for interacting with the Cisco WLC's API in a user-friendly way from asyncio code
+    """
+
+    def __init__(
+        self,
+        base_uri: str = "",
+        credentials: tuple = None,
+        verify_tls: bool = False,
+        max_in_flight: int = None,
+        **kwargs,
+    ):
+        """
+        Creates an AsyncCiscoWLCAPI object
+        :param base_uri:
+        Base URI of the Cisco WLC's web interface, including protocol, but
+        excluding any sub-paths or trailing slashes
+        :param credentials:
+        Tuple containing two strings, one the username and one the password
+        :param verify_tls:
+        Boolean indicating whether TLS certificates should be checked;
+        defaults to disabled
+        :param max_in_flight:
+        The maximum number of requests that may be in progress against the WLC at any
+        one time; defaults to no limit
+        :param kwargs:
+        Keyword arguments passed directly to the httpx.AsyncClient constructor
+        """
+        self.session = AsyncCiscoWLCAPISession(
+            base_uri=base_uri,
+            credentials=credentials,
+            verify_tls=verify_tls,
+            max_in_flight=max_in_flight,
+            **kwargs,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.aclose()
+
+    @property
+    def authenticated(self) -> bool:
+        """Whether the session is currently authenticated with the WLC"""
+        return self.session.authed
+
+    async def login(self):
+        """Attempts to authenticate with the WLC"""
+        return await self.session.login()
+
+    @property
+    @must_auth_async
+    async def client_count(self) -> int:
+        """The number of clients currently associated to the WLC"""
+        return int((await self.session.get_json(Endpoints.Clients.Counts))["total"])
+
+    @property
+    @must_auth_async
+    async def clients(self) -> list[AsyncClient]:
+        """A list of all clients currently associated to the WLC"""
+        return [
+            AsyncClient.from_row(session=self.session, row=row)
+            for row in await self.paginate(Endpoints.Clients.List, CLIENTS_QUERY)
+        ]
+
+    @property
+    @must_auth_async
+    async def top_apps(self) -> list[AsyncApplication]:
+        """A list of application-specific bandwidth information"""
+        return [
+            AsyncApplication.from_row(session=self.session, row=row)
+            for row in await self.paginate(Endpoints.WidgetSources.Apps, TOP_APPS_QUERY)
+        ]
+
+    @must_auth_async
+    async def paginate(
+        self, endpoint: str, query: Pagination.Query = None
+    ) -> list[dict]:
+        """
+        Requests every row of one of the WLC's list endpoints. Once the first page has
+        given the total number of rows, the remaining pages are requested concurrently,
+        limited only by the session's max_in_flight.
+        :param endpoint:
+        The list endpoint to request, from the Endpoints class
+        :param query:
+        A Pagination.Query describing sorting, server-side filters and page size
+        :return:
+        A list of every row, each a dict as returned by the WLC
+        """
+        return await paginate(self.session, endpoint, query)
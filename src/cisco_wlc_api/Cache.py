@@ -0,0 +1,278 @@
+# pylint: disable=invalid-name
+
+"""
+Caches used to avoid repeating identical requests to the WLC
+"""
+
+import threading
+from concurrent.futures import Future
+from time import monotonic
+
+from cachetools import TTLCache
+
+# pylint: disable=relative-beyond-top-level
+from . import Endpoints
+
+# How long, in seconds, a model keeps a response before requesting it again
+DEFAULT_TTL = 60
+# How many responses a single model keeps; a Client only queries six endpoints
+DEFAULT_SIZE = 16
+# How long, in seconds, a session keeps responses from each endpoint (or class of endpoints)
+#  WLAN and AVC profile configuration hardly ever changes, so it's kept much longer
+DEFAULT_RESPONSE_TTLS = {
+    Endpoints.Clients.Client: 5,
+    Endpoints.RF.List: 15 * 60,
+    Endpoints.RF.AVCProfile: 15 * 60,
+}
+# How many responses a single session keeps
+DEFAULT_RESPONSE_SIZE = 4096
+
+
+def endpoint_ttls(ttls: dict) -> dict:
+    """
+    Expands a mapping of endpoints to TTLs, where a key may be a class from Endpoints
+    standing for every endpoint declared within it (including nested classes).
+    Later entries override earlier ones.
+    :param ttls:
+    A dict where each key is an endpoint string or a class from Endpoints, and its value is
+    the time in seconds for which responses from it may be reused
+    :return:
+    A dict where each key is an endpoint string and its value is a TTL
+    """
+    expanded = {}
+    for (endpoint, ttl) in ttls.items():
+        if isinstance(endpoint, str):
+            expanded[endpoint] = ttl
+            continue
+        for (name, value) in vars(endpoint).items():
+            if name.startswith("_"):
+                continue
+            if isinstance(value, str):
+                expanded[value] = ttl
+            elif isinstance(value, type):
+                expanded.update(endpoint_ttls({value: ttl}))
+    return expanded
+
+
+def _normalise(params) -> tuple:
+    if not params:
+        return ()
+    items = params.items() if isinstance(params, dict) else params
+    return tuple(sorted((str(k), str(v)) for (k, v) in items))
+
+
+class ModelCache:
+    """Bounded, thread-safe TTL cache of decoded responses belonging to a single model
+    instance, keyed by endpoint and MAC address (or any other identifying value).
+    Because it holds no reference back to its model, it is released along with it."""
+
+    __slots__ = ("_lock", "_entries", "_ttl", "_maxsize")
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_SIZE):
+        """
+        Creates an empty cache
+        :param ttl:
+        The time in seconds for which a cached response is considered fresh
+        :param maxsize:
+        The maximum number of responses held at once; the least-recently-used response
+        is evicted once this is exceeded
+        """
+        self._lock = threading.Lock()
+        # created on first use, as most models are never refreshed
+        self._entries = None
+        self._ttl = ttl
+        self._maxsize = maxsize
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries) if self._entries is not None else 0
+
+    def get(self, endpoint: str, key: str = None):
+        """
+        Returns a cached response, or None if there is no fresh response cached
+        :param endpoint:
+        The endpoint the response was received from
+        :param key:
+        The MAC address or other value identifying what the response was about
+        """
+        with self._lock:
+            if self._entries is None:
+                return None
+            return self._entries.get((endpoint, key), None)
+
+    def set(self, endpoint: str, key: str, value):
+        """
+        Caches a response
+        :param endpoint:
+        The endpoint the response was received from
+        :param key:
+        The MAC address or other value identifying what the response was about
+        :param value:
+        The decoded response to cache
+        """
+        with self._lock:
+            if self._entries is None:
+                self._entries = TTLCache(maxsize=self._maxsize, ttl=self._ttl)
+            self._entries[(endpoint, key)] = value
+
+    def fetch(self, endpoint: str, key: str, function):
+        """
+        Returns a cached response, calling function to get and cache it if there is no
+        fresh response cached.
+        :param endpoint:
+        The endpoint the response is received from
+        :param key:
+        The MAC address or other value identifying what the response is about
+        :param function:
+        A callable taking no arguments that returns the decoded response
+        """
+        value = self.get(endpoint, key)
+        if value is None:
+            value = function()
+            self.set(endpoint, key, value)
+        return value
+
+    def discard(self, endpoint: str, key: str = None):
+        """
+        Discards a single cached response, if it's cached
+        :param endpoint:
+        The endpoint the response was received from
+        :param key:
+        The MAC address or other value identifying what the response was about
+        """
+        with self._lock:
+            if self._entries is not None:
+                self._entries.pop((endpoint, key), None)
+
+    def invalidate(self, *endpoints: str):
+        """
+        Discards cached responses, so that they're requested again on next use
+        :param endpoints:
+        The endpoints to discard responses from; if none are given, everything is discarded
+        """
+        with self._lock:
+            if self._entries is None:
+                return
+            if not endpoints:
+                self._entries.clear()
+                return
+            for entry in [k for k in self._entries.keys() if k[0] in endpoints]:
+                del self._entries[entry]
+
+
+class ResponseCache:
+    """Thread-safe cache of responses shared by everything using a single session, keyed on
+    method, endpoint and parameters. Identical requests made while one is already in progress
+    wait for and share its response, rather than each being sent to the WLC."""
+
+    def __init__(self, ttls: dict = None, maxsize: int = DEFAULT_RESPONSE_SIZE):
+        """
+        Creates an empty cache
+        :param ttls:
+        A dict where each key is an endpoint string or a class from Endpoints, and its value is
+        the time in seconds for which responses from it may be reused. Requests to endpoints
+        not listed are never cached or coalesced. Defaults to DEFAULT_RESPONSE_TTLS.
+        :param maxsize:
+        The maximum number of responses held at once
+        """
+        self.ttls = endpoint_ttls(DEFAULT_RESPONSE_TTLS if ttls is None else ttls)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pending = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def fetch(self, method: str, endpoint: str, params, function, store=None):
+        """
+        Returns a cached response, calling function to get it if there is no fresh
+        response cached and no identical request already in progress
+        :param method:
+        HTTP method the request is performed using
+        :param endpoint:
+        The endpoint the request is performed against
+        :param params:
+        The query parameters of the request, as a dict or a list of pairs
+        :param function:
+        A callable taking no arguments that performs the request and returns its response
+        :param store:
+        Optional callable taking a response and returning whether it may be cached;
+        uncacheable responses are still shared with identical requests already waiting
+        """
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return function()
+        key = (method.upper(), endpoint, _normalise(params))
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and entry[0] > monotonic():
+                self.hits += 1
+                return entry[1]
+            future = self._pending.get(key, None)
+            leader = future is None
+            if leader:
+                self.misses += 1
+                future = self._pending[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            value = function()
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._pending[key]
+            if store is None or store(value):
+                self._store(key, value, monotonic() + ttl)
+        future.set_result(value)
+        return value
+
+    def _store(self, key: tuple, value, expiry: float):
+        self._entries.pop(key, None)
+        self._entries[key] = (expiry, value)
+        if len(self._entries) > self.maxsize:
+            now = monotonic()
+            for stale in [k for (k, e) in self._entries.items() if e[0] <= now]:
+                del self._entries[stale]
+        while len(self._entries) > self.maxsize:
+            # dicts keep insertion order, so this is the oldest response
+            del self._entries[next(iter(self._entries))]
+
+    def discard(self, endpoint: str, params=None):
+        """
+        Discards the cached responses from an endpoint to requests with the given query
+        parameters, whatever their method or any other parameters they had
+        :param endpoint:
+        The endpoint the responses were received from
+        :param params:
+        The query parameters, as a dict or a list of pairs, such as a client's MAC address;
+        if none are given, every response from the endpoint is discarded
+        """
+        wanted = set(_normalise(params))
+        with self._lock:
+            for key in [
+                k for k in self._entries if k[1] == endpoint and wanted.issubset(k[2])
+            ]:
+                del self._entries[key]
+
+    def invalidate(self, *endpoints: str):
+        """
+        Discards cached responses, so that they're requested again on next use
+        :param endpoints:
+        The endpoints to discard responses from; if none are given, everything is discarded
+        """
+        with self._lock:
+            if not endpoints:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[1] in endpoints]:
+                del self._entries[key]
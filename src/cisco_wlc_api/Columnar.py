@@ -0,0 +1,189 @@
+# pylint: disable=invalid-name
+
+"""
+Column-oriented views of fleet-wide client metrics, built straight from WLC responses without
+creating any models. Each metric is one contiguous array of doubles, which can be handed to
+NumPy without copying via ClientColumns.to_numpy(), if NumPy is installed.
+"""
+
+from array import array
+from math import floor, isnan
+
+NaN = float("nan")
+
+# Key in an Endpoints.Clients.Client.RF response that each metric column is read from
+METRICS = {
+    "rf_rssi": "RSSI",
+    "rf_snr": "SNR",
+    "rf_rate": "ConnRate",
+    "rf_channel": "Channel",
+    "rf_connection_score": "ConnScore",
+    "bytes_total": "volume",
+}
+# Key in an Endpoints.Clients.Client.RF response that each label column is read from
+LABELS = {"ap": "AP Name", "ssid": "SSID"}
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NaN
+
+
+class ClientColumns:
+    """A table of client metrics stored one array per metric, indexed by MAC address"""
+
+    __slots__ = ("macs", "labels", "columns", "index")
+
+    def __init__(self, macs: list, labels: dict, columns: dict):
+        """
+        Creates a table from columns that are already built; see from_responses()
+        :param macs:
+        A list of the MAC address of the client in each row
+        :param labels:
+        A dict where each key is a label name from LABELS, and its value is a list of the
+        label of each row
+        :param columns:
+        A dict where each key is a metric name from METRICS, and its value is an array of
+        doubles holding the metric for each row, NaN where it wasn't reported
+        """
+        self.macs = macs
+        self.labels = labels
+        self.columns = columns
+        self.index = {mac: n for (n, mac) in enumerate(macs)}
+
+    @classmethod
+    def from_responses(cls, details: dict, rows: list = None):
+        """
+        Builds a table from per-client RF responses
+        :param details:
+        A dict where each key is a MAC address, and its value is the decoded response (or
+        just its 'data' list of key-value items) from Endpoints.Clients.Client.RF
+        :param rows:
+        Optional rows of the Endpoints.Clients.List table; if given, the table has a row
+        for each of them in the same order, and only for them
+        :return:
+        A ClientColumns object
+        """
+        macs = [row["macaddr"] for row in rows] if rows is not None else list(details)
+        wanted = {key: name for (name, key) in METRICS.items()}
+        wanted.update({key: name for (name, key) in LABELS.items()})
+        columns = {name: array("d", [NaN]) * len(macs) for name in METRICS}
+        labels = {name: [None] * len(macs) for name in LABELS}
+        for (n, mac) in enumerate(macs):
+            body = details.get(mac, None)
+            items = body.get("data", None) if isinstance(body, dict) else body
+            for item in items or ():
+                name = wanted.get(item["key"], None)
+                if name in columns:
+                    columns[name][n] = _number(item["value"])
+                elif name is not None:
+                    labels[name][n] = item["value"]
+        return cls(macs=macs, labels=labels, columns=columns)
+
+    def __len__(self):
+        return len(self.macs)
+
+    def __repr__(self):
+        return f"<ClientColumns (clients={len(self)}, metrics={list(self.columns)})>"
+
+    def row(self, mac: str) -> dict:
+        """
+        Returns every metric and label for one client
+        :param mac:
+        The MAC address of the client
+        """
+        n = self.index[mac]
+        result = {name: column[n] for (name, column) in self.columns.items()}
+        result.update({name: labels[n] for (name, labels) in self.labels.items()})
+        return result
+
+    def mask(self, metric: str, predicate) -> list[bool]:
+        """
+        Evaluates a condition against every value of a metric
+        :param metric:
+        A metric name from METRICS
+        :param predicate:
+        A callable taking a value and returning a boolean; it isn't called for NaN values,
+        which never match
+        :return:
+        A list of booleans, one per row, suitable for passing to select()
+        """
+        return [not isnan(v) and predicate(v) for v in self.columns[metric]]
+
+    def select(self, mask: list):
+        """
+        Returns a new table of only some of the rows of this one
+        :param mask:
+        A sequence of booleans, one per row, such as that returned by mask()
+        """
+        return self._take([n for (n, keep) in enumerate(mask) if keep])
+
+    def _take(self, rows: list):
+        return ClientColumns(
+            macs=[self.macs[n] for n in rows],
+            labels={k: [v[n] for n in rows] for (k, v) in self.labels.items()},
+            columns={
+                k: array("d", (v[n] for n in rows)) for (k, v) in self.columns.items()
+            },
+        )
+
+    def group_by(self, label: str = "ap") -> dict:
+        """
+        Splits the table by the value of a label
+        :param label:
+        A label name from LABELS, such as 'ap' or 'ssid'
+        :return:
+        A dict where each key is a value of the label, and its value is a ClientColumns
+        object holding the rows with that value
+        """
+        groups = {}
+        for (n, value) in enumerate(self.labels[label]):
+            groups.setdefault(value, []).append(n)
+        return {value: self._take(rows) for (value, rows) in groups.items()}
+
+    def values(self, metric: str) -> list[float]:
+        """Returns the values of a metric that aren't NaN"""
+        return [v for v in self.columns[metric] if not isnan(v)]
+
+    def total(self, metric: str) -> float:
+        """Returns the sum of a metric, ignoring missing values"""
+        return sum(self.values(metric))
+
+    def mean(self, metric: str) -> float:
+        """Returns the mean of a metric, ignoring missing values; NaN if there are none"""
+        values = self.values(metric)
+        return sum(values) / len(values) if values else NaN
+
+    def percentile(self, metric: str, q: float) -> float:
+        """
+        Returns a percentile of a metric, ignoring missing values, interpolating linearly
+        between the closest values in the same way as NumPy's default method
+        :param metric:
+        A metric name from METRICS
+        :param q:
+        The percentile to return, between 0 and 100
+        :return:
+        The percentile, or NaN if the metric has no values
+        """
+        values = sorted(self.values(metric))
+        if not values:
+            return NaN
+        position = (len(values) - 1) * q / 100
+        lower = floor(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    def to_numpy(self, metric: str):
+        """
+        Returns a metric as a NumPy array sharing memory with this table, for vectorized
+        operations. NumPy must be installed separately.
+        :param metric:
+        A metric name from METRICS
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy
+
+        return numpy.frombuffer(self.columns[metric], dtype=numpy.float64)
+
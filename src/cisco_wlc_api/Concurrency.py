@@ -0,0 +1,139 @@
+# pylint: disable=invalid-name
+
+"""
+Helpers for performing several WLC requests at once over a shared CiscoWLCAPISession
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+# requests' default connection pool keeps 10 connections per host, so staying below
+#  that avoids connections being thrown away after every fan-out
+DEFAULT_WORKERS = 6
+
+
+def fan_out(calls: dict, max_workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    Runs a set of callables concurrently on a bounded pool of worker threads
+    :param calls:
+    A dict where each key identifies a call, and its value is a callable taking no arguments
+    :param max_workers:
+    The maximum number of calls that may be in progress at any one time
+    :return:
+    A dict where each key is a key from calls, and its value is what that call returned.
+    If any call raised an exception, the first one (in the order of calls) is re-raised
+    once every call has finished, and no results are returned.
+    """
+    if not calls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls)))) as pool:
+        futures = {key: pool.submit(call) for (key, call) in calls.items()}
+    # leaving the with-block waits for every future, so nothing below can block
+    for future in futures.values():
+        if future.exception() is not None:
+            raise future.exception()
+    return {key: future.result() for (key, future) in futures.items()}
+
+
+class BulkResult:
+    """The outcome of a bulk operation performed against many items at once"""
+
+    def __init__(self, total: int = 0):
+        """
+        Collects partial results and errors from a bulk operation
+        :param total:
+        The number of items the bulk operation was started with
+        """
+        self.total = total
+        self.results = {}
+        self.errors = {}
+
+    def __repr__(self):
+        return (
+            f"<BulkResult (total={self.total}, succeeded={len(self.results)},"
+            f"failed={len(self.errors)})>"
+        )
+
+    @property
+    def done(self) -> int:
+        """The number of items that have finished, successfully or otherwise"""
+        return len(self.results) + len(self.errors)
+
+    @property
+    def ok(self) -> bool:
+        """Returns a boolean indicating whether every item succeeded"""
+        return not self.errors
+
+
+def sweep(
+    jobs: dict,
+    finish=None,
+    max_workers: int = DEFAULT_WORKERS,
+    progress=None,
+    executor: ThreadPoolExecutor = None,
+) -> BulkResult:
+    """
+    Runs the calls belonging to many items on one bounded pool of worker threads.
+    Unlike fan_out, a failure only affects the item it belongs to.
+    :param jobs:
+    A dict where each key identifies an item, and its value is a dict of calls in the
+    same form as taken by fan_out
+    :param finish:
+    Optional callable taking an item key and the dict of results for that item, called
+    from the calling thread once all of an item's calls have succeeded. What it returns
+    is stored as that item's result, and any exception it raises is stored as its error.
+    :param max_workers:
+    The maximum number of calls that may be in progress at any one time
+    :param progress:
+    Optional callable taking the number of items finished and the total number of items,
+    called from the calling thread each time an item finishes
+    :param executor:
+    Optional executor to run the calls on instead of a pool created for this sweep, for
+    callers sweeping repeatedly; it's left running afterwards, and max_workers is ignored
+    :return:
+    A BulkResult with a result for every item that succeeded and the exception raised by
+    every item that failed
+    """
+    result = BulkResult(total=len(jobs))
+    if not jobs:
+        return result
+    pending = {key: len(calls) for (key, calls) in jobs.items()}
+    partials = {key: {} for key in jobs}
+
+    def complete(key, value=None, error=None):
+        if error is not None:
+            result.errors[key] = error
+        else:
+            try:
+                result.results[key] = finish(key, value) if finish else value
+            # pylint: disable=broad-except
+            except Exception as exc:
+                result.errors[key] = exc
+        if progress is not None:
+            progress(result.done, result.total)
+
+    if executor is not None:
+        # as_completed() below waits for every call, so the executor needn't be shut down
+        pool_context = nullcontext(executor)
+    else:
+        pool_context = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    with pool_context as pool:
+        futures = {}
+        for (key, calls) in jobs.items():
+            if not calls:
+                complete(key, value={})
+            for (name, call) in calls.items():
+                futures[pool.submit(call)] = (key, name)
+        for future in as_completed(futures):
+            (key, name) = futures[future]
+            if key in result.errors:
+                continue
+            if future.exception() is not None:
+                # the item's other calls may still be queued; they'll run, but be ignored
+                complete(key, error=future.exception())
+                continue
+            partials[key][name] = future.result()
+            pending[key] -= 1
+            if pending[key] == 0:
+                complete(key, value=partials.pop(key))
+    return result
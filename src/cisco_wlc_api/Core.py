@@ -2,12 +2,119 @@
 
 """
 Module core. Contains classes that are critical to the operation of this module
-Currently this includes CiscoWLCAPISession, which inherits the Requests.Session object
+Currently this includes CiscoWLCAPISession, which inherits the Requests.Session object,
+and TransportStats, which records how its requests have fared
 """
 
+import json
+import random
+import threading
+from contextlib import nullcontext
+from time import monotonic, sleep
+
 import requests
 
-from . import Exceptions, Validators
+from . import Cache, Endpoints, Exceptions, Mapping, Validators
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Connect and read timeouts, in seconds, applied to every request unless told otherwise
+DEFAULT_TIMEOUT = (10, 60)
+# How many times an idempotent request is retried after a connection error or 5xx response
+DEFAULT_RETRIES = 2
+# Base and maximum delay, in seconds, between retries; each retry waits a random time
+#  of up to the base delay doubled for every previous attempt
+DEFAULT_BACKOFF = (0.5, 10)
+# Methods that are safe to retry automatically
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+# Function used to decode JSON response bodies; orjson is several times faster than the
+#  standard library on the multi-megabyte client and application tables
+DEFAULT_DECODER = orjson.loads if orjson is not None else json.loads
+
+
+def decode_json(response, decoder=DEFAULT_DECODER):
+    """
+    Decodes the JSON body of a response, remembering the result on the response so that
+    it's only ever decoded once, however many callers share it
+    :param response:
+    A Requests.Response (or httpx.Response) object
+    :param decoder:
+    A function taking the body as bytes and returning the decoded object
+    :return:
+    The decoded body
+    """
+    try:
+        return response.decoded_json
+    except AttributeError:
+        pass
+    try:
+        decoded = decoder(response.content)
+    except ValueError as exc:
+        raise Exceptions.UnexpectedResponseValueError(
+            f"'{response.url}' returned a body that isn't valid JSON"
+        ) from exc
+    response.decoded_json = decoded
+    return decoded
+
+
+class TransportStats:
+    """Thread-safe counters describing every request a session has performed"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.statuses = {}
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def __repr__(self):
+        return (
+            f"<TransportStats (requests={self.requests}, retries={self.retries},"
+            f"failures={self.failures}, latency_mean={self.latency_mean:.3f}s)>"
+        )
+
+    @property
+    def latency_mean(self) -> float:
+        """The mean time in seconds taken by each attempt, successful or otherwise"""
+        with self._lock:
+            return self.latency_total / self.requests if self.requests else 0.0
+
+    def record(self, latency: float, status: int = None, retry: bool = False):
+        """
+        Records a single attempt at a request
+        :param latency:
+        The time in seconds the attempt took
+        :param status:
+        The response's status code, or None if no response was received
+        :param retry:
+        Whether the attempt was a retry of an earlier one
+        """
+        with self._lock:
+            self.requests += 1
+            self.retries += int(retry)
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if status is None:
+                self.failures += 1
+            else:
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> dict:
+        """Returns a copy of every counter, suitable for exporting as metrics"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "statuses": dict(self.statuses),
+                "latency_total": self.latency_total,
+                "latency_max": self.latency_max,
+            }
 
 
 class CiscoWLCAPISession(requests.Session):
@@ -22,6 +129,17 @@ class CiscoWLCAPISession(requests.Session):
         base_uri: str = "",
         credentials: tuple = None,
         verify_tls: bool = True,
+        max_in_flight: int = None,
+        response_cache_ttls: dict = None,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        timeout: tuple = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: tuple = DEFAULT_BACKOFF,
+        session_store=None,
+        json_decoder=DEFAULT_DECODER,
+        table_ttl: float = Cache.DEFAULT_TTL,
+        transport: requests.adapters.BaseAdapter = None,
         **kwargs,
     ):
         """
@@ -37,6 +155,42 @@ class CiscoWLCAPISession(requests.Session):
         :param verify_tls:
         A boolean indicating whether the TLS certificate should be verified.
         This defaults to false.
+        :param max_in_flight:
+        The maximum number of requests that may be in progress over this session at any
+        one time, across all threads. Defaults to no limit.
+        :param response_cache_ttls:
+        A dict where each key is an endpoint string or a class from Endpoints, and its value
+        is the time in seconds for which GET responses from it are shared between callers.
+        Defaults to Cache.DEFAULT_RESPONSE_TTLS; an empty dict disables the response cache.
+        :param pool_connections:
+        The number of per-host connection pools to keep. As a session only talks to one
+        WLC, this defaults to 1 when pool_maxsize is given.
+        :param pool_maxsize:
+        The maximum number of keep-alive connections kept open to the WLC. Defaults to
+        max_in_flight if that's given, otherwise to requests' default of 10.
+        :param timeout:
+        A tuple of the connect and read timeouts in seconds applied to every request that
+        doesn't give its own, or None to wait forever
+        :param retries:
+        How many times a GET (or other idempotent) request is retried after a connection
+        error, timeout or 5xx response
+        :param backoff:
+        A tuple of the base and maximum delay in seconds between retries. Each retry waits
+        a random time of up to the base delay, doubled for every previous attempt.
+        :param session_store:
+        Optional Store.SessionStore. If it holds an unexpired session for this WLC, the
+        session starts out authenticated with its cookies, and only logs in if the WLC
+        rejects them. Every successful login is saved to it.
+        :param json_decoder:
+        A function taking a response body as bytes and returning the decoded object, used
+        by decode(). Defaults to orjson.loads if orjson is installed, else json.loads.
+        :param table_ttl:
+        The time in seconds for which tables fetched on behalf of models, such as each
+        client's applications, are shared between every model using this session
+        :param transport:
+        Optional transport adapter every request is sent through instead of the usual
+        connection pool, such as one from Emulator.WLCEmulator.adapter() to answer
+        requests in-process, or an Emulator.RecordingAdapter
         :param kwargs:
         Keyword arguments passed directly to the Requests.Session constructor
         """
@@ -45,11 +199,48 @@ class CiscoWLCAPISession(requests.Session):
         self._base_uri = base_uri
         Validators.credential(credentials)
         self.auth = credentials
-        self._last_url = None
-        self._last_method = None
-        self._last_kwargs = None
+        # the most recent request and response are tracked per-thread, so that requests
+        #  made concurrently over this session can't clobber each other's state
+        self._local = threading.local()
         self.authed = False
-        self.response = None
+        # held while logging in, so that concurrent callers hitting an expired session
+        #  wait on a single re-login; the generation counts login attempts, and requests
+        #  aren't sent while the event is clear, as a login is then in progress
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0
+        self._auth_ready = threading.Event()
+        self._auth_ready.set()
+        # the latest generation known to have been accepted by the WLC
+        self._auth_proven = 0
+        self.max_in_flight = max_in_flight
+        self._in_flight = (
+            threading.BoundedSemaphore(max_in_flight)
+            if max_in_flight is not None
+            else nullcontext()
+        )
+        self.response_cache = Cache.ResponseCache(ttls=response_cache_ttls)
+        # decoded tables shared by every model using this session, keyed on endpoint
+        #  and MAC address, such as each client's applications
+        self.tables = Cache.ModelCache(
+            ttl=table_ttl, maxsize=Cache.DEFAULT_RESPONSE_SIZE
+        )
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = TransportStats()
+        self.json_decoder = json_decoder
+        if pool_maxsize is None:
+            pool_maxsize = max_in_flight
+        if pool_maxsize is not None or pool_connections is not None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_connections or 1,
+                pool_maxsize=pool_maxsize or requests.adapters.DEFAULT_POOLSIZE,
+            )
+            self.mount("https://", adapter)
+            self.mount("http://", adapter)
+        if transport is not None:
+            self.mount("https://", transport)
+            self.mount("http://", transport)
 
         if not verify_tls:
             self.verify = False
@@ -61,6 +252,31 @@ class CiscoWLCAPISession(requests.Session):
                 requests.packages.urllib3.exceptions.InsecureRequestWarning
             )
 
+        self.session_store = session_store
+        if session_store is not None:
+            self.authed = session_store.load(self)
+
+    @property
+    def response(self) -> requests.Response:
+        """The most recent Requests.Response received by the calling thread"""
+        return getattr(self._local, "response", None)
+
+    @response.setter
+    def response(self, value: requests.Response):
+        self._local.response = value
+
+    @property
+    def _last_url(self) -> str:
+        return getattr(self._local, "last_url", None)
+
+    @property
+    def _last_method(self) -> str:
+        return getattr(self._local, "last_method", None)
+
+    @property
+    def _last_kwargs(self) -> dict:
+        return getattr(self._local, "last_kwargs", None)
+
     def retry_last(self) -> requests.Response:
         """
         Simple function to perform the most recently-performed request again
@@ -94,45 +310,171 @@ class CiscoWLCAPISession(requests.Session):
         A Requests.Response object with the response data
         """
 
-        self._last_url = url
-        self._last_method = method
-        self._last_kwargs = kwargs
-        self.response = super().request(
-            method=method, url=f"{self._base_uri}/{url}", *args, **kwargs
-        )
-        if self.response.status_code == 401:
-            if self.authed:
-                self.authed = False
-                raise PermissionError(
-                    "Session authentication has timed out. Please log-in again and retry."
+        self._local.last_url = url
+        self._local.last_method = method
+        self._local.last_kwargs = kwargs
+        generation = self._settled_generation()
+        response = self._request_cached(method, url, *args, **kwargs)
+        replayed = False
+        while response.status_code == 401:
+            if generation == self._auth_generation and not self.authed:
+                # never logged in, or the last attempt failed; nothing to renew
+                break
+            if (
+                replayed
+                and generation == self._auth_generation
+                and generation != self._auth_proven
+            ):
+                # a fresh login the WLC rejected outright, not one that's expired since
+                self.response = response
+                raise Exceptions.SessionExpiredError(
+                    "Session authentication has timed out and could not be renewed."
                 )
+            # the session expired, or another thread started logging in again after
+            #  this request was sent; wait for a single login and replay the request
+            self._reauthenticate(generation)
+            generation = self._settled_generation()
+            response = self._send(method, url, *args, **kwargs)
+            replayed = True
+        if response.status_code != 401 and generation > self._auth_proven:
+            self._auth_proven = generation
+        self.response = response
+        return response
+
+    def _request_cached(
+        self, method: str, url: str, *args, **kwargs
+    ) -> requests.Response:
+        # only plain queries are cached; requests.Session.get always passes allow_redirects
+        if args or set(kwargs) - {"params", "allow_redirects"}:
+            return self._send(method, url, *args, **kwargs)
+        return self.response_cache.fetch(
+            method,
+            url,
+            kwargs.get("params", None),
+            lambda: self._send(method, url, **kwargs),
+            store=lambda response: response.status_code == 200,
+        )
+
+    def login(self) -> bool:
+        """
+        Authenticates with the WLC. Credentials are sent with the first request, so this
+        usually takes a single round-trip; the request is only repeated if the WLC
+        answers it with a 401 challenge.
+        :return:
+        True once authenticated; an exception is raised otherwise
+        """
+        with self._auth_lock:
+            return self._login()
+
+    def _login(self) -> bool:
+        # cleared before the generation moves on, which _settled_generation() relies on
+        self._auth_ready.clear()
+        try:
             self.authed = False
-        return self.response
+            self._auth_generation += 1
+            # any cookies left belong to a session the WLC has already rejected
+            self.cookies.clear()
+            response = self._send("GET", Endpoints.Dashboard, allow_redirects=True)
+            if response.status_code == 401:
+                response = self._send("GET", Endpoints.Dashboard, allow_redirects=True)
+            self.response = response
+            try:
+                Validators.response_code(response=response)
+            except Exceptions.UnexpectedResponseStatusError:
+                if self.session_store is not None:
+                    self.session_store.forget(self._base_uri)
+                raise
+            self.authed = True
+            if self.session_store is not None:
+                self.session_store.save(self)
+            return self.authed
+        finally:
+            self._auth_ready.set()
+
+    def _settled_generation(self) -> int:
+        # waits out any login in progress, and returns the generation of the last one;
+        #  should another start meanwhile, the generation it's compared to later differs
+        while True:
+            self._auth_ready.wait()
+            generation = self._auth_generation
+            if self._auth_ready.is_set():
+                return generation
+
+    def _reauthenticate(self, generation: int):
+        with self._auth_lock:
+            if self._auth_generation != generation:
+                # somebody else tried logging in again while this thread was waiting
+                if self.authed:
+                    return
+                raise Exceptions.SessionExpiredError(
+                    "Session authentication has timed out and logging in again failed."
+                )
+            try:
+                self._login()
+            except Exceptions.UnexpectedResponseStatusError as exc:
+                raise Exceptions.SessionExpiredError(
+                    "Session authentication has timed out and logging in again failed."
+                ) from exc
+
+    def _send(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = 1 + (self.retries if method.upper() in IDEMPOTENT_METHODS else 0)
+        for attempt in range(attempts):
+            if attempt:
+                # "full jitter", so that clients retrying together don't stay together
+                delay = min(self.backoff[1], self.backoff[0] * 2 ** (attempt - 1))
+                sleep(random.uniform(0, delay))
+            start = monotonic()
+            try:
+                with self._in_flight:
+                    response = super().request(
+                        method=method, url=f"{self._base_uri}/{url}", *args, **kwargs
+                    )
+            except (requests.ConnectionError, requests.Timeout):
+                self.stats.record(monotonic() - start, retry=attempt > 0)
+                if attempt + 1 == attempts:
+                    raise
+                continue
+            self.stats.record(monotonic() - start, response.status_code, attempt > 0)
+            if response.status_code < 500 or attempt + 1 == attempts:
+                return response
+        # unreachable, as the final attempt always returns or raises
+        return None
+
+    def decode(self, response: requests.Response = None):
+        """
+        Decodes the JSON body of a response using the session's json_decoder. Each
+        response is only decoded once, even when shared through the response cache.
+        Responses with any status other than 200, such as a 5xx left once retries ran
+        out, raise UnexpectedResponseStatusError rather than being decoded.
+        :param response:
+        The response to decode; defaults to the calling thread's most recent response
+        :return:
+        The decoded body
+        """
+        response = response if response is not None else self.response
+        Validators.response_code(response=response)
+        return decode_json(response, self.json_decoder)
+
+    def get_json(self, url: str, **kwargs):
+        """Performs a GET request against the given endpoint and returns its decoded
+        body; keyword arguments are passed directly to get()"""
+        return self.decode(self.get(url, **kwargs))
 
     def map_kv(self, mapper: dict, data: list = None):
         """
-        Maps a key-value list from the Cisco WLC to a list of dict attributes
+        Maps a key-value list from the Cisco WLC to a list of dict attributes.
+        Prefer building a Mapping.KVMapper once and reusing it.
         :param mapper:
         A dict where each key is the name of the key in the WLC's response, and its value is
         what key the value will have in the returned dict
         :param data:
         A list of dicts which each contain a key and a value as separate attributes, usually
-        returned from the Cisco WLC's API
+        returned from the Cisco WLC's API; defaults to the 'data' attribute of the most
+        recent response
         :return:
         A dict with the resulting key-value mapping
         """
-
-        retdict = {}
-        if data is None and self.response.json().get("data", None) is None:
-            raise Exceptions.QueryReturnedNoResultsError()
-        for item in data if data is not None else self.response.json()["data"]:
-            (k, v) = (item["key"], item["value"])
-            if k in mapper.keys():
-                if str(v).lower() in ("no", "false"):
-                    v = False
-                if str(v).lower() in ("yes", "true"):
-                    v = True
-                if str(v).lower() in ("unknown", "unclassified"):
-                    v = None
-                retdict[mapper.get(k)] = v
-        return retdict
+        return Mapping.KVMapper(mapper)(
+            data if data is not None else self.decode().get("data", None)
+        )
@@ -24,6 +24,23 @@ def must_auth(function):
     return wrapper
 
 
+def must_auth_async(function):
+    """Decorator to ensure that a coroutine function is only awaited if the session
+    is authenticated"""
+
+    async def wrapper(self, *args, **kwargs):
+        if self.authenticated:
+            return await function(self, *args, **kwargs)
+        await self.login()
+        if not self.authenticated:
+            raise LoginFailureError(
+                "Unable to call authenticated function: automatic logon failed"
+            )
+        return await function(self, *args, **kwargs)
+
+    return wrapper
+
+
 def validator(function):
     """Simple decorator used by validation functions that will
     normally only return a value if a condition is not met"""
@@ -0,0 +1,852 @@
+# pylint: disable=invalid-name
+
+"""
+A local stand-in for a WLC, serving every endpoint in Endpoints from synthetic or recorded
+data, for testing and benchmarking without a real controller. It can be used in-process,
+as a transport adapter mounted on a session, or over HTTP from a local server.
+Run a server with: python -m cisco_wlc_api.Emulator --clients 10000 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import random
+import threading
+import time
+from collections import namedtuple
+from http.client import HTTPMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import urllib3
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+# pylint: disable=relative-beyond-top-level
+from . import Endpoints
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# The credentials the emulator accepts unless told otherwise
+DEFAULT_CREDENTIALS = ("admin", "password")
+# Name of the cookie holding the emulated web session
+COOKIE = "wlc_emulator_session"
+
+DEVICE_TYPES = ("Apple-iPhone", "Android", "Windows10-Workstation", "Apple-MacBook")
+AP_MODELS = ("AIR-AP2802I-E-K9", "AIR-AP3802I-E-K9", "C9120AXI-E")
+CHANNELS24 = (1, 6, 11)
+CHANNELS5 = (36, 44, 52, 100, 149)
+APPS_PER_CLIENT = 5
+
+
+def _mac(n: int, prefix: int = 2) -> str:
+    return ":".join(f"{b:02x}" for b in (prefix, 0, *n.to_bytes(4, "big")))
+
+
+def _kv(values: dict) -> dict:
+    return {"data": [{"key": k, "value": v} for (k, v) in values.items()]}
+
+
+def _sort_key(value):
+    # the WLC returns most numbers as strings, but sorts them as numbers
+    try:
+        return (0, float(value), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value))
+
+
+def _matches(row: dict, field: str, operator: str, value: str) -> bool:
+    actual = str(row.get(field, ""))
+    if operator == "eq":
+        return actual == value
+    if operator == "neq":
+        return actual != value
+    if operator == "contains":
+        return value.lower() in actual.lower()
+    if operator in ("gt", "lt"):
+        (left, right) = (_sort_key(actual), _sort_key(value))
+        return left > right if operator == "gt" else left < right
+    return True
+
+
+def page(rows: list, params: dict) -> dict:
+    """
+    Sorts, filters and pages rows in the way the WLC does for its list endpoints
+    :param rows:
+    Every row of the table
+    :param params:
+    The query parameters of the request, as built by Pagination.Query.params()
+    :return:
+    A response body with the total number of matching rows and the requested page
+    """
+    filters = []
+    n = 0
+    while f"filter[filters][{n}][field]" in params:
+        filters.append(
+            tuple(params[f"filter[filters][{n}][{k}]"] for k in ("field", "operator"))
+            + (params.get(f"filter[filters][{n}][value]", ""),)
+        )
+        n += 1
+    if filters:
+        combine = any if params.get("filter[logic]", "and") == "or" else all
+        rows = [r for r in rows if combine(_matches(r, *f) for f in filters)]
+    # stable sorts applied from the last key to the first sort by every key at once
+    n = 0
+    while f"sort[{n}][field]" in params:
+        n += 1
+    for n in reversed(range(n)):
+        field = params[f"sort[{n}][field]"]
+        rows = sorted(
+            rows,
+            key=lambda r, f=field: _sort_key(r.get(f, None)),
+            reverse=params.get(f"sort[{n}][dir]", "asc") == "desc",
+        )
+    skip = int(params.get("skip", 0))
+    take = int(params.get("take", len(rows)) or len(rows))
+    return {"total": len(rows), "data": rows[skip : skip + take]}
+
+
+class Fixtures:
+    """Synthetic data for every endpoint in Endpoints, generated deterministically from a
+    seed and scaled to a given number of clients, APs and applications"""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        clients: int = 100,
+        aps: int = 10,
+        apps: int = 20,
+        wlans: int = 3,
+        seed: int = 0,
+    ):
+        """
+        Generates the data
+        :param clients:
+        The number of clients associated to the emulated WLC
+        :param aps:
+        The number of APs joined to the emulated WLC
+        :param apps:
+        The number of applications seen by the emulated WLC
+        :param wlans:
+        The number of WLANs configured on the emulated WLC
+        :param seed:
+        The seed the data is generated from; the same seed always gives the same data
+        """
+        rng = random.Random(seed)
+        self.random = rng
+        self.started = time.time()
+        self.wlans = [
+            {
+                "wlanid": str(n + 1),
+                "ssid": f"wlan{n + 1}",
+                "profile": f"profile{n + 1}",
+                "status": "Enabled",
+                "avc_profile": f"avc{n + 1}" if n % 2 == 0 else "",
+            }
+            for n in range(max(1, wlans))
+        ]
+        self.avc_profiles = [
+            {"name": w["avc_profile"], "status": "Enabled"}
+            for w in self.wlans
+            if w["avc_profile"]
+        ]
+        self.aps = [
+            {
+                "name": f"AP-{n:04d}",
+                "macaddr": _mac(n, prefix=0xA),
+                "ipaddr": f"10.255.{n >> 8 & 255}.{n & 255}",
+                "model": AP_MODELS[n % len(AP_MODELS)],
+                "clients": "0",
+            }
+            for n in range(max(1, aps))
+        ]
+        self.radios24 = [
+            {"name": ap["name"], "channel": str(rng.choice(CHANNELS24)), "clients": "0"}
+            for ap in self.aps
+        ]
+        self.radios5 = [
+            {"name": ap["name"], "channel": str(rng.choice(CHANNELS5)), "clients": "0"}
+            for ap in self.aps
+        ]
+        self.apps = [
+            {
+                "name": f"app{n}",
+                "icon_type": "generic",
+                "bytes_total": str(rng.randint(10**6, 10**10)),
+                "bytes_90s": str(rng.randint(0, 10**7)),
+            }
+            for n in range(max(1, apps))
+        ]
+        self.clients = [self._client(n, rng) for n in range(clients)]
+        self.index = {row["macaddr"]: n for (n, row) in enumerate(self.clients)}
+        for row in self.clients:
+            ap = self.aps[int(row["ap_name"][3:])]
+            ap["clients"] = str(int(ap["clients"]) + 1)
+        self.tables = {
+            Endpoints.APs.List: self.aps,
+            Endpoints.APs.List24: self.radios24,
+            Endpoints.APs.List5: self.radios5,
+            Endpoints.Clients.List: self.clients,
+            Endpoints.RF.List: self.wlans,
+            Endpoints.RF.AVCProfile: self.avc_profiles,
+            Endpoints.RF.Performance.ClientStats: self.clients,
+            Endpoints.WidgetSources.Apps: self.apps,
+            Endpoints.WidgetSources.Clients: self._counts("ssid"),
+            Endpoints.WidgetSources.OperatingSystems: self._counts("devtype"),
+        }
+
+    def __repr__(self):
+        return (
+            f"<Fixtures (clients={len(self.clients)}, aps={len(self.aps)}, "
+            f"apps={len(self.apps)}, wlans={len(self.wlans)})>"
+        )
+
+    def _client(self, n: int, rng: random.Random) -> dict:
+        return {
+            "macaddr": _mac(n),
+            "HN": f"host-{n}",
+            "IP": f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}",
+            "devtype": DEVICE_TYPES[n % len(DEVICE_TYPES)],
+            # these columns are guessed (see Endpoints.Clients.Maps), so this only
+            #  shows the library agrees with itself, not with a real WLC
+            "ssid": self.wlans[n % len(self.wlans)]["ssid"],
+            "ap_name": self.aps[n % len(self.aps)]["name"],
+            "bytes_total": str(rng.randint(0, 10**9)),
+            "status": "Associated",
+            "RSSI": str(-rng.randint(30, 85)),
+            "SNR": str(rng.randint(5, 60)),
+            "ConnRate": str(rng.choice((72, 144, 433, 866, 1201))),
+            "ConnScore": str(rng.randint(0, 100)),
+            "Channel": str(rng.choice(CHANNELS5)),
+            "assoctime": str(rng.randint(0, 86400)),
+        }
+
+    def _counts(self, column: str) -> list:
+        counts = {}
+        for row in self.clients:
+            counts[row[column]] = counts.get(row[column], 0) + 1
+        return [{"name": k, "count": str(v)} for (k, v) in counts.items()]
+
+    def body(self, path: str, params: dict):
+        """
+        Builds the response body for a request
+        :param path:
+        The requested endpoint, from the Endpoints class
+        :param params:
+        The query parameters of the request
+        :return:
+        The decoded body, or None if the endpoint isn't one the WLC has
+        """
+        if path in self.tables:
+            return page(self.tables[path], params)
+        handler = self._HANDLERS.get(path, None)
+        if handler is None:
+            return None
+        return handler(self, params)
+
+    def _row(self, params: dict):
+        n = self.index.get(params.get("deviceMacAddress", "").lower(), None)
+        return self.clients[n] if n is not None else None
+
+    def _details(self, params: dict, values) -> dict:
+        # the WLC answers with no data at all for clients it doesn't know
+        row = self._row(params)
+        return _kv(values(row)) if row is not None else {"data": None}
+
+    def _rf(self, params: dict) -> dict:
+        return self._details(
+            params,
+            lambda row: {
+                "Hostname": row["HN"],
+                "Device Type": row["devtype"],
+                "Status": row["assoctime"],
+                "SSID": row["ssid"],
+                "AP Name": row["ap_name"],
+                "Channel": row["Channel"],
+                "Capabilities": "802.11ac",
+                "SpatialStream": "2",
+                "ConnRate": row["ConnRate"],
+                "RSSI": row["RSSI"],
+                "SNR": row["SNR"],
+                "volume": row["bytes_total"],
+                "ConnScore": row["ConnScore"],
+                "maxClientRate": "866",
+                "spatialstrmClients": "2",
+                "ChannelWidth": "80",
+                "ChannelwidthClient": "80",
+            },
+        )
+
+    def _network(self, params: dict) -> dict:
+        return self._details(
+            params,
+            lambda row: {
+                "IP Address": row["IP"],
+                "IPv6 Address": "",
+                "VLAN": str(10 + self.index[row["macaddr"]] % 4),
+                "Fastlane Client": "No",
+                "Mobility Role": "Local",
+            },
+        )
+
+    def _qos(self, params: dict) -> dict:
+        return self._details(
+            params, lambda row: {"WMM": "Yes", "U-APSD": "No", "QoS Level": "Silver"}
+        )
+
+    def _security(self, params: dict) -> dict:
+        return self._details(
+            params,
+            lambda row: {
+                "Policy": "WPA2",
+                "Cipher": "CCMP(AES)",
+                "Key Management": "PSK",
+                "ACL (IP/IPv6)": "none/none",
+            },
+        )
+
+    def _mobility(self, params: dict) -> dict:
+        return {"mobility": [] if self._row(params) is not None else None}
+
+    def _client_apps(self, params: dict) -> dict:
+        row = self._row(params)
+        if row is None:
+            return {"total": 0, "data": []}
+        n = self.index[row["macaddr"]]
+        rows = [
+            {
+                "name": app["name"],
+                "icon_type": app["icon_type"],
+                "bytes_total": str(int(app["bytes_total"]) % (n + k + 7919)),
+                "bytes_90s": "0",
+            }
+            for (k, app) in enumerate(
+                self.apps[(n + k) % len(self.apps)]
+                for k in range(min(APPS_PER_CLIENT, len(self.apps)))
+            )
+        ]
+        return page(rows, params)
+
+    def _ap(self, params: dict) -> dict:
+        name = params.get("apName", "")
+        ap = next((ap for ap in self.aps if ap["name"] == name), None)
+        if ap is None:
+            return {"data": None}
+        return _kv(
+            {
+                "AP Name": ap["name"],
+                "MAC Address": ap["macaddr"],
+                "IP Address": ap["ipaddr"],
+                "Model": ap["model"],
+                "Clients": ap["clients"],
+            }
+        )
+
+    def _status(self, _params: dict) -> dict:
+        uptime = int(time.time() - self.started) + 86400
+        return _kv(
+            {
+                "CPU Usage": f"{self.random.randint(1, 30)}%",
+                "Memory Usage": f"{self.random.randint(30, 60)}%",
+                "Up Time": (
+                    f"{uptime // 86400} days, {uptime // 3600 % 24} h "
+                    f"{uptime // 60 % 60} m {uptime % 60} s"
+                ),
+                "Internal Temperature": "+41 C",
+                "Access Points": str(len(self.aps)),
+                "Clients": str(len(self.clients)),
+            }
+        )
+
+    def _info(self, _params: dict) -> dict:
+        return _kv(
+            {
+                "System Name": "wlc-emulator",
+                "Product Name": "Cisco Controller",
+                "Product Version": "8.10.151.0",
+                "Serial Number": "EMU00000000",
+                "IP Address": "127.0.0.1",
+                "MAC Address": "02:00:00:00:00:00",
+            }
+        )
+
+    def _client_counts(self, _params: dict) -> dict:
+        return {"total": len(self.clients)}
+
+    _HANDLERS = {
+        Endpoints.Clients.Counts: _client_counts,
+        Endpoints.Clients.Client.RF: _rf,
+        Endpoints.Clients.Client.Apps: _client_apps,
+        Endpoints.Clients.Client.Mobility: _mobility,
+        Endpoints.Clients.Client.Network: _network,
+        Endpoints.Clients.Client.Security: _security,
+        Endpoints.Clients.Client.QoS: _qos,
+        Endpoints.APs.AP.Get: _ap,
+        Endpoints.System.Status: _status,
+        Endpoints.System.Info: _info,
+    }
+
+
+class Recordings:
+    """Responses recorded from a real WLC, replayed by a WLCEmulator in place of (or
+    ahead of) its synthetic data. Responses are keyed on the method, endpoint and
+    query parameters of the request, in any order."""
+
+    def __init__(self, entries: dict = None):
+        """
+        :param entries:
+        Optional dict where each key is a tuple returned by key(), and its value is a
+        tuple of the response's status code and body as bytes
+        """
+        self.entries = dict(entries) if entries is not None else {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"<Recordings (responses={len(self)})>"
+
+    @staticmethod
+    def key(method: str, path: str, query: str) -> tuple:
+        """Returns the key a response is recorded under"""
+        return (
+            method.upper(),
+            path.lstrip("/"),
+            tuple(sorted(parse_qsl(query, keep_blank_values=True))),
+        )
+
+    def add(self, method: str, path: str, query: str, status: int, body: bytes):
+        """Records a response, replacing any recorded for the same request"""
+        with self._lock:
+            self.entries[self.key(method, path, query)] = (status, body)
+
+    def get(self, method: str, path: str, query: str):
+        """Returns the (status, body) recorded for a request, or None if there isn't one"""
+        return self.entries.get(self.key(method, path, query), None)
+
+    def save(self, filename: str):
+        """Writes every recorded response to a JSON file"""
+        with self._lock:
+            saved = [
+                {
+                    "method": method,
+                    "path": path,
+                    "query": urlencode(query),
+                    "status": status,
+                    "body": body.decode("utf-8"),
+                }
+                for ((method, path, query), (status, body)) in self.entries.items()
+            ]
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(saved, file)
+
+    @classmethod
+    def load(cls, filename: str):
+        """Reads responses written by save()"""
+        with open(filename, encoding="utf-8") as file:
+            saved = json.load(file)
+        recordings = cls()
+        for entry in saved:
+            recordings.add(
+                entry["method"],
+                entry["path"],
+                entry["query"],
+                entry["status"],
+                entry["body"].encode("utf-8"),
+            )
+        return recordings
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that talks to a real WLC as usual, recording every response
+    other than logins so that they can be replayed later. Mount it on a session with
+    the transport argument, then save its recordings."""
+
+    def __init__(self, recordings: Recordings = None, **kwargs):
+        """
+        :param recordings:
+        Optional Recordings to add to; defaults to a new, empty one
+        :param kwargs:
+        Keyword arguments passed directly to the HTTPAdapter constructor
+        """
+        super().__init__(**kwargs)
+        self.recordings = recordings if recordings is not None else Recordings()
+
+    # pylint: disable=arguments-differ
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        url = urlparse(request.url)
+        if url.path.lstrip("/") != Endpoints.Dashboard and response.status_code < 400:
+            self.recordings.add(
+                request.method,
+                url.path,
+                url.query,
+                response.status_code,
+                response.content,
+            )
+        return response
+
+
+# A response from a WLCEmulator, before it's been sent by any transport
+Response = namedtuple("Response", ("status", "body", "headers"), defaults=(b"", {}))
+
+
+class WLCEmulator:
+    """An emulated WLC, answering requests from recorded responses or synthetic data,
+    with optional latency, session expiry and server errors"""
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        fixtures: Fixtures = None,
+        recordings: Recordings = None,
+        credentials: tuple = DEFAULT_CREDENTIALS,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        expire_after: int = None,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ):
+        """
+        Creates an emulated WLC
+        :param fixtures:
+        The synthetic data served for requests that weren't recorded; defaults to a
+        small Fixtures. Pass None alongside recordings to serve only recorded responses.
+        :param recordings:
+        Optional Recordings, which are answered with in preference to synthetic data
+        :param credentials:
+        Tuple of the username and password accepted when logging in, or None to accept
+        any
+        :param latency:
+        The time in seconds every response is delayed by
+        :param jitter:
+        The most time in seconds every response is further delayed by, chosen at random
+        for each response
+        :param expire_after:
+        The number of requests each login is valid for before the emulated WLC answers
+        with a 401, as though its web session had timed out; defaults to never
+        :param error_rate:
+        The probability, between 0 and 1, of answering any request with a 503
+        :param seed:
+        Optional seed for the jitter and errors, to make them reproducible
+        """
+        if fixtures is None and recordings is None:
+            fixtures = Fixtures()
+        self.fixtures = fixtures
+        self.recordings = recordings
+        self.credentials = credentials
+        self.latency = latency
+        self.jitter = jitter
+        self.expire_after = expire_after
+        self.error_rate = error_rate
+        self.requests = 0
+        self.logins = 0
+        self._sessions = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"<WLCEmulator (fixtures={self.fixtures!r}, recordings={self.recordings!r}, "
+            f"latency={self.latency}s)>"
+        )
+
+    def delay(self) -> float:
+        """Returns how long in seconds the next response should be delayed by"""
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def expire(self):
+        """Expires every session, so that the next request of each is answered with a
+        401 until it logs in again"""
+        with self._lock:
+            self._sessions.clear()
+
+    def respond(self, method: str, url: str, headers) -> Response:
+        """
+        Answers a request, without any delay
+        :param method:
+        The HTTP method of the request
+        :param url:
+        The URL of the request, or just its path and query string
+        :param headers:
+        A mapping of the request's headers
+        :return:
+        A Response
+        """
+        url = urlparse(url)
+        path = url.path.lstrip("/")
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                return Response(503, b"Service Unavailable")
+        if path == Endpoints.Dashboard:
+            return self._login(headers)
+        if not self._check_session(headers):
+            return Response(401, b"", {"WWW-Authenticate": 'Basic realm="WLC"'})
+        if self.recordings is not None:
+            recorded = self.recordings.get(method, path, url.query)
+            if recorded is not None:
+                return Response(recorded[0], recorded[1], {"Content-Type": "text/html"})
+        body = None
+        if self.fixtures is not None:
+            body = self.fixtures.body(path, dict(parse_qsl(url.query)))
+        if body is None:
+            return Response(404, b"Not Found")
+        # the WLC sends JSON as text/html
+        return Response(200, json.dumps(body).encode(), {"Content-Type": "text/html"})
+
+    def _login(self, headers) -> Response:
+        authorization = headers.get("Authorization", "") or ""
+        if not authorization.startswith("Basic "):
+            return Response(401, b"", {"WWW-Authenticate": 'Basic realm="WLC"'})
+        if self.credentials is not None:
+            try:
+                credentials = base64.b64decode(authorization[6:]).decode("utf-8")
+            except ValueError:
+                credentials = None
+            if credentials != ":".join(self.credentials):
+                return Response(401, b"", {"WWW-Authenticate": 'Basic realm="WLC"'})
+        with self._lock:
+            self.logins += 1
+            token = f"{self._random.getrandbits(64):016x}{self.logins}"
+            self._sessions[token] = self.expire_after
+        return Response(
+            200,
+            b"<html></html>",
+            {"Content-Type": "text/html", "Set-Cookie": f"{COOKIE}={token}; Path=/"},
+        )
+
+    def _check_session(self, headers) -> bool:
+        cookies = dict(
+            part.strip().split("=", 1)
+            for part in (headers.get("Cookie", "") or "").split(";")
+            if "=" in part
+        )
+        token = cookies.get(COOKIE, None)
+        with self._lock:
+            if token not in self._sessions:
+                return False
+            remaining = self._sessions[token]
+            if remaining is not None:
+                if remaining <= 1:
+                    del self._sessions[token]
+                else:
+                    self._sessions[token] = remaining - 1
+        return True
+
+    def adapter(self):
+        """Returns a transport adapter answering requests in-process, for passing to a
+        CiscoWLCAPISession (or CiscoWLCAPI) as its transport"""
+        return EmulatorAdapter(self)
+
+    def async_transport(self):
+        """Returns an httpx transport answering requests in-process, for passing to an
+        AsyncCiscoWLCAPISession (or AsyncCiscoWLCAPI) as transport"""
+        if httpx is None:
+            raise ImportError(
+                "async_transport() requires httpx, which is not installed"
+            )
+        return _AsyncEmulatorTransport(self)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Starts serving the emulated WLC over HTTP on a background thread
+        :param host:
+        The address to listen on
+        :param port:
+        The port to listen on; defaults to any free port
+        :return:
+        An EmulatorServer, whose base_uri can be given to CiscoWLCAPI
+        """
+        server = EmulatorServer(self, host=host, port=port)
+        server.start()
+        return server
+
+
+class EmulatorAdapter(BaseAdapter):
+    """Transport adapter for requests, answering every request from a WLCEmulator
+    in-process, without opening any connections"""
+
+    def __init__(self, emulator: WLCEmulator):
+        super().__init__()
+        self.emulator = emulator
+        # build_response() is all that's used, to handle cookies exactly as usual
+        self._builder = HTTPAdapter()
+
+    # pylint: disable=arguments-differ,unused-argument
+    def send(self, request, **kwargs):
+        answer = self.emulator.respond(request.method, request.url, request.headers)
+        delay = self.emulator.delay()
+        if delay > 0:
+            time.sleep(delay)
+        headers = HTTPMessage()
+        for (name, value) in answer.headers.items():
+            headers[name] = value
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(answer.body),
+            headers=dict(answer.headers),
+            status=answer.status,
+            preload_content=False,
+            original_response=SimpleNamespace(msg=headers, isclosed=lambda: True),
+        )
+        return self._builder.build_response(request, raw)
+
+    def close(self):
+        pass
+
+
+if httpx is not None:
+
+    class _AsyncEmulatorTransport(httpx.AsyncBaseTransport):
+        """Transport for httpx, answering every request from a WLCEmulator in-process"""
+
+        def __init__(self, emulator: WLCEmulator):
+            self.emulator = emulator
+
+        async def handle_async_request(self, request):
+            answer = self.emulator.respond(
+                request.method, str(request.url), request.headers
+            )
+            delay = self.emulator.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return httpx.Response(
+                answer.status, headers=answer.headers, content=answer.body
+            )
+
+
+class EmulatorServer:
+    """A WLCEmulator served over HTTP by a local threaded server"""
+
+    def __init__(self, emulator: WLCEmulator, host: str = "127.0.0.1", port: int = 0):
+        """
+        Creates a server; nothing listens until start() is called
+        :param emulator:
+        The WLCEmulator answering requests
+        :param host:
+        The address to listen on
+        :param port:
+        The port to listen on; defaults to any free port
+        """
+        self.emulator = emulator
+        self._address = (host, port)
+        self._server = None
+        self._thread = None
+
+    def __repr__(self):
+        return f"<EmulatorServer (base_uri={self.base_uri})>"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_uri(self) -> str:
+        """The base URI of the server, to give to CiscoWLCAPI, once it's started"""
+        if self._server is None:
+            return None
+        (host, port) = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Starts listening and answering requests on a background thread"""
+        if self._server is not None:
+            return
+        emulator = self.emulator
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answers every request from the emulator"""
+
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, which Nagle's algorithm would
+            #  otherwise hold up until the client's delayed ACK, around 40ms later
+            disable_nagle_algorithm = True
+
+            def _answer(self):
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                if length:
+                    self.rfile.read(length)
+                answer = emulator.respond(self.command, self.path, self.headers)
+                delay = emulator.delay()
+                if delay > 0:
+                    time.sleep(delay)
+                self.send_response(answer.status)
+                for (name, value) in answer.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(answer.body)))
+                self.end_headers()
+                self.wfile.write(answer.body)
+
+            # pylint: disable=invalid-name
+            do_GET = do_POST = do_PUT = do_DELETE = _answer
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(self._address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="EmulatorServer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops listening, waiting for the background thread to finish"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        (self._server, self._thread) = (None, None)
+
+
+def main():
+    """Serves an emulated WLC until interrupted, configured from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--aps", type=int, default=10)
+    parser.add_argument("--apps", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--recordings", help="JSON file written by Recordings.save()")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--expire-after", type=int, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    emulator = WLCEmulator(
+        fixtures=Fixtures(
+            clients=args.clients, aps=args.aps, apps=args.apps, seed=args.seed
+        ),
+        recordings=Recordings.load(args.recordings) if args.recordings else None,
+        latency=args.latency,
+        jitter=args.jitter,
+        expire_after=args.expire_after,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server = EmulatorServer(emulator, host=args.host, port=args.port)
+    server.start()
+    print(f"Emulating a WLC at {server.base_uri}; press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
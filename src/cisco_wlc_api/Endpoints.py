@@ -21,6 +21,20 @@ class APs:
 
         Get = "data/rfdashboard/apview_general.html"
 
+    class Maps:
+        """Column mappings for some of the tables"""
+
+        # Column of the List table each AP attribute is read from. Like the slot
+        #  tables, rows are joined on the AP's name, which is what clients report
+        #  as the AP they're associated to.
+        List = {
+            "name": "Name",
+            "macaddr": "MAC",
+            "ipaddr": "IP",
+            "model": "Model",
+            "clients": "ClientCount",
+        }
+
 
 class Clients:
     """Endpoints related to all clients known to the WLC"""
@@ -75,6 +89,17 @@ class Clients:
                 "ACL (IP/IPv6)": "sec_acls",
             }
 
+    class Maps:
+        """Column mappings for some of the tables"""
+
+        # Column of the List table each Client attribute is read from, besides the
+        #  macaddr, HN, IP and devtype columns every row has. Guessed, like those of
+        #  RF.Maps.List, so a missing column just leaves the attribute unset.
+        List = {"ssid": "SSID"}
+        # Column of the List table each WLANUsage input is read from; also guessed, so
+        #  CiscoWLCAPI.wlan_usage() raises if either is missing rather than miscount
+        Usage = {"ssid": "ssid", "bytes_total": "bytes_total"}
+
 
 class RF:
     """Endpoints related to the RF environment of the WLC deployment"""
@@ -82,11 +107,40 @@ class RF:
     List = "data/wlans.html"
     AVCProfile = "data/avc_profile_status.html"
 
+    class Maps:
+        """Column mappings for some of the tables"""
+
+        # Column of the List table each WLAN attribute is read from; guessed, as
+        #  the WLC's own UI only shows some of them
+        List = {
+            "wlanid": "ID",
+            "ssid": "SSID",
+            "profile": "Profile",
+            "status": "Status",
+            "avc_profile": "AVCProfile",
+        }
+        # Column of the AVCProfile table each AVCProfile attribute is read from
+        AVCProfile = {"name": "Name", "status": "Status"}
+
     class Performance:
         """Endpoints related to RF performance of clients"""
 
         ClientStats = "data/rfdashboard/clientperformance_clienttable.html"
 
+        class Maps:
+            """Column mappings for some of the tables"""
+
+            # Column of the ClientStats table each Client field is read from. These are
+            #  guessed from the client details view, so columns that turn out to be
+            #  missing are left to be fetched per-client instead.
+            ClientStats = {
+                "RSSI": "rf_rssi",
+                "SNR": "rf_snr",
+                "ConnRate": "rf_rate",
+                "ConnScore": "rf_connection_score",
+                "Channel": "rf_channel",
+            }
+
 
 class System:
     """Endpoints related to the WLC itself"""
@@ -94,6 +148,26 @@ class System:
     Status = "data/system1.html"
     Info = "data/system_information.html"
 
+    class Maps:
+        """Key-Value mappings for the API responses"""
+
+        Status = {
+            "CPU Usage": "cpu",
+            "Memory Usage": "memory",
+            "Up Time": "uptime",
+            "Internal Temperature": "temperature",
+            "Access Points": "ap_count",
+            "Clients": "client_count",
+        }
+        Info = {
+            "System Name": "name",
+            "Product Name": "model",
+            "Product Version": "version",
+            "Serial Number": "serial",
+            "IP Address": "ip",
+            "MAC Address": "mac",
+        }
+
 
 class WidgetSources:
     """Endpoints normally called by the widgets on a WLC dashboard,
@@ -0,0 +1,145 @@
+# pylint: disable=invalid-name
+
+"""
+Management of many WLCs at once, each with its own pooled session and concurrency budget
+"""
+
+from collections import namedtuple
+from functools import partial
+
+# pylint: disable=relative-beyond-top-level
+from . import Concurrency, System
+from .WLC import CiscoWLCAPI
+
+# An item returned by a single WLC, tagged with the name of the WLC it came from
+FleetItem = namedtuple("FleetItem", ("controller", "item"))
+
+# How many requests each WLC may have in progress at once, unless told otherwise
+DEFAULT_BUDGET = 4
+
+
+class CiscoWLCFleet:
+    """
+    Class for interacting with many Cisco WLCs as one
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, max_workers: int = None):
+        """
+        Creates an empty fleet
+        :param budget:
+        The default number of requests each WLC may have in progress at once; the size of
+        each WLC's connection pool follows it
+        :param max_workers:
+        The maximum number of WLCs worked on at once by fleet-wide operations. Defaults to
+        all of them.
+        """
+        self.budget = budget
+        self.max_workers = max_workers
+        self.controllers = {}
+        # failures from the most recent fleet-wide operation, by controller name
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.controllers)
+
+    def __getitem__(self, name: str) -> CiscoWLCAPI:
+        return self.controllers[name]
+
+    def __repr__(self):
+        return f"<CiscoWLCFleet (controllers={list(self.controllers)})>"
+
+    # pylint: disable=too-many-arguments
+    def add(
+        self,
+        name: str,
+        base_uri: str,
+        credentials: tuple,
+        verify_tls: bool = False,
+        budget: int = None,
+        **kwargs,
+    ) -> CiscoWLCAPI:
+        """
+        Adds a WLC to the fleet
+        :param name:
+        A unique name for the WLC, used to tag its results
+        :param base_uri:
+        Base URI of the Cisco WLC's web interface, including protocol, but
+        excluding any sub-paths or trailing slashes
+        :param credentials:
+        Tuple containing two strings, one the username and one the password
+        :param verify_tls:
+        Boolean indicating whether TLS certificates should be checked;
+        defaults to disabled
+        :param budget:
+        The number of requests this WLC may have in progress at once, for WLC models that
+        can handle more or less load than the fleet's default
+        :param kwargs:
+        Keyword arguments passed directly to the CiscoWLCAPI constructor
+        :return:
+        The CiscoWLCAPI object created for the WLC
+        """
+        self.controllers[name] = CiscoWLCAPI(
+            base_uri=base_uri,
+            credentials=credentials,
+            verify_tls=verify_tls,
+            max_in_flight=budget or self.budget,
+            **kwargs,
+        )
+        return self.controllers[name]
+
+    def each(self, function) -> Concurrency.BulkResult:
+        """
+        Calls a function with every WLC in the fleet concurrently. Failures are recorded in
+        errors rather than raised, so that one unreachable WLC can't fail the whole fleet.
+        :param function:
+        A callable taking a CiscoWLCAPI object
+        :return:
+        A BulkResult where results maps each WLC's name to what the function returned
+        """
+        result = Concurrency.sweep(
+            {
+                name: {name: partial(function, controller)}
+                for (name, controller) in self.controllers.items()
+            },
+            finish=lambda name, results: results[name],
+            max_workers=self.max_workers or len(self.controllers) or 1,
+        )
+        self.errors = result.errors
+        return result
+
+    def login(self) -> Concurrency.BulkResult:
+        """Attempts to authenticate with every WLC in the fleet at once"""
+        return self.each(lambda controller: controller.login())
+
+    @property
+    def client_count(self) -> int:
+        """The number of clients currently associated to every reachable WLC"""
+        return sum(self.each(lambda c: c.client_count).results.values())
+
+    @property
+    def clients(self) -> list[FleetItem]:
+        """A list of all clients currently associated to every reachable WLC,
+        each tagged with the name of its WLC"""
+        return self._merge(self.each(lambda c: c.clients))
+
+    @property
+    def top_apps(self) -> list[FleetItem]:
+        """A list of application-specific bandwidth information from every reachable WLC,
+        each tagged with the name of its WLC"""
+        return self._merge(self.each(lambda c: c.top_apps))
+
+    def system_poller(self, **kwargs) -> System.SystemPoller:
+        """
+        Creates a poller sampling the status and information of every WLC in the fleet
+        :param kwargs:
+        Keyword arguments passed directly to the SystemPoller constructor, such as
+        interval and emit
+        """
+        return System.SystemPoller(self.controllers, **kwargs)
+
+    def _merge(self, result: Concurrency.BulkResult) -> list[FleetItem]:
+        return [
+            FleetItem(controller=name, item=item)
+            for name in self.controllers
+            for item in result.results.get(name, ())
+        ]
@@ -0,0 +1,98 @@
+# pylint: disable=invalid-name
+
+"""
+Precompiled mappers for the key-value lists the WLC returns from its detail endpoints,
+such as [{"key": "VLAN", "value": "10"}, ...]
+"""
+
+# pylint: disable=relative-beyond-top-level
+from . import Exceptions
+
+# Values the WLC uses in place of booleans and nulls, in lower-case
+COERCIONS = {
+    "no": False,
+    "false": False,
+    "yes": True,
+    "true": True,
+    "unknown": None,
+    "unclassified": None,
+}
+
+
+class KVMapper:
+    """Maps key-value lists from the WLC to dicts in a single pass, renaming the keys
+    wanted, coercing yes/no/unknown values and converting types as it goes. Build one
+    per mapping and reuse it, rather than passing the mapping to map_kv() every time."""
+
+    __slots__ = ("mapper", "types", "_fields")
+
+    def __init__(self, mapper: dict, types: dict = None):
+        """
+        Compiles a mapper
+        :param mapper:
+        A dict where each key is the name of the key in the WLC's response, and its value
+        is what key the value will have in the returned dict, such as one of the dicts in
+        Endpoints.Clients.Client.Maps
+        :param types:
+        Optional dict where each key is a key of the returned dict, and its value is a
+        callable converting the value, such as int. Values coerced to a boolean or None
+        aren't converted.
+        """
+        self.mapper = dict(mapper)
+        self.types = dict(types) if types is not None else {}
+        self._fields = {
+            key: (name, self.types.get(name, None)) for (key, name) in mapper.items()
+        }
+
+    def __repr__(self):
+        return f"<KVMapper (keys={list(self.mapper)})>"
+
+    def __call__(self, data: list) -> dict:
+        """
+        Maps a single key-value list
+        :param data:
+        A list of dicts which each contain a key and a value as separate attributes,
+        usually the 'data' attribute of a response from the WLC
+        :return:
+        A dict with the resulting key-value mapping
+        """
+        if data is None:
+            raise Exceptions.QueryReturnedNoResultsError()
+        fields = self._fields
+        result = {}
+        for item in data:
+            field = fields.get(item["key"], None)
+            if field is None:
+                continue
+            (name, convert) = field
+            value = item["value"]
+            if isinstance(value, str):
+                value = COERCIONS.get(value.lower(), value)
+            if (
+                convert is not None
+                and value is not None
+                and not isinstance(value, bool)
+            ):
+                try:
+                    value = convert(value)
+                except (TypeError, ValueError) as exc:
+                    raise Exceptions.UnexpectedResponseValueError(
+                        f"Couldn't convert {item['key']} value {value!r} "
+                        f"using {getattr(convert, '__name__', convert)}"
+                    ) from exc
+            result[name] = value
+        return result
+
+    def batch(self, data: dict) -> dict:
+        """
+        Maps many key-value lists at once, such as the responses for many clients
+        :param data:
+        A dict where each key identifies a list (such as a MAC address), and its value is
+        the key-value list, or the response it's the 'data' attribute of
+        :return:
+        A dict where each key is a key of data, and its value is the resulting mapping
+        """
+        return {
+            key: self(items.get("data", None) if isinstance(items, dict) else items)
+            for (key, items) in data.items()
+        }
@@ -4,17 +4,85 @@
 Models related to the data returned by WLC API requests
 """
 
-from cachetools.func import ttl_cache
+import re
+from collections import namedtuple
+from functools import partial
 
 # I don't know why pylint will inconsistently report an import issue error
 # pylint: disable=relative-beyond-top-level
-from . import Endpoints, Exceptions
+from . import Cache, Concurrency, Endpoints, Exceptions, Mapping
 from .Core import CiscoWLCAPISession
+from .Mapping import KVMapper
+from .Pagination import Query, paginate
 
+# Rows requested per page of a client's applications
+CLIENT_APPS_PAGE_SIZE = 100
+
+
+def client_apps_query(mac: str) -> Query:
+    """Returns the Query for every application used by a client, largest first"""
+    return Query(
+        sort=[("bytes_total", "desc")],
+        page_size=CLIENT_APPS_PAGE_SIZE,
+        extra={"deviceMacAddress": mac},
+    )
+
+
+def client_apps(session: CiscoWLCAPISession, mac: str) -> list:
+    """
+    Returns every application used by a client. Endpoints.Clients.Client.Apps can't be
+    filtered by application server-side, so the whole table is fetched, at most once
+    per session.tables TTL, and shared by the Client and every Application for it.
+    :param session:
+    A CiscoWLCAPISession object provided from the caller
+    :param mac:
+    The MAC address of the client
+    :return:
+    A list of every application row, as returned by the WLC
+    """
+    return session.tables.fetch(
+        Endpoints.Clients.Client.Apps,
+        mac,
+        lambda: paginate(
+            session,
+            Endpoints.Clients.Client.Apps,
+            client_apps_query(mac),
+            max_workers=session.max_in_flight or Concurrency.DEFAULT_WORKERS,
+        ),
+    )
+
+
+
+def discard_responses(session, endpoint: str, params: dict):
+    """
+    Discards the responses a session has cached from an endpoint for the given query
+    parameters, if it caches responses at all; AsyncCiscoWLCAPISession doesn't
+    :param session:
+    A CiscoWLCAPISession or AsyncCiscoWLCAPISession object
+    :param endpoint:
+    The endpoint the responses were received from
+    :param params:
+    The query parameters, such as a client's MAC address
+    """
+    cache = getattr(session, "response_cache", None)
+    if cache is not None:
+        cache.discard(endpoint, params)
 
 class Application:
     """Model representing a single 'application' returned by an API request"""
 
+    __slots__ = (
+        "Name",
+        "Icon",
+        "BytesTotal",
+        "BytesRecently",
+        "MAC",
+        "_session",
+        "_cache",
+        "_last",
+        "__weakref__",
+    )
+
     # pylint: disable=too-many-arguments
     def __init__(
         self,
@@ -24,6 +92,9 @@ class Application:
         mac_address: str = None,
         icon: str = None,
         bytes_last_90: int = None,
+        cache_ttl: float = Cache.DEFAULT_TTL,
+        cache_size: int = Cache.DEFAULT_SIZE,
+        keep_raw: bool = False,
     ):
         self.Name = name
         self.Icon = icon
@@ -31,11 +102,30 @@ class Application:
         self.BytesRecently = bytes_last_90
         self.MAC = mac_address
         self._session = session
+        self._cache = Cache.ModelCache(ttl=cache_ttl, maxsize=cache_size)
 
-        self._last = {
-            "client_apps": {},
-            "network_apps": {},
-        }
+        # raw responses are only kept if asked for, as they're rarely needed
+        self._last = {"client_apps": {}, "network_apps": {}} if keep_raw else None
+
+    @classmethod
+    def from_row(cls, session: CiscoWLCAPISession, row: dict, **kwargs):
+        """
+        Creates an Application from a row of the Endpoints.WidgetSources.Apps table
+        :param session:
+        A CiscoWLCAPISession object provided from the caller
+        :param row:
+        A dict representing a single application, as returned by the WLC
+        :param kwargs:
+        Keyword arguments passed directly to the Application constructor
+        """
+        return cls(
+            name=row["name"],
+            session=session,
+            icon=row["icon_type"],
+            bytes_total=int(row["bytes_total"]),
+            bytes_last_90=int(row["bytes_90s"]),
+            **kwargs,
+        )
 
     def __add__(self, other):
         return self.BytesTotal + other.BytesTotal
@@ -68,7 +158,6 @@ class Application:
             f"recent={self.BytesRecently if self.BytesRecently is not None else '[no data]'}b)>"
         )
 
-    @ttl_cache(ttl=60)
     def refresh(self):
         """Refreshes the Application data if possible"""
         if self.MAC is None:
@@ -76,65 +165,185 @@ class Application:
         else:
             self._refresh_client_app()
 
-    @ttl_cache(ttl=60)
+    def _query(self) -> tuple:
+        return Endpoints.WidgetSources.Apps, Query(
+            sort=[("bytes_total", "desc")],
+            filters=[("name", "eq", self.Name)],
+            page_size=1,
+        ).params()
+
+    def _fetch(self) -> list:
+        (endpoint, params) = self._query()
+        return self._cache.fetch(
+            endpoint,
+            self.Name,
+            lambda: self._session.get_json(endpoint, params=params)["data"],
+        )
+
+    def invalidate(self):
+        """Discards cached data, so that the next refresh requests it from the WLC again"""
+        self._cache.invalidate()
+        if self.MAC is not None:
+            self._session.tables.discard(Endpoints.Clients.Client.Apps, self.MAC)
+            discard_responses(
+                self._session,
+                Endpoints.Clients.Client.Apps,
+                {"deviceMacAddress": self.MAC},
+            )
+
     def _refresh_client_app(self):
         # This query isn't filtered serverside; Cisco just..didn't write the code to
-        #  do the filtering.
-        self._last["client_apps"] = self._session.get(
-            Endpoints.Clients.Client.Apps,
-            params={
-                "deviceMacAddress": self.MAC,
-                "take": 1,
-                "pageSize": 1,
-                "page": 1,
-                "skip": 0,
-                "sort[0][field]": "bytes_total",
-                "sort[0][dir]": "desc",
-            },
-        ).json()["data"]
-        filt = list(
-            filter(lambda app: app["name"] == self.Name, self._last["client_apps"])
-        )
+        #  do the filtering. So every app of a client shares one copy of the whole table
+        self._apply_client_app(client_apps(self._session, self.MAC))
+
+    def _apply_client_app(self, data: list):
+        filt = list(filter(lambda app: app["name"] == self.Name, data))
         if len(filt) != 1:
             raise Exceptions.UnexpectedResponseValueError(
                 "Expected one result in client_apps refresh, but got"
                 f"{len(filt)} instead"
             )
-        self._last["client_apps"] = filt[0]
-        self.BytesTotal = self._last["client_apps"].get("bytes_total", self.BytesTotal)
+        if self._last is not None:
+            self._last["client_apps"] = filt[0]
+        self.BytesTotal = int(filt[0].get("bytes_total", self.BytesTotal))
 
-    @ttl_cache(ttl=60)
     def _refresh_global_app(self):
-        self._last["network_apps"] = self._session.get(
-            Endpoints.WidgetSources.Apps,
-            params={
-                "take": 1,
-                "pageSize": 1,
-                "page": 1,
-                "skip": 0,
-                "sort[0][field]": "bytes_total",
-                "sort[0][dir]": "desc",
-                "filter[logic]": "and",
-                "filter[filters][0][field]": "name",
-                "filter[filters][0][operator]": "eq",
-                "filter[filters][0][value]": self.Name,
-            },
-        ).json()["data"]
-        if len(self._last["network_apps"]) != 1:
+        self._apply_global_app(self._fetch())
+
+    def _apply_global_app(self, data: list):
+        if len(data) != 1:
             raise Exceptions.UnexpectedResponseValueError(
                 "Expected one result in network_apps refresh, but got"
-                f"{len(self._last['network_apps'])} instead"
+                f"{len(data)} instead"
             )
-        self._last["network_apps"] = self._last["network_apps"][0]
-        self.BytesTotal = self._last["network_apps"].get("bytes_total", self.BytesTotal)
-        self.BytesRecently = self._last["network_apps"].get(
-            "bytes_90s", self.BytesRecently
-        )
+        if self._last is not None:
+            self._last["network_apps"] = data[0]
+        self.BytesTotal = int(data[0].get("bytes_total", self.BytesTotal))
+        if data[0].get("bytes_90s", None) is not None:
+            self.BytesRecently = int(data[0]["bytes_90s"])
+
+
+class LazyField:
+    """Descriptor for a model attribute that is parsed from the raw data of the model's
+    last refresh on first access, and remembered until the next refresh of its group"""
+
+    __slots__ = ("group", "key", "parse", "default", "name")
+
+    def __init__(self, group: str, key: str, parse=None, default=None):
+        """
+        Declares a lazily-parsed attribute
+        :param group:
+        The group of detail data the attribute is read from, such as 'rf'
+        :param key:
+        The key of the mapped raw data the attribute is read from
+        :param parse:
+        Optional callable converting the raw value, such as int. Values the WLC gave as
+        a boolean or as unknown aren't converted.
+        :param default:
+        The value of the attribute before its group has been refreshed, or if the WLC
+        omits the key altogether
+        """
+        self.group = group
+        self.key = key
+        self.parse = parse
+        self.default = default
+        self.name = None
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        owner._LAZY_FIELDS.setdefault(self.group, []).append(name)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        # pylint: disable=protected-access
+        parsed = instance._parsed
+        if parsed is not None and self.name in parsed:
+            return parsed[self.name]
+        raw = instance._raw.get(self.group, None) if instance._raw else None
+        if raw is None or self.key not in raw:
+            return self.default
+        value = raw[self.key]
+        if self.parse is not None and value is not None and not isinstance(value, bool):
+            try:
+                value = self.parse(value)
+            except (TypeError, ValueError, IndexError) as exc:
+                raise Exceptions.UnexpectedResponseValueError(
+                    f"Couldn't parse {self.key} value {value!r} into {self.name} "
+                    f"for client {instance.MAC}"
+                ) from exc
+        if parsed is None:
+            parsed = instance._parsed = {}
+        parsed[self.name] = value
+        return value
+
+    def __set__(self, instance, value):
+        # pylint: disable=protected-access
+        if instance._parsed is None:
+            instance._parsed = {}
+        instance._parsed[self.name] = value
+
+
+def _acl(index: int):
+    # the WLC reports both ACLs in one value, as 'v4acl/v6acl'
+    return lambda value: value.split("/")[index]
 
 
 class Client:
     """Model representing a Client associated to the WLC in some way"""
 
+    __slots__ = (
+        "MAC",
+        "IP4",
+        "IP6",
+        "Hostname",
+        "Icon",
+        "Type",
+        "SSID",
+        "mobility",
+        "_apps",
+        "_raw",
+        "_parsed",
+        "_session",
+        "_cache",
+        "_watcher",
+        "_last",
+        "__weakref__",
+    )
+
+    # Names of the lazily-parsed attributes read from each group of detail data,
+    #  filled in by LazyField as they're declared below
+    _LAZY_FIELDS = {}
+
+    VLAN = LazyField("network", "VLAN", int)
+    is_fastlane = LazyField("network", "is_fastlane")
+    mobility_role = LazyField("network", "mobility_role")
+
+    qos_wmm = LazyField("qos", "wmm")
+    qos_apsd = LazyField("qos", "apsd")
+    qos_level = LazyField("qos", "level")
+
+    rf_width = LazyField("rf", "chanwidth", int)
+    rf_width_max = LazyField("rf", "chanwidth_max", int)
+    rf_rate = LazyField("rf", "assocrate", int)
+    rf_spatial_streams = LazyField("rf", "spat_str", int)
+    rf_spatial_streams_max = LazyField("rf", "spat_str_max", int)
+    rf_channel = LazyField("rf", "chan", int)
+    rf_capability = LazyField("rf", "wlcap")
+    rf_rssi = LazyField("rf", "strength", int)
+    rf_snr = LazyField("rf", "snr", int)
+    rf_connection_score = LazyField("rf", "connscore", int)
+    # the name of the AP the client is associated to
+    assocap = LazyField("rf", "assocap")
+    _bytes_total = LazyField("rf", "bytes_total", int, default=0)
+    _uptime = LazyField("rf", "assoctime", default=0)
+
+    security_acl_v4 = LazyField("security", "sec_acls", _acl(0))
+    security_acl_v6 = LazyField("security", "sec_acls", _acl(1))
+    security_cipher = LazyField("security", "sec_cipher")
+    security_kmp = LazyField("security", "sec_kmp")
+    security_policy = LazyField("security", "sec_pol")
+
     # pylint: disable=too-many-instance-attributes,too-many-arguments
     def __init__(
         self,
@@ -145,6 +354,10 @@ class Client:
         hostname: str = None,
         icon: str = None,
         devtype: str = None,
+        ssid: str = None,
+        cache_ttl: float = Cache.DEFAULT_TTL,
+        cache_size: int = Cache.DEFAULT_SIZE,
+        keep_raw: bool = False,
     ):
         """
         Model representing a Client associated to the WLC
@@ -162,154 +375,313 @@ class Client:
         Name of a UI icon representing the client device type
         :param devtype:
         Type of client device, determined via association data or MAC address
+        :param ssid:
+        SSID of the WLAN the client is connected to
+        :param cache_ttl:
+        The time in seconds for which data fetched from the WLC is reused before the
+        next refresh requests it again
+        :param cache_size:
+        The maximum number of responses cached for this client
+        :param keep_raw:
+        If True, the mapped responses from the last refresh of each group of detail data
+        are kept in _last. They're discarded by default to save memory.
         """
         self._session = session
+        self._cache = Cache.ModelCache(ttl=cache_ttl, maxsize=cache_size)
+        # called with the client whenever a refresh changes its attributes
+        self._watcher = None
         self.MAC = macaddr
         self.IP4 = ip4
         self.IP6 = ip6
         self.Hostname = hostname
         self.Icon = icon
         self.Type = devtype
+        self.SSID = ssid
+        self.mobility = ()
+        self._apps = ()
 
-        self.VLAN = None
-        self.is_fastlane = None
-        self.mobility_role = None
-
-        self.qos_wmm = None
-        self.qos_apsd = None
-        self.qos_level = None
-
-        self.rf_width = None
-        self.rf_width_max = None
-        self.rf_rate = None
-        self.rf_spatial_streams = None
-        self.rf_spatial_streams_max = None
-        self.rf_channel = None
-        self.rf_capability = None
-        self.rf_rssi = None
-        self.rf_snr = None
-        self.rf_connection_score = None
-
-        self.security_acl_v4 = None
-        self.security_acl_v6 = None
-        self.security_cipher = None
-        self.security_kmp = None
-        self.security_policy = None
-
-        self._last = {
-            "apps": [],
-            "mobility": [],
-            "network": {},
-            "qos": {},
-            "rf": {},
-            "security": {},
-        }
+        # mapped responses of the last refresh of each group, which the attributes
+        #  declared with LazyField are parsed from on first access
+        self._raw = None
+        self._parsed = None
+        self._last = (
+            {
+                "apps": [],
+                "mobility": [],
+                "network": {},
+                "qos": {},
+                "rf": {},
+                "security": {},
+            }
+            if keep_raw
+            else None
+        )
+
+    @classmethod
+    def from_row(cls, session: CiscoWLCAPISession, row: dict, **kwargs):
+        """
+        Creates a Client from a row of the Endpoints.Clients.List table
+        :param session:
+        A CiscoWLCAPISession object provided from the caller
+        :param row:
+        A dict representing a single client, as returned by the WLC
+        :param kwargs:
+        Keyword arguments passed directly to the Client constructor
+        """
+        client = cls(
+            session=session,
+            macaddr=row["macaddr"],
+            hostname=row["HN"],
+            ip4=row["IP"],
+            devtype=row["devtype"],
+            **kwargs,
+        )
+        for (column, attribute) in Endpoints.Clients.Maps.List.items():
+            if column in row:
+                setattr(client, attribute, row[column])
+        return client
+
+    # Attribute set from each column of a row of the Endpoints.Clients.List table
+    _ROW_FIELDS = {
+        "HN": "Hostname",
+        "IP": "IP4",
+        "devtype": "Type",
+        **Endpoints.Clients.Maps.List,
+    }
+
+    def update_from_row(self, row: dict) -> tuple:
+        """
+        Updates the client from a newer row of the Endpoints.Clients.List table,
+        leaving everything else (including cached detail data) untouched
+        :param row:
+        A dict representing this client, as returned by the WLC
+        :return:
+        A tuple of the names of the attributes whose values changed
+        """
+        changed = []
+        for (column, attribute) in self._ROW_FIELDS.items():
+            if column in row and getattr(self, attribute) != row[column]:
+                setattr(self, attribute, row[column])
+                changed.append(attribute)
+        return tuple(changed)
 
     def __repr__(self):
         return f"<Wireless client (MAC={self.MAC})>"
 
-    @ttl_cache(ttl=60)
-    def refresh(self):
-        """Refreshes all data related to the client"""
-        self.refresh_apps()
-        self.refresh_mobility()
-        self.refresh_network()
-        self.refresh_qos()
-        self.refresh_rf()
-        self.refresh_security()
+    # Endpoint queried for each group of detail data, in the order refresh() applies them
+    _GROUPS = {
+        "apps": Endpoints.Clients.Client.Apps,
+        "mobility": Endpoints.Clients.Client.Mobility,
+        "network": Endpoints.Clients.Client.Network,
+        "qos": Endpoints.Clients.Client.QoS,
+        "rf": Endpoints.Clients.Client.RF,
+        "security": Endpoints.Clients.Client.Security,
+    }
+
+    # Group of detail data each attribute or property not declared with LazyField is
+    #  refreshed by
+    _FIELDS = {
+        "IP4": "network",
+        "IP6": "network",
+        "Hostname": "rf",
+        "Type": "rf",
+        "SSID": "rf",
+        "associated": "rf",
+        "bytes_total": "rf",
+        "uptime": "rf",
+        "mobility": "mobility",
+        "apps": "apps",
+    }
+
+    @classmethod
+    def groups_for(cls, fields: list) -> tuple:
+        """
+        Works out which groups of detail data must be refreshed to update some fields
+        :param fields:
+        A list of attribute or property names, such as 'rf_rssi' or 'VLAN'. Group names,
+        such as 'rf', are also accepted.
+        :return:
+        A tuple of group names, in the order refresh() applies them
+        """
+        wanted = set()
+        for field in fields:
+            descriptor = getattr(cls, field, None)
+            if field in cls._GROUPS:
+                wanted.add(field)
+            elif field in cls._FIELDS:
+                wanted.add(cls._FIELDS[field])
+            elif isinstance(descriptor, LazyField):
+                wanted.add(descriptor.group)
+            else:
+                raise Exceptions.NoPropertyError(
+                    f"Client has no field '{field}' that can be refreshed"
+                )
+        return tuple(group for group in cls._GROUPS if group in wanted)
+
+    def refresh(
+        self,
+        concurrent: bool = False,
+        max_workers: int = len(_GROUPS),
+        fields: list = None,
+    ):
+        """
+        Refreshes all data related to the client, or only the data some fields need
+        :param concurrent:
+        If True, every detail endpoint is requested at the same time over the shared
+        session, and the client is only updated once all of them have responded.
+        If any request fails, the exception is raised and no data is changed.
+        :param max_workers:
+        The maximum number of requests in flight at once when concurrent is True
+        :param fields:
+        Optional list of attribute or property names, such as ['rf_rssi', 'VLAN'];
+        if given, only the endpoints those fields are read from are requested
+        """
+        groups = self.groups_for(fields) if fields is not None else tuple(self._GROUPS)
+        if not concurrent:
+            for group in groups:
+                self._refresh_group(group)
+            return
+        self._apply_refresh(
+            Concurrency.fan_out(self._refresh_calls(groups), max_workers=max_workers)
+        )
+
+    def _refresh_calls(self, groups: tuple = None) -> dict:
+        return {
+            group: partial(self._fetch, group)
+            for group in (groups if groups is not None else self._GROUPS)
+        }
+
+    def _apply_refresh(self, bodies: dict):
+        # parse everything before committing anything, so a malformed response
+        #  can't leave the client half-updated
+        parsed = {group: self._parse(group, body) for (group, body) in bodies.items()}
+        for group in self._GROUPS:
+            if group in parsed:
+                self._commit(group, parsed[group])
+        return self
+
+    def _params(self, group: str) -> dict:
+        # pylint: disable=unused-argument
+        return {"deviceMacAddress": self.MAC}
+
+    def _fetch(self, group: str) -> dict:
+        if group == "apps":
+            # paged through in full, and shared with this client's Application objects
+            return {"data": client_apps(self._session, self.MAC)}
+        return self._cache.fetch(
+            self._GROUPS[group],
+            self.MAC,
+            lambda: self._session.get_json(
+                self._GROUPS[group], params=self._params(group)
+            ),
+        )
+
+    def invalidate(self, *groups: str):
+        """
+        Discards cached data, so that the next refresh requests it from the WLC again
+        :param groups:
+        The groups of data to discard, any of 'apps', 'mobility', 'network', 'qos', 'rf'
+        and 'security'. If none are given, everything is discarded.
+        """
+        self._cache.invalidate(*(self._GROUPS[group] for group in groups))
+        # responses shared through the session would otherwise be reused for their TTL
+        for group in groups or self._GROUPS:
+            discard_responses(self._session, self._GROUPS[group], self._params(group))
+        if not groups or "apps" in groups:
+            self._session.tables.discard(Endpoints.Clients.Client.Apps, self.MAC)
+
+    def _parse(self, group: str, body: dict) -> tuple:
+        return getattr(self, f"_parse_{group}")(body)
+
+    def _commit(self, group: str, parsed: tuple):
+        (last, attributes) = parsed
+        if self._last is not None:
+            self._last[group] = last
+        if group in self._LAZY_FIELDS:
+            if self._raw is None:
+                self._raw = {}
+            self._raw[group] = last
+            if self._parsed:
+                for name in self._LAZY_FIELDS[group]:
+                    self._parsed.pop(name, None)
+        for (name, value) in attributes.items():
+            setattr(self, name, value)
+        if self._watcher is not None and attributes:
+            self._watcher(self)
+
+    def _refresh_group(self, group: str):
+        self._commit(group, self._parse(group, self._fetch(group)))
+
+    # Compiled once for every client; values are converted lazily, by LazyField
+    _MAPPERS = {
+        "network": KVMapper(Endpoints.Clients.Client.Maps.Network),
+        "qos": KVMapper(Endpoints.Clients.Client.Maps.QoS),
+        "rf": KVMapper(Endpoints.Clients.Client.Maps.RF),
+        "security": KVMapper(Endpoints.Clients.Client.Maps.Security),
+    }
+
+    def _map(self, group: str, body: dict) -> dict:
+        return self._MAPPERS[group](body.get("data", None))
+
+    @staticmethod
+    def _parse_apps(body: dict) -> tuple:
+        return body["data"], {"_apps": body["data"]}
+
+    @staticmethod
+    def _parse_mobility(body: dict) -> tuple:
+        return body["mobility"], {"mobility": body["mobility"]}
+
+    # the parsers only pick out the attributes that are set straight away; everything
+    #  else is parsed by LazyField from the mapped data when it's first read
+
+    def _parse_network(self, body: dict) -> tuple:
+        last = self._map("network", body)
+        # keys the WLC left out keep their current values, rather than failing
+        #  the whole refresh
+        return last, {
+            "IP4": last.get("IP4", self.IP4),
+            "IP6": last.get("IP6", self.IP6),
+        }
+
+    def _parse_qos(self, body: dict) -> tuple:
+        return self._map("qos", body), {}
+
+    def _parse_rf(self, body: dict) -> tuple:
+        last = self._map("rf", body)
+        return last, {
+            "Hostname": last.get("host", self.Hostname),
+            "Type": last.get("type", self.Type),
+            "SSID": last.get("wlnet", self.SSID),
+        }
+
+    def _parse_security(self, body: dict) -> tuple:
+        return self._map("security", body), {}
 
-    @ttl_cache(ttl=60)
     def refresh_apps(self):
         """Refreshes the application-specific bandwidth usage data"""
-        self._last["apps"] = self._session.get(
-            Endpoints.Clients.Client.Apps,
-            params={
-                "deviceMacAddress": self.MAC,
-                "take": 50,
-                "pageSize": 200,
-                "page": 1,
-                "skip": 0,
-                "sort[0][field]": "bytes_total",
-                "sort[0][dir]": "desc",
-            },
-        ).json()["data"]
-
-    @ttl_cache(ttl=60)
+        self._refresh_group("apps")
+
     def refresh_mobility(self):
         """Refreshes the Cisco Mobility-related data for the client"""
-        self._last["mobility"] = self._session.get(
-            Endpoints.Clients.Client.Mobility, params={"deviceMacAddress": self.MAC}
-        ).json()["mobility"]
+        self._refresh_group("mobility")
 
-    @ttl_cache(ttl=60)
     def refresh_network(self):
         """Refreshes the network-related data for the client"""
-        self._last["network"] = self._session.map_kv(
-            mapper=Endpoints.Clients.Client.Maps.Network,
-            data=self._session.get(
-                Endpoints.Clients.Client.Network, params={"deviceMacAddress": self.MAC}
-            ).json()["data"],
-        )
-        self.IP4 = self._last["network"]["IP4"]
-        self.IP6 = self._last["network"]["IP6"]
-        self.VLAN = int(self._last["network"]["VLAN"])
-        self.is_fastlane = self._last["network"]["is_fastlane"]
-        self.mobility_role = self._last["network"]["mobility_role"]
+        self._refresh_group("network")
 
-    @ttl_cache(ttl=60)
     def refresh_qos(self):
         """Refreshes the QoS-related data for the client"""
-        self._last["qos"] = self._session.map_kv(
-            mapper=Endpoints.Clients.Client.Maps.QoS,
-            data=self._session.get(
-                Endpoints.Clients.Client.QoS, params={"deviceMacAddress": self.MAC}
-            ).json()["data"],
-        )
-        self.qos_wmm = self._last["qos"]["wmm"]
-        self.qos_apsd = self._last["qos"]["apsd"]
-        self.qos_level = self._last["qos"]["level"]
+        self._refresh_group("qos")
 
-    @ttl_cache(ttl=60)
     def refresh_rf(self):
         """Refreshes the RF-related data for the client"""
-        self._last["rf"] = self._session.map_kv(
-            mapper=Endpoints.Clients.Client.Maps.RF,
-            data=self._session.get(
-                Endpoints.Clients.Client.RF, params={"deviceMacAddress": self.MAC}
-            ).json()["data"],
-        )
-        self.rf_width = int(self._last["rf"]["chanwidth"])
-        self.rf_width_max = int(self._last["rf"]["chanwidth_max"])
-        self.rf_rate = int(self._last["rf"]["assocrate"])
-        self.rf_spatial_streams = int(self._last["rf"]["spat_str"])
-        self.rf_spatial_streams_max = int(self._last["rf"]["spat_str_max"])
-        self.rf_channel = int(self._last["rf"]["chan"])
-        self.rf_capability = self._last["rf"]["wlcap"]
-        self.rf_rssi = int(self._last["rf"]["strength"])
-        self.rf_snr = int(self._last["rf"]["snr"])
-        self.rf_connection_score = int(self._last["rf"]["connscore"])
-
-        self.Hostname = self._last["rf"]["host"]
-        self.Type = self._last["rf"]["type"]
-
-    @ttl_cache(ttl=60)
+        self._refresh_group("rf")
+
     def refresh_security(self):
         """Refreshes the client's security-related data from the WLC"""
-        self._last["security"] = self._session.map_kv(
-            mapper=Endpoints.Clients.Client.Maps.Security,
-            data=self._session.get(
-                Endpoints.Clients.Client.Security, params={"deviceMacAddress": self.MAC}
-            ).json()["data"],
-        )
-        (self.security_acl_v4, self.security_acl_v6) = self._last["security"][
-            "sec_acls"
-        ].split("/")
-        self.security_cipher = self._last["security"]["sec_cipher"]
-        self.security_kmp = self._last["security"]["sec_kmp"]
-        self.security_policy = self._last["security"]["sec_pol"]
+        self._refresh_group("security")
 
     @property
-    @ttl_cache(ttl=60)
     def associated(self) -> bool:
         """Returns a boolean indicating whether the client is currently associated"""
         try:
@@ -319,26 +691,23 @@ class Client:
         return True
 
     @property
-    @ttl_cache(ttl=60)
     def bytes_total(self) -> int:
         """The total count of bytes transmitted or received by the client"""
         self.refresh_rf()
-        return self._last["rf"].get("bytes_total", 0)
+        return self._bytes_total
 
     @property
-    @ttl_cache(ttl=60)
     def uptime(self) -> int:
         """The time in seconds that a client has been associated to the AP"""
         self.refresh_rf()
-        return self._last["rf"].get("assoctime", 0)
+        return self._uptime
 
     @property
-    @ttl_cache(ttl=60)
     def apps(self) -> list[Application]:
         """Fetch application-specific bandwidth usage for this client"""
         self.refresh_apps()
         apps = []
-        for app in self._last["apps"]:
+        for app in self._apps:
             apps.append(
                 Application(
                     name=app["name"],
@@ -348,3 +717,314 @@ class Client:
                 )
             )
         return apps
+
+
+class AP:
+    """Model representing a single access point joined to the WLC"""
+
+    __slots__ = (
+        "Name",
+        "MAC",
+        "IP",
+        "Model",
+        "ClientCount",
+        "radio24",
+        "radio5",
+        "_session",
+        "_cache",
+        "__weakref__",
+    )
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        session: CiscoWLCAPISession,
+        name: str,
+        mac_address: str = None,
+        ip4: str = None,
+        model: str = None,
+        client_count: int = None,
+        radio24: dict = None,
+        radio5: dict = None,
+        cache_ttl: float = Cache.DEFAULT_TTL,
+    ):
+        """
+        Model representing an AP joined to the WLC
+        :param session:
+        Mandatory, a CiscoWLCAPISession object provided from the caller
+        :param name:
+        Name of the AP, which clients report as the AP they're associated to
+        :param mac_address:
+        MAC address of the AP
+        :param ip4:
+        IPv4 address of the AP
+        :param model:
+        Hardware model of the AP
+        :param client_count:
+        The number of clients associated to the AP
+        :param radio24:
+        The AP's row of the Endpoints.APs.List24 table, for its 2.4GHz radio
+        :param radio5:
+        The AP's row of the Endpoints.APs.List5 table, for its 5GHz radio
+        :param cache_ttl:
+        The time in seconds for which the AP's details are reused before being
+        requested again
+        """
+        self._session = session
+        # only the details are ever cached, so there's only ever one response
+        self._cache = Cache.ModelCache(ttl=cache_ttl, maxsize=1)
+        self.Name = name
+        self.MAC = mac_address
+        self.IP = ip4
+        self.Model = model
+        self.ClientCount = client_count
+        self.radio24 = radio24
+        self.radio5 = radio5
+
+    @classmethod
+    def from_rows(
+        cls,
+        session: CiscoWLCAPISession,
+        row: dict,
+        radio24: dict = None,
+        radio5: dict = None,
+        **kwargs,
+    ):
+        """
+        Creates an AP from its rows of the AP tables
+        :param session:
+        A CiscoWLCAPISession object provided from the caller
+        :param row:
+        The AP's row of the Endpoints.APs.List table
+        :param radio24:
+        The AP's row of the Endpoints.APs.List24 table, if it has one
+        :param radio5:
+        The AP's row of the Endpoints.APs.List5 table, if it has one
+        :param kwargs:
+        Keyword arguments passed directly to the AP constructor
+        """
+        fields = {
+            name: row.get(column, None)
+            for (column, name) in Endpoints.APs.Maps.List.items()
+        }
+        count = fields["ClientCount"]
+        return cls(
+            session=session,
+            name=fields["Name"],
+            mac_address=fields["MAC"],
+            ip4=fields["IP"],
+            model=fields["Model"],
+            client_count=int(count) if count not in (None, "") else None,
+            radio24=radio24,
+            radio5=radio5,
+            **kwargs,
+        )
+
+    def __repr__(self):
+        return f"<Access point (Name={self.Name}, MAC={self.MAC})>"
+
+    def _fetch_details(self) -> dict:
+        return self._cache.fetch(
+            Endpoints.APs.AP.Get,
+            self.Name,
+            lambda: self._session.get_json(
+                Endpoints.APs.AP.Get, params={"apName": self.Name}
+            ),
+        )
+
+    @staticmethod
+    def _parse_details(body: dict) -> dict:
+        data = body.get("data", None)
+        if data is None:
+            raise Exceptions.QueryReturnedNoResultsError()
+        if isinstance(data, dict):
+            return data
+        # a key-value list, like the client details views
+        return {
+            item["key"]: Mapping.COERCIONS.get(
+                str(item["value"]).lower(), item["value"]
+            )
+            for item in data
+        }
+
+    @property
+    def details(self) -> dict:
+        """The AP's general details, requested on first access and then reused for
+        cache_ttl seconds. Use CiscoWLCAPI.load_ap_details() to load many at once."""
+        return self._parse_details(self._fetch_details())
+
+    def invalidate(self):
+        """Discards cached data, so that the next access requests it from the WLC again"""
+        self._cache.invalidate()
+
+
+# Client count and total bytes transferred by the clients of a single WLAN
+WLANUsage = namedtuple("WLANUsage", ("clients", "bytes_total"))
+
+
+def _columns(row: dict, columns: dict) -> dict:
+    return {name: row.get(column, None) for (column, name) in columns.items()}
+
+
+class WLAN:
+    """Model representing a single WLAN (SSID) configured on the WLC"""
+
+    __slots__ = ("ID", "SSID", "Profile", "Status", "AVCProfile", "__weakref__")
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        ssid: str,
+        wlan_id: int = None,
+        profile: str = None,
+        status: str = None,
+        avc_profile: str = None,
+    ):
+        """
+        Model representing a WLAN on the WLC. WLANs rarely change, so these don't refer
+        back to a session; get fresh ones from CiscoWLCAPI.wlans instead.
+        :param ssid:
+        The SSID the WLAN is broadcast as
+        :param wlan_id:
+        The WLC's ID for the WLAN
+        :param profile:
+        The name of the WLAN's profile
+        :param status:
+        Whether the WLAN is enabled, as reported by the WLC
+        :param avc_profile:
+        The name of the AVC profile applied to the WLAN, if any
+        """
+        self.ID = wlan_id
+        self.SSID = ssid
+        self.Profile = profile
+        self.Status = status
+        self.AVCProfile = avc_profile
+
+    @classmethod
+    def from_row(cls, row: dict):
+        """
+        Creates a WLAN from a row of the Endpoints.RF.List table
+        :param row:
+        A dict representing a single WLAN, as returned by the WLC
+        """
+        fields = _columns(row, Endpoints.RF.Maps.List)
+        return cls(
+            ssid=fields["SSID"],
+            wlan_id=int(fields["ID"]) if fields["ID"] not in (None, "") else None,
+            profile=fields["Profile"],
+            status=fields["Status"],
+            avc_profile=fields["AVCProfile"],
+        )
+
+    def __repr__(self):
+        return f"<WLAN (SSID={self.SSID}, ID={self.ID})>"
+
+
+class AVCProfile:
+    """Model representing a single AVC (Application Visibility and Control) profile"""
+
+    __slots__ = ("Name", "Status", "__weakref__")
+
+    def __init__(self, name: str, status: str = None):
+        """
+        Model representing an AVC profile on the WLC
+        :param name:
+        The name of the profile, as referred to by WLAN.AVCProfile
+        :param status:
+        The status of the profile, as reported by the WLC
+        """
+        self.Name = name
+        self.Status = status
+
+    @classmethod
+    def from_row(cls, row: dict):
+        """
+        Creates an AVCProfile from a row of the Endpoints.RF.AVCProfile table
+        :param row:
+        A dict representing a single profile, as returned by the WLC
+        """
+        fields = _columns(row, Endpoints.RF.Maps.AVCProfile)
+        return cls(name=fields["Name"], status=fields["Status"])
+
+    def __repr__(self):
+        return f"<AVC profile (Name={self.Name})>"
+
+
+# Seconds in each unit the WLC reports durations in, such as '12 days, 3 h 4 m 5 s'
+_DURATION_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+_DURATION = re.compile(r"(\d+)\s*(d|h|m|s)[a-z]*", re.IGNORECASE)
+
+
+def _duration(value: str) -> int:
+    if isinstance(value, (int, float)) or value.strip().isdigit():
+        return int(value)
+    parts = _DURATION.findall(value)
+    if not parts:
+        raise ValueError(f"not a duration: {value!r}")
+    return sum(int(n) * _DURATION_UNITS[unit.lower()] for (n, unit) in parts)
+
+
+def _percent(value: str) -> float:
+    # such as '12%' or '12 %'
+    return float(str(value).rstrip("% "))
+
+
+def _leading_number(value: str) -> float:
+    # such as '41 C', or '41 C (ok)'
+    return float(str(value).split()[0])
+
+
+class SystemStatus(
+    namedtuple(
+        "SystemStatus",
+        ("cpu", "memory", "uptime", "temperature", "ap_count", "client_count"),
+    )
+):
+    """A sample of the WLC's fast-moving health counters: CPU and memory usage as
+    percentages, uptime in seconds, temperature in degrees Celsius, and the number of
+    APs and clients. Anything the WLC didn't report is None."""
+
+    __slots__ = ()
+
+    _MAPPER = KVMapper(
+        Endpoints.System.Maps.Status,
+        types={
+            "cpu": _percent,
+            "memory": _percent,
+            "uptime": _duration,
+            "temperature": _leading_number,
+            "ap_count": int,
+            "client_count": int,
+        },
+    )
+
+    @classmethod
+    def from_response(cls, body: dict):
+        """
+        Creates a SystemStatus from a response from Endpoints.System.Status
+        :param body:
+        The decoded response
+        """
+        fields = cls._MAPPER(body.get("data", None))
+        return cls._make(fields.get(name, None) for name in cls._fields)
+
+
+class SystemInfo(
+    namedtuple("SystemInfo", ("name", "model", "version", "serial", "ip", "mac"))
+):
+    """The WLC's static information, which only changes when it's reconfigured or
+    upgraded. Anything the WLC didn't report is None."""
+
+    __slots__ = ()
+
+    _MAPPER = KVMapper(Endpoints.System.Maps.Info)
+
+    @classmethod
+    def from_response(cls, body: dict):
+        """
+        Creates a SystemInfo from a response from Endpoints.System.Info
+        :param body:
+        The decoded response
+        """
+        fields = cls._MAPPER(body.get("data", None))
+        return cls._make(fields.get(name, None) for name in cls._fields)
@@ -0,0 +1,184 @@
+# pylint: disable=invalid-name
+
+"""
+Query building and pagination for the WLC's list endpoints, which all accept the
+paging, sorting and filtering parameters of the Kendo UI DataSource used by the web interface
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from math import ceil
+
+# pylint: disable=relative-beyond-top-level
+from . import Concurrency
+
+DEFAULT_PAGE_SIZE = 500
+
+
+class Query:
+    """Sorting, filtering and page size for a request to a list endpoint"""
+
+    def __init__(
+        self,
+        sort: list = (),
+        filters: list = (),
+        logic: str = "and",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        extra: dict = None,
+    ):
+        """
+        Describes a query against a list endpoint
+        :param sort:
+        A list of (field, direction) tuples, where direction is 'asc' or 'desc'
+        :param filters:
+        A list of (field, operator, value) tuples filtered on server-side, where operator is
+        a Kendo operator such as 'eq', 'neq', 'contains', 'gt' or 'lt'
+        :param logic:
+        How multiple filters are combined, either 'and' or 'or'
+        :param page_size:
+        The number of rows requested per page
+        :param extra:
+        A dict of any other parameters the endpoint expects, such as deviceMacAddress
+        """
+        self.sort = list(sort)
+        self.filters = list(filters)
+        self.logic = logic
+        self.page_size = page_size
+        self.extra = dict(extra) if extra is not None else {}
+
+    def __repr__(self):
+        return (
+            f"<Query (sort={self.sort}, filters={self.filters},"
+            f"page_size={self.page_size})>"
+        )
+
+    def params(self, page: int = 1) -> dict:
+        """
+        Builds the parameters for a single page of this query
+        :param page:
+        The page to request, starting from 1
+        :return:
+        A dict of parameters suitable for passing to CiscoWLCAPISession.get()
+        """
+        params = dict(self.extra)
+        params.update(
+            {
+                "take": self.page_size,
+                "pageSize": self.page_size,
+                "page": page,
+                "skip": (page - 1) * self.page_size,
+            }
+        )
+        for (n, (field, direction)) in enumerate(self.sort):
+            params[f"sort[{n}][field]"] = field
+            params[f"sort[{n}][dir]"] = direction
+        if self.filters:
+            params["filter[logic]"] = self.logic
+        for (n, (field, operator, value)) in enumerate(self.filters):
+            params[f"filter[filters][{n}][field]"] = field
+            params[f"filter[filters][{n}][operator]"] = operator
+            params[f"filter[filters][{n}][value]"] = value
+        return params
+
+
+def fetch_page(session, endpoint: str, query: Query, page: int = 1) -> dict:
+    """
+    Requests a single page of a list endpoint
+    :param session:
+    A CiscoWLCAPISession object provided from the caller
+    :param endpoint:
+    The list endpoint to request, from the Endpoints class
+    :param query:
+    The Query to request a page of
+    :param page:
+    The page to request, starting from 1
+    :return:
+    The decoded response body, usually with 'data' and 'total' attributes
+    """
+    return session.get_json(endpoint, params=query.params(page))
+
+
+def paginate(
+    session,
+    endpoint: str,
+    query: Query = None,
+    max_workers: int = Concurrency.DEFAULT_WORKERS,
+) -> list:
+    """
+    Requests every row of a list endpoint. Once the first page has given the total number
+    of rows, every following page is requested concurrently.
+    :param session:
+    A CiscoWLCAPISession object provided from the caller
+    :param endpoint:
+    The list endpoint to request, from the Endpoints class
+    :param query:
+    The Query to request; defaults to one with no sorting or filtering
+    :param max_workers:
+    The maximum number of pages requested at any one time
+    :return:
+    A list of every row, in the order the WLC returned them
+    """
+    query = query if query is not None else Query()
+    first = fetch_page(session, endpoint, query)
+    rows = list(first.get("data", None) or [])
+    if "total" not in first:
+        # without a total there's no telling how many pages there are, so walk them
+        if len(rows) == query.page_size:
+            rows += iter_rows(session, endpoint, query, start=2)
+        return rows
+    pages = range(2, ceil(int(first["total"]) / query.page_size) + 1)
+    bodies = Concurrency.fan_out(
+        {page: partial(fetch_page, session, endpoint, query, page) for page in pages},
+        max_workers=max_workers,
+    )
+    for page in pages:
+        rows += bodies[page].get("data", None) or []
+    return rows
+
+
+def iter_rows(
+    session,
+    endpoint: str,
+    query: Query = None,
+    prefetch: bool = False,
+    start: int = 1,
+):
+    """
+    Lazily yields every row of a list endpoint, requesting one page at a time until a page
+    comes back short, so that at most one or two pages are held in memory
+    :param session:
+    A CiscoWLCAPISession object provided from the caller
+    :param endpoint:
+    The list endpoint to request, from the Endpoints class
+    :param query:
+    The Query to request; defaults to one with no sorting or filtering
+    :param prefetch:
+    If True, the next page is requested in the background while the current one is
+    being consumed
+    :param start:
+    The first page to request
+    :return:
+    A generator of rows, in the order the WLC returned them
+    """
+    query = query if query is not None else Query()
+
+    def fetch(page: int) -> list:
+        return fetch_page(session, endpoint, query, page).get("data", None) or []
+
+    pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        (page, pending) = (start, None)
+        rows = fetch(page)
+        while True:
+            # a short page means there's nothing after it
+            last = len(rows) < query.page_size
+            if pool is not None and not last:
+                pending = pool.submit(fetch, page + 1)
+            yield from rows
+            if last:
+                return
+            page += 1
+            rows = pending.result() if pending is not None else fetch(page)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False)
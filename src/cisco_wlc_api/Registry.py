@@ -0,0 +1,217 @@
+# pylint: disable=invalid-name
+
+"""
+Long-lived tables of models, kept up to date incrementally rather than rebuilt on every poll
+"""
+
+import threading
+
+# pylint: disable=relative-beyond-top-level
+from . import Models, Validators
+from .Core import CiscoWLCAPISession
+
+
+class ClientDelta:
+    """The differences between two consecutive polls of the client table"""
+
+    def __init__(self, joined: list, left: list, changed: dict):
+        """
+        :param joined:
+        A list of Client objects that weren't present in the previous poll
+        :param left:
+        A list of Client objects that were present in the previous poll, but aren't now
+        :param changed:
+        A dict where each key is a Client object present in both polls, and its value is a
+        tuple of the names of its attributes that changed
+        """
+        self.joined = joined
+        self.left = left
+        self.changed = changed
+
+    def __repr__(self):
+        return (
+            f"<ClientDelta (joined={len(self.joined)}, left={len(self.left)},"
+            f"changed={len(self.changed)})>"
+        )
+
+    def __bool__(self):
+        return bool(self.joined or self.left or self.changed)
+
+
+def normalise_mac(address: str) -> str:
+    """
+    Validates a MAC address against Validators.Patterns.MAC and returns it in lower-case,
+    the form used to key registries
+    :param address:
+    A MAC address of six colon-separated pairs of hex digits, in either case
+    """
+    Validators.mac(address)
+    return address.lower()
+
+
+class ClientRegistry:
+    """MAC-indexed table of Client objects which are reused from one poll to the next,
+    with hash indexes for constant-time lookup by MAC address, IP address, hostname and
+    the AP each client is associated to"""
+
+    def __init__(self, session: CiscoWLCAPISession, **client_kwargs):
+        """
+        Creates an empty registry
+        :param session:
+        A CiscoWLCAPISession object provided from the caller
+        :param client_kwargs:
+        Keyword arguments passed to the constructor of every Client the registry creates
+        """
+        self._session = session
+        self._client_kwargs = client_kwargs
+        self._lock = threading.RLock()
+        self._clients = {}
+        self._by_ip = {}
+        self._by_hostname = {}
+        self._by_ap = {}
+        self._by_ssid = {}
+        # the (IPv4, IPv6, hostname, AP, SSID) each client is currently indexed under,
+        #  by MAC
+        self._indexed = {}
+
+    def __len__(self):
+        return len(self._clients)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._clients.values()))
+
+    def __contains__(self, mac: str):
+        return self.get_by_mac(mac) is not None
+
+    def get_by_mac(self, mac: str) -> Models.Client:
+        """
+        Looks up a client by its MAC address
+        :param mac:
+        A MAC address of six colon-separated pairs of hex digits, in either case
+        :return:
+        The Client with that MAC address, or None if there isn't one
+        """
+        return self._clients.get(normalise_mac(mac), None)
+
+    def get_by_ip(self, address: str) -> Models.Client:
+        """
+        Looks up a client by its IPv4 or IPv6 address
+        :param address:
+        An IP address, in the form the WLC reports it
+        :return:
+        The Client with that address, or None if there isn't one
+        """
+        return self._by_ip.get(address, None)
+
+    def get_by_hostname(self, hostname: str) -> list[Models.Client]:
+        """
+        Looks up clients by hostname, ignoring case. Hostnames aren't unique, so there may
+        be more than one.
+        :param hostname:
+        The hostname to look up
+        :return:
+        A list of every Client with that hostname, which may be empty
+        """
+        return list(self._by_hostname.get(hostname.lower(), {}).values())
+
+    def get_by_ap(self, name: str) -> list[Models.Client]:
+        """
+        Looks up the clients associated to an AP. A client is only known to be associated
+        once its RF details have been refreshed.
+        :param name:
+        The name of the AP, such as Models.AP.Name
+        :return:
+        A list of every Client associated to that AP, which may be empty
+        """
+        return list(self._by_ap.get(name, {}).values())
+
+    def get_by_ssid(self, ssid: str) -> list[Models.Client]:
+        """
+        Looks up the clients connected to a WLAN
+        :param ssid:
+        The SSID of the WLAN, such as Models.WLAN.SSID
+        :return:
+        A list of every Client connected to that WLAN, which may be empty
+        """
+        return list(self._by_ssid.get(ssid, {}).values())
+
+    def _named(self, keys: tuple):
+        return zip((self._by_hostname, self._by_ap, self._by_ssid), keys[2:])
+
+    def _index(self, mac: str, client: Models.Client):
+        with self._lock:
+            keys = (
+                client.IP4 or None,
+                client.IP6 or None,
+                client.Hostname.lower() if client.Hostname else None,
+                client.assocap or None,
+                client.SSID or None,
+            )
+            if self._indexed.get(mac, None) == keys:
+                return
+            self._unindex(mac)
+            for address in keys[:2]:
+                if address is not None:
+                    self._by_ip[address] = client
+            for (index, key) in self._named(keys):
+                if key is not None:
+                    index.setdefault(key, {})[mac] = client
+            self._indexed[mac] = keys
+
+    def _unindex(self, mac: str):
+        keys = self._indexed.pop(mac, None)
+        if keys is None:
+            return
+        for address in keys[:2]:
+            # another client may have taken this address over since it was indexed
+            owner = self._by_ip.get(address, None)
+            if owner is not None and owner.MAC.lower() == mac:
+                del self._by_ip[address]
+        for (index, key) in self._named(keys):
+            if key is not None:
+                named = index[key]
+                del named[mac]
+                if not named:
+                    del index[key]
+
+    def _watch(self, client: Models.Client):
+        # refreshing a client can change its addresses, hostname, AP or WLAN
+        self._index(client.MAC.lower(), client)
+
+    def sync(self, rows) -> ClientDelta:
+        """
+        Brings the registry up to date with a complete poll of the client table. Clients
+        already known are updated in place, and only the attributes that changed are set.
+        :param rows:
+        An iterable of every row of the Endpoints.Clients.List table
+        :return:
+        A ClientDelta describing which clients joined, left or changed
+        """
+        (joined, changed, seen) = ([], {}, set())
+        with self._lock:
+            for row in rows:
+                mac = normalise_mac(row["macaddr"])
+                seen.add(mac)
+                client = self._clients.get(mac, None)
+                if client is None:
+                    client = Models.Client.from_row(
+                        session=self._session, row=row, **self._client_kwargs
+                    )
+                    # pylint: disable=protected-access
+                    client._watcher = self._watch
+                    self._clients[mac] = client
+                    self._index(mac, client)
+                    joined.append(client)
+                    continue
+                fields = client.update_from_row(row)
+                if fields:
+                    changed[client] = fields
+                    self._index(mac, client)
+            left = []
+            for mac in set(self._clients) - seen:
+                self._unindex(mac)
+                left.append(self._clients.pop(mac))
+                # pylint: disable=protected-access
+                left[-1]._watcher = None
+        return ClientDelta(joined=joined, left=left, changed=changed)
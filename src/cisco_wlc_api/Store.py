@@ -0,0 +1,143 @@
+# pylint: disable=invalid-name
+
+"""
+Persistence of authenticated sessions between processes, so that short-lived processes
+can skip logging in to WLCs they've logged in to recently
+"""
+
+import hashlib
+import json
+import os
+import threading
+from time import time
+
+from requests.cookies import create_cookie
+
+# How long, in seconds, a saved session is trusted for; the WLC's web session timeout
+#  defaults to 30 minutes of inactivity, so stay comfortably inside that
+DEFAULT_MAX_AGE = 20 * 60
+
+
+class SessionStore:
+    """Saves and restores the cookies of authenticated sessions, keeping one file per
+    WLC in a local directory. A restored session is trusted until the WLC rejects it,
+    at which point the session logs in again and the saved copy is replaced."""
+
+    def __init__(self, directory: str, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Creates a store; nothing is read or written until a session uses it
+        :param directory:
+        The directory holding saved sessions, which is created if it doesn't exist.
+        Saved sessions grant access to the WLC, so it should only be readable by the
+        user running the process.
+        :param max_age:
+        The time in seconds after being saved that a session is considered expired
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<SessionStore (directory={self.directory}, max_age={self.max_age}s)>"
+
+    def path(self, base_uri: str) -> str:
+        """Returns the path of the file a WLC's session is saved to"""
+        name = hashlib.sha256(base_uri.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, session) -> bool:
+        """
+        Restores a saved session's cookies into a session, if a saved session exists for
+        the same WLC and user and hasn't expired
+        :param session:
+        A CiscoWLCAPISession object to restore into
+        :return:
+        True if a session was restored, otherwise False
+        """
+        # pylint: disable=protected-access
+        try:
+            with open(self.path(session._base_uri), encoding="utf-8") as file:
+                saved = json.load(file)
+        except (OSError, ValueError):
+            return False
+        now = time()
+        try:
+            if (
+                saved.get("base_uri", None) != session._base_uri
+                or saved.get("user", None) != _user(session)
+                or saved.get("saved", 0) + self.max_age <= now
+            ):
+                return False
+            # every cookie is read before any is restored, so that a badly shaped file
+            #  never leaves the session with only some of them
+            cookies = [
+                create_cookie(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie["domain"],
+                    path=cookie["path"],
+                    expires=cookie["expires"],
+                    secure=cookie["secure"],
+                )
+                for cookie in saved.get("cookies", None) or []
+            ]
+            if any(c.expires is not None and c.expires <= now for c in cookies):
+                return False
+        except (KeyError, TypeError, AttributeError, ValueError):
+            # written by something else, or an incompatible version; log in as usual
+            return False
+        for cookie in cookies:
+            session.cookies.set_cookie(cookie)
+        return True
+
+    def save(self, session):
+        """
+        Saves a session's cookies, replacing any session saved for the same WLC
+        :param session:
+        A CiscoWLCAPISession object which has just authenticated
+        """
+        # pylint: disable=protected-access
+        saved = {
+            "base_uri": session._base_uri,
+            "user": _user(session),
+            "saved": time(),
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires,
+                    "secure": cookie.secure,
+                }
+                for cookie in session.cookies
+            ],
+        }
+        path = self.path(session._base_uri)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            # written to a private temporary file then renamed over the old one, so that
+            #  other processes never read a half-written session
+            descriptor = os.open(
+                temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(saved, file)
+            os.replace(temporary, path)
+
+    def forget(self, base_uri: str):
+        """
+        Deletes the session saved for a WLC, if any
+        :param base_uri:
+        The base URI of the WLC
+        """
+        with self._lock:
+            try:
+                os.remove(self.path(base_uri))
+            except FileNotFoundError:
+                pass
+
+
+def _user(session) -> str:
+    return session.auth[0] if session.auth else None
@@ -0,0 +1,241 @@
+# pylint: disable=invalid-name
+
+"""
+Health of the WLC itself: its status counters and static information, and a poller that
+samples them from many WLCs on a fixed cadence, reporting only what changed
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+# pylint: disable=relative-beyond-top-level
+from . import Cache, Concurrency, Endpoints, Models
+from .Core import CiscoWLCAPISession
+from .Decorators import must_auth
+
+# How long, in seconds, a WLC's static information is reused before requesting it again
+DEFAULT_INFO_TTL = 60 * 60
+# How often, in seconds, a SystemPoller samples every WLC
+DEFAULT_INTERVAL = 10
+# How many requests a SystemPoller has in progress at once, across every WLC
+DEFAULT_POLL_WORKERS = 16
+
+logger = logging.getLogger(__name__)
+
+
+class SystemAPI:
+    """The status and information of a single WLC, available as CiscoWLCAPI.system.
+    Status is requested every time it's read, while information is kept for info_ttl
+    seconds, separately from anything else cached."""
+
+    __slots__ = ("session", "_cache")
+
+    def __init__(self, session: CiscoWLCAPISession, info_ttl: float = DEFAULT_INFO_TTL):
+        """
+        :param session:
+        A CiscoWLCAPISession object provided from the caller
+        :param info_ttl:
+        The time in seconds for which the WLC's information is reused before being
+        requested again
+        """
+        self.session = session
+        # only the information is ever cached, so there's only ever one entry
+        self._cache = Cache.ModelCache(ttl=info_ttl, maxsize=1)
+
+    def __repr__(self):
+        return f"<SystemAPI (session={self.session!r})>"
+
+    @property
+    def authenticated(self) -> bool:
+        """Whether the session is currently authenticated with the WLC"""
+        return self.session.authed
+
+    def login(self):
+        """Attempts to authenticate with the WLC"""
+        return self.session.login()
+
+    @property
+    @must_auth
+    def status(self) -> Models.SystemStatus:
+        """The WLC's current CPU, memory, uptime and other counters"""
+        return self._fetch_status()
+
+    @property
+    @must_auth
+    def info(self) -> Models.SystemInfo:
+        """The WLC's name, model, software version and other static information"""
+        return self._fetch_info()
+
+    def invalidate(self):
+        """Discards the cached information, so that it's requested again on next use"""
+        self._cache.invalidate()
+
+    def _fetch_status(self) -> Models.SystemStatus:
+        return Models.SystemStatus.from_response(
+            self.session.get_json(Endpoints.System.Status)
+        )
+
+    def _fetch_info(self) -> Models.SystemInfo:
+        return self._cache.fetch(
+            Endpoints.System.Info,
+            None,
+            lambda: Models.SystemInfo.from_response(
+                self.session.get_json(Endpoints.System.Info)
+            ),
+        )
+
+
+def changes(previous, current) -> dict:
+    """
+    Compares two samples of the same model, such as two SystemStatus objects
+    :param previous:
+    The earlier sample, or None if there wasn't one
+    :param current:
+    The later sample
+    :return:
+    A dict where each key is the name of a field that changed, and its value is the
+    field's value in current. Every field is included if there was no earlier sample.
+    """
+    if previous is None:
+        return current._asdict()
+    return {
+        name: new
+        for (name, old, new) in zip(current._fields, previous, current)
+        if old != new
+    }
+
+
+class SystemPoller:
+    """Samples the status and information of many WLCs on a fixed cadence, reporting
+    only the fields that changed since each WLC's previous sample. Every WLC's two
+    requests are made concurrently on one pool of worker threads, which is kept between
+    polls rather than created for each."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        controllers: dict,
+        interval: float = DEFAULT_INTERVAL,
+        emit=None,
+        max_workers: int = DEFAULT_POLL_WORKERS,
+    ):
+        """
+        Creates a poller; nothing is requested until poll() or start() is called
+        :param controllers:
+        A dict where each key is the name of a WLC, and its value is a CiscoWLCAPI
+        object, such as CiscoWLCFleet.controllers
+        :param interval:
+        The time in seconds between the start of each poll made by start()
+        :param emit:
+        Optional callable taking the name of a WLC and a dict of the fields that
+        changed, as returned by changes(); it's only called for WLCs with changes
+        :param max_workers:
+        The maximum number of requests in progress at any one time, across every WLC
+        """
+        self.controllers = controllers
+        self.interval = interval
+        self.emit = emit
+        self.max_workers = max_workers
+        # the most recent (SystemInfo, SystemStatus) sampled from each WLC, by name
+        self.samples = {}
+        # failures from the most recent poll, by WLC name, or by None if the poll itself
+        #  failed, such as when emit raised
+        self.errors = {}
+        self._pool = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def __repr__(self):
+        return (
+            f"<SystemPoller (controllers={len(self.controllers)}, "
+            f"interval={self.interval}s)>"
+        )
+
+    def poll(self) -> dict:
+        """
+        Samples every WLC once, logging in to any that aren't authenticated first.
+        Failures are recorded in errors rather than raised, and leave the WLC's previous
+        sample in place.
+        :return:
+        A dict where each key is the name of a WLC that changed, and its value is a dict
+        of the fields that changed, as passed to emit
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=max(1, self.max_workers))
+        # logging in is kept apart from sampling, so that a WLC's two requests can't
+        #  each start their own login
+        logins = Concurrency.sweep(
+            {
+                name: {"login": controller.login}
+                for (name, controller) in self.controllers.items()
+                if not controller.authenticated
+            },
+            executor=self._pool,
+        )
+        result = Concurrency.sweep(
+            {
+                name: {
+                    # pylint: disable=protected-access
+                    "info": controller.system._fetch_info,
+                    "status": controller.system._fetch_status,
+                }
+                for (name, controller) in self.controllers.items()
+                if name not in logins.errors
+            },
+            finish=lambda name, sample: self._update(name, **sample),
+            executor=self._pool,
+        )
+        self.errors = {**logins.errors, **result.errors}
+        changed = {name: fields for (name, fields) in result.results.items() if fields}
+        if self.emit is not None:
+            for (name, fields) in changed.items():
+                self.emit(name, fields)
+        return changed
+
+    def _update(self, name: str, info: Models.SystemInfo, status: Models.SystemStatus):
+        (last_info, last_status) = self.samples.get(name, (None, None))
+        self.samples[name] = (info, status)
+        # cached information is the very same object, so it's rarely worth comparing
+        fields = changes(last_info, info) if info is not last_info else {}
+        fields.update(changes(last_status, status))
+        return fields
+
+    def start(self):
+        """Starts polling every interval seconds on a background thread, until stop()"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="SystemPoller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops polling, waiting for any poll in progress to finish"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _run(self):
+        deadline = monotonic()
+        while not self._stopping.is_set():
+            # pylint: disable=broad-except
+            try:
+                self.poll()
+            except Exception as exc:
+                # one failed poll mustn't end the thread, and with it every later poll
+                logger.exception("SystemPoller poll failed")
+                self.errors = {**self.errors, None: exc}
+            # polls start on a fixed cadence; any that would have started while a slow
+            #  poll was still running are skipped rather than run back-to-back
+            deadline += self.interval
+            now = monotonic()
+            if deadline < now:
+                deadline += self.interval * ((now - deadline) // self.interval + 1)
+            self._stopping.wait(deadline - now)
@@ -80,6 +80,20 @@ def baseurl(url: str):
     )
 
 
+@validator
+def mac(address: str):
+    """Validate that a MAC address is conformant"""
+    _is_type(
+        address,
+        str,
+        f"MAC address should be a string, but was actually of type {type(address)}",
+    )
+    _assert(
+        Patterns.MAC.match(address),
+        f"MAC address ('{address}') must be six colon-separated pairs of hex digits",
+    )
+
+
 @validator
 def length(item, size: int, message: str = None):
     """Validate that the length of an object is what is expected"""
@@ -123,11 +137,14 @@ def credential(credentials: tuple):
 
 
 @validator
-def response_code(response: Response, expect: tuple[int] = (200,)):
-    """Validate the response code of a requests Response object"""
+def response_code(
+    response: Response, expect: tuple[int] = (200,), response_type: type = Response
+):
+    """Validate the response code of a requests Response object, or of an object of
+    another response_type with the same status_code/request/url attributes"""
     _is_type(
         response,
-        expect_type=Response,
+        expect_type=response_type,
         message="Expected a Response object, but"
         f"got an object of type {type(response)} instead.",
     )
@@ -4,18 +4,69 @@
 Primary class for the cisco_wlc_api module
 """
 
-from . import Endpoints, Models, Validators
+from functools import partial
+
+from . import (
+    Columnar,
+    Concurrency,
+    Endpoints,
+    Exceptions,
+    Models,
+    Pagination,
+    Registry,
+    System,
+)
 from .Core import CiscoWLCAPISession
 from .Decorators import must_auth
 
 
+# Queries against the list endpoints used by CiscoWLCAPI's properties
+CLIENTS_QUERY = Pagination.Query(sort=[("macaddr", "asc")])
+TOP_APPS_QUERY = Pagination.Query(
+    sort=[("bytes_90s", "desc"), ("bytes_total", "desc")], page_size=150
+)
+CLIENT_STATS_QUERY = Pagination.Query(sort=[("macaddr", "asc")])
+AP_QUERY = Pagination.Query(sort=[("name", "asc")])
+WLAN_QUERY = Pagination.Query(page_size=500)
+# Column the AP tables are joined on
+AP_KEY = next(k for (k, v) in Endpoints.APs.Maps.List.items() if v == "Name")
+
+
+def _row_mac(row: dict) -> str:
+    # rows without a valid MAC can't be matched to a client, so are skipped
+    try:
+        return Registry.normalise_mac(row.get("macaddr", None))
+    except Exceptions.WLCAssertionException:
+        return None
+
+
+def _client_stats(row: dict, columns: dict) -> dict:
+    # values that are missing or can't be parsed are left out, to be fetched per-client
+    stats = {}
+    for (column, field) in columns.items():
+        if row.get(column, None) is None:
+            continue
+        parse = getattr(getattr(Models.Client, field), "parse", None)
+        try:
+            stats[field] = parse(row[column]) if parse is not None else row[column]
+        except (TypeError, ValueError):
+            continue
+    return stats
+
+
 class CiscoWLCAPI:
     """
     Class for interacting with the Cisco WLC's API in a user-friendly way
     """
 
     def __init__(
-        self, base_uri: str = "", credentials: tuple = None, verify_tls: bool = False
+        self,
+        base_uri: str = "",
+        credentials: tuple = None,
+        verify_tls: bool = False,
+        max_in_flight: int = None,
+        response_cache_ttls: dict = None,
+        **kwargs,
     ):
         """
         Creates a CiscoWLCAPI object
@@ -27,97 +78,387 @@ class CiscoWLCAPI:
         :param verify_tls:
         Boolean indicating whether TLS certificates should be checked;
         defaults to disabled
+        :param max_in_flight:
+        The maximum number of requests that may be in progress against the WLC at any
+        one time; defaults to no limit
+        :param response_cache_ttls:
+        A dict mapping endpoints (or classes from Endpoints) to the time in seconds for
+        which their responses are shared between callers; defaults to
+        Cache.DEFAULT_RESPONSE_TTLS, and an empty dict disables the response cache
+        :param kwargs:
+        Keyword arguments passed directly to the CiscoWLCAPISession constructor, such as
+        pool_maxsize
         """
         self.session = CiscoWLCAPISession(
-            base_uri=base_uri, credentials=credentials, verify_tls=verify_tls
+            base_uri=base_uri,
+            credentials=credentials,
+            verify_tls=verify_tls,
+            max_in_flight=max_in_flight,
+            response_cache_ttls=response_cache_ttls,
+            **kwargs,
         )
-        self.authenticated = False
+        self.registry = Registry.ClientRegistry(self.session)
+        # the WLC's own status and information, such as system.status.cpu
+        self.system = System.SystemAPI(self.session)
+
+    @property
+    def authenticated(self) -> bool:
+        """Whether the session is currently authenticated with the WLC"""
+        return self.session.authed
 
     def login(self):
         """Attempts to authenticate with the WLC"""
-        self.authenticated = False
-        Validators.response_code(
-            response=self.session.get(Endpoints.Dashboard), expect=(200, 401)
-        )
-        Validators.response_code(response=self.session.retry_last())
-        self.authenticated = True
-        return self.authenticated
+        return self.session.login()
 
     @property
     @must_auth
     def client_count(self) -> int:
         """The number of clients currently associated to the WLC"""
-        return int(self.session.get(Endpoints.Clients.Counts).json()["total"])
+        return int(self.session.get_json(Endpoints.Clients.Counts)["total"])
 
     @property
     @must_auth
     def clients(self) -> list[Models.Client]:
         """A list of all clients currently associated to the WLC"""
-        count = self.client_count
-        clients = []
-        for client in self.session.get(
-            Endpoints.Clients.List,
-            params={
-                "take": count,
-                "pageSize": count,
-                "page": 1,
-                "skip": 0,
-                "sort[0][field]": "macaddr",
-                "sort[0][dir]": "asc",
-            },
-        ).json()["data"]:
-            clients.append(
-                Models.Client(
-                    session=self.session,
-                    macaddr=client["macaddr"],
-                    hostname=client["HN"],
-                    ip4=client["IP"],
-                    devtype=client["devtype"],
-                )
-            )
-        return clients
+        return [
+            Models.Client.from_row(session=self.session, row=row)
+            for row in self.paginate(Endpoints.Clients.List, CLIENTS_QUERY)
+        ]
+
+    @must_auth
+    def iter_clients(self, page_size: int = 500, prefetch: bool = False):
+        """
+        Lazily yields every client currently associated to the WLC, requesting the client
+        table one page at a time, so that at most one or two pages are held in memory
+        :param page_size:
+        The number of clients requested per page
+        :param prefetch:
+        If True, the next page is requested in the background while the current one is
+        being consumed
+        :return:
+        A generator of Client objects, in order of MAC address
+        """
+        query = Pagination.Query(sort=CLIENTS_QUERY.sort, page_size=page_size)
+        for row in Pagination.iter_rows(
+            self.session, Endpoints.Clients.List, query, prefetch=prefetch
+        ):
+            yield Models.Client.from_row(session=self.session, row=row)
+
+    @must_auth
+    def sync_clients(self) -> Registry.ClientDelta:
+        """
+        Polls the client table and brings registry up to date with it. Client objects
+        already in the registry are reused, keeping any detail data already fetched.
+        :return:
+        A ClientDelta describing which clients joined, left or changed since the last sync
+        """
+        return self.registry.sync(self.paginate(Endpoints.Clients.List, CLIENTS_QUERY))
 
     @property
     @must_auth
     def top_apps(self) -> list[Models.Application]:
         """A list of application-specific bandwidth information"""
 
-        result = self.session.get(
-            Endpoints.WidgetSources.Apps,
-            params={
-                "take": 150,
-                "pageSize": 150,
-                "page": 1,
-                "skip": 0,
-                "sort[0][field]": "bytes_90s",
-                "sort[0][dir]": "desc",
-                "sort[1][field]": "bytes_total",
-                "sort[1][dir]": "desc",
+        return [
+            Models.Application.from_row(session=self.session, row=row)
+            for row in self.paginate(Endpoints.WidgetSources.Apps, TOP_APPS_QUERY)
+        ]
+
+    @property
+    @must_auth
+    def aps(self) -> list[Models.AP]:
+        """A list of every AP joined to the WLC, each with the rows for its 2.4GHz and
+        5GHz radios. The AP list and both radio tables are requested concurrently."""
+        tables = Concurrency.fan_out(
+            {
+                endpoint: partial(self.paginate, endpoint, AP_QUERY)
+                for endpoint in (
+                    Endpoints.APs.List,
+                    Endpoints.APs.List24,
+                    Endpoints.APs.List5,
+                )
             },
-        ).json()
-        remainder = result["total"] - 150
-        result = result["data"]
-        if remainder > 0:
-            result += self.session.get(
-                Endpoints.WidgetSources.Apps,
-                params={
-                    "take": remainder,
-                    "pageSize": 150,
-                    "page": 1,
-                    "skip": 150,
-                    "sort[0][field]": "bytes_90s",
-                    "sort[0][dir]": "desc",
-                    "sort[1][field]": "bytes_total",
-                    "sort[1][dir]": "desc",
-                },
-            ).json()["data"]
+            max_workers=3,
+        )
+        radios24 = {row.get(AP_KEY, None): row for row in tables[Endpoints.APs.List24]}
+        radios5 = {row.get(AP_KEY, None): row for row in tables[Endpoints.APs.List5]}
         return [
-            Models.Application(
-                name=x["name"],
+            Models.AP.from_rows(
                 session=self.session,
-                icon=x["icon_type"],
-                bytes_total=int(x["bytes_total"]),
-                bytes_last_90=int(x["bytes_90s"]),
+                row=row,
+                radio24=radios24.get(row.get(AP_KEY, None), None),
+                radio5=radios5.get(row.get(AP_KEY, None), None),
             )
-            for x in result
+            for row in tables[Endpoints.APs.List]
         ]
+
+    @property
+    @must_auth
+    def wlans(self) -> list[Models.WLAN]:
+        """A list of every WLAN configured on the WLC. The WLC's responses are kept for
+        much longer than most, as WLANs rarely change."""
+        return [
+            Models.WLAN.from_row(row)
+            for row in self.paginate(Endpoints.RF.List, WLAN_QUERY)
+        ]
+
+    @property
+    @must_auth
+    def avc_profiles(self) -> list[Models.AVCProfile]:
+        """A list of every AVC profile configured on the WLC. The WLC's responses are
+        kept for much longer than most, as profiles rarely change."""
+        return [
+            Models.AVCProfile.from_row(row)
+            for row in self.paginate(Endpoints.RF.AVCProfile, WLAN_QUERY)
+        ]
+
+    @must_auth
+    def wlan_usage(self, rows: list[dict] = None) -> dict:
+        """
+        Counts the clients and bytes transferred on each WLAN from the client table
+        alone, without requesting any client's details
+        :param rows:
+        Optional rows of the Endpoints.Clients.List table, such as those just passed to
+        the registry, to save requesting the table again
+        :return:
+        A dict where each key is an SSID, and its value is a Models.WLANUsage. Every
+        configured WLAN is included, even those without any clients.
+        """
+        if rows is None:
+            rows = self.paginate(Endpoints.Clients.List, CLIENTS_QUERY)
+        columns = {
+            name: column for (column, name) in Endpoints.Clients.Maps.Usage.items()
+        }
+        (ssid, bytes_total) = (columns["ssid"], columns["bytes_total"])
+        usage = {wlan.SSID: [0, 0] for wlan in self.wlans}
+        for row in rows:
+            if ssid not in row or bytes_total not in row:
+                raise Exceptions.UnexpectedResponseValueError(
+                    f"The client table has no {ssid!r} or {bytes_total!r} column to "
+                    "count usage from; see Endpoints.Clients.Maps.Usage"
+                )
+            totals = usage.setdefault(row[ssid], [0, 0])
+            totals[0] += 1
+            try:
+                totals[1] += int(row[bytes_total] or 0)
+            except (TypeError, ValueError) as exc:
+                raise Exceptions.UnexpectedResponseValueError(
+                    f"Couldn't parse {bytes_total} {row[bytes_total]!r}"
+                ) from exc
+        return {ssid: Models.WLANUsage(*totals) for (ssid, totals) in usage.items()}
+
+    @must_auth
+    def load_ap_details(
+        self, aps: list[Models.AP], max_in_flight: int = None, progress=None
+    ) -> Concurrency.BulkResult:
+        """
+        Loads the details of many APs at once, so that reading each AP's details
+        afterwards doesn't make a request
+        :param aps:
+        A list of AP objects, such as that returned by aps
+        :param max_in_flight:
+        The maximum number of requests in progress at any one time. Defaults to the limit
+        set on the session, or to Concurrency.DEFAULT_WORKERS.
+        :param progress:
+        Optional callable taking the number of APs finished and the total number of APs,
+        called each time an AP's details are loaded
+        :return:
+        A BulkResult where results maps each AP's name to its details, and errors maps
+        the name of each AP whose details couldn't be loaded to the exception it raised
+        """
+        if max_in_flight is None:
+            max_in_flight = self.session.max_in_flight or Concurrency.DEFAULT_WORKERS
+        by_name = {ap.Name: ap for ap in aps}
+        # pylint: disable=protected-access
+        return Concurrency.sweep(
+            {name: {"details": ap._fetch_details} for (name, ap) in by_name.items()},
+            finish=lambda name, bodies: by_name[name]._parse_details(bodies["details"]),
+            max_workers=max_in_flight,
+            progress=progress,
+        )
+
+    @must_auth
+    def paginate(
+        self, endpoint: str, query: Pagination.Query = None, max_workers: int = None
+    ) -> list[dict]:
+        """
+        Requests every row of one of the WLC's list endpoints, such as Endpoints.APs.List,
+        Endpoints.RF.List or anything in Endpoints.WidgetSources. Once the first page has
+        given the total number of rows, the remaining pages are requested concurrently.
+        :param endpoint:
+        The list endpoint to request, from the Endpoints class
+        :param query:
+        A Pagination.Query describing sorting, server-side filters and page size
+        :param max_workers:
+        The maximum number of pages requested at any one time. Defaults to the limit set
+        on the session, or to Concurrency.DEFAULT_WORKERS.
+        :return:
+        A list of every row, each a dict as returned by the WLC
+        """
+        if max_workers is None:
+            max_workers = self.session.max_in_flight or Concurrency.DEFAULT_WORKERS
+        return Pagination.paginate(
+            self.session, endpoint, query=query, max_workers=max_workers
+        )
+
+    @must_auth
+    def refresh_all_clients(
+        self,
+        clients: list[Models.Client] = None,
+        max_in_flight: int = None,
+        progress=None,
+        fields: list = None,
+    ) -> Concurrency.BulkResult:
+        """
+        Refreshes all data related to many clients at once. Every client's detail requests
+        are scheduled together on one bounded pool, and each client is only updated once
+        all of its own requests have succeeded.
+        :param clients:
+        A list of Client objects to refresh, such as that returned by clients.
+        Defaults to every client currently associated to the WLC.
+        :param max_in_flight:
+        The maximum number of requests this sweep may have in progress at any one time.
+        Defaults to the limit set on the session, or to Concurrency.DEFAULT_WORKERS.
+        :param progress:
+        Optional callable taking the number of clients finished and the total number of
+        clients, called each time a client finishes refreshing
+        :param fields:
+        Optional list of attribute or property names, such as ['rf_rssi', 'VLAN'];
+        if given, only the endpoints those fields are read from are requested for
+        each client
+        :return:
+        A BulkResult where results maps each refreshed client's MAC to its Client object,
+        and errors maps each failed client's MAC to the exception it raised
+        """
+        if clients is None:
+            clients = self.clients
+        if max_in_flight is None:
+            max_in_flight = self.session.max_in_flight or Concurrency.DEFAULT_WORKERS
+        groups = Models.Client.groups_for(fields) if fields is not None else None
+        by_mac = {client.MAC: client for client in clients}
+        # pylint: disable=protected-access
+        return Concurrency.sweep(
+            {mac: client._refresh_calls(groups) for (mac, client) in by_mac.items()},
+            finish=lambda mac, bodies: by_mac[mac]._apply_refresh(bodies),
+            max_workers=max_in_flight,
+            progress=progress,
+        )
+
+    @must_auth
+    def refresh_rf_stats(
+        self,
+        clients: list[Models.Client] = None,
+        fallback: bool = True,
+        columns: dict = None,
+        max_in_flight: int = None,
+    ) -> Concurrency.BulkResult:
+        """
+        Fetches RF metrics for every client at once by paging through the client
+        performance table, rather than requesting each client's RF details separately,
+        and sets the matching rf_* fields on the given clients.
+        :param clients:
+        A list of Client objects to update. Defaults to every client in registry.
+        :param fallback:
+        If True, clients missing from the table, or missing some of its columns, have
+        just those fields refreshed from their own RF details instead
+        :param columns:
+        A dict where each key is a column of the performance table, and its value is
+        the Client field it holds. Defaults to Endpoints.RF.Performance.Maps.ClientStats.
+        A NoPropertyError is raised if any field can't be refreshed.
+        :param max_in_flight:
+        The maximum number of requests in progress at any one time. Defaults to the limit
+        set on the session, or to Concurrency.DEFAULT_WORKERS.
+        :return:
+        A BulkResult where results maps the MAC of every client in the table, and of
+        every client refreshed in fallback, to a dict of its RF fields; and errors maps
+        the MAC of each client whose fallback refresh failed to the exception it raised.
+        MACs are in lower-case, as used to key the registry.
+        """
+        if columns is None:
+            columns = Endpoints.RF.Performance.Maps.ClientStats
+        # raises NoPropertyError before anything is requested if a field is unknown
+        Models.Client.groups_for(columns.values())
+        if clients is None:
+            clients = list(self.registry)
+        if max_in_flight is None:
+            max_in_flight = self.session.max_in_flight or Concurrency.DEFAULT_WORKERS
+        rows = self.paginate(
+            Endpoints.RF.Performance.ClientStats,
+            CLIENT_STATS_QUERY,
+            max_workers=max_in_flight,
+        )
+        result = Concurrency.BulkResult(total=len(rows))
+        for row in rows:
+            mac = _row_mac(row)
+            if mac is not None:
+                result.results[mac] = _client_stats(row, columns)
+        # the table's MACs may not be in the same case as the clients', so everything
+        #  is keyed on the registry's form of the MAC
+        by_mac = {Registry.normalise_mac(client.MAC): client for client in clients}
+        # the fields the table didn't give for each client, by MAC
+        missing = {}
+        for (mac, client) in by_mac.items():
+            lacking = set(columns.values()) - set(result.results.get(mac, {}))
+            if lacking:
+                missing[mac] = (client, lacking)
+        if fallback and missing:
+            result.total += len([mac for mac in missing if mac not in result.results])
+            fetched = self.refresh_all_clients(
+                [client for (client, _) in missing.values()],
+                max_in_flight=max_in_flight,
+                fields=sorted(set().union(*(f for (_, f) in missing.values()))),
+            )
+            for client in fetched.results.values():
+                mac = Registry.normalise_mac(client.MAC)
+                try:
+                    values = {
+                        field: getattr(client, field) for field in missing[mac][1]
+                    }
+                except Exceptions.UnexpectedResponseValueError as exc:
+                    result.results.pop(mac, None)
+                    result.errors[mac] = exc
+                    continue
+                result.results.setdefault(mac, {}).update(values)
+            result.errors.update(
+                {
+                    Registry.normalise_mac(mac): exc
+                    for (mac, exc) in fetched.errors.items()
+                }
+            )
+        # set last, as refreshing a client's RF details discards its rf_* fields
+        for (mac, client) in by_mac.items():
+            for (field, value) in result.results.get(mac, {}).items():
+                setattr(client, field, value)
+        return result
+
+    @must_auth
+    def client_columns(self, max_in_flight: int = None) -> Columnar.ClientColumns:
+        """
+        Builds a column-oriented table of RF metrics for every client currently associated
+        to the WLC, straight from the client table and each client's RF details, without
+        creating any Client objects. Clients whose details couldn't be fetched are kept,
+        with every metric set to NaN.
+        :param max_in_flight:
+        The maximum number of requests in progress at any one time. Defaults to the limit
+        set on the session, or to Concurrency.DEFAULT_WORKERS.
+        :return:
+        A Columnar.ClientColumns object with one row per client
+        """
+        if max_in_flight is None:
+            max_in_flight = self.session.max_in_flight or Concurrency.DEFAULT_WORKERS
+        rows = self.paginate(Endpoints.Clients.List, CLIENTS_QUERY)
+        details = Concurrency.sweep(
+            {
+                row["macaddr"]: {
+                    "rf": partial(
+                        self.session.get,
+                        Endpoints.Clients.Client.RF,
+                        params={"deviceMacAddress": row["macaddr"]},
+                    )
+                }
+                for row in rows
+            },
+            finish=lambda mac, responses: self.session.decode(responses["rf"]),
+            max_workers=max_in_flight,
+        )
+        return Columnar.ClientColumns.from_responses(details.results, rows=rows)
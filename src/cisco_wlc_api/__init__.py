@@ -3,4 +3,8 @@ Python client for the reverse-engineered API used by
 the AngularJS web interface of the Cisco Wireless LAN Controller
 """
 
+from .Async import AsyncCiscoWLCAPI
+from .Fleet import CiscoWLCFleet
+from .Store import SessionStore
+from .System import SystemPoller
 from .WLC import CiscoWLCAPI
@@ -0,0 +1,88 @@
+"""
+Fixtures shared by the tests, chiefly a transport adapter standing in for a WLC
+"""
+
+import io
+import json
+from http.client import HTTPMessage
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+import urllib3
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import CiscoWLCAPI
+
+
+class FakeAdapter(BaseAdapter):
+    """Transport adapter standing in for a WLC, answering each request from routes by
+    its endpoint, or with default for any other endpoint. An answer is a body, a status
+    code, a (status, body) or (status, body, headers) tuple, an exception to raise, or a
+    callable taking the request and a dict of its query parameters and returning any of
+    those. Bodies that aren't bytes are sent as JSON."""
+
+    def __init__(self, routes: dict = None, default=None):
+        super().__init__()
+        self.routes = dict(routes) if routes is not None else {}
+        self.default = default if default is not None else {}
+        # the endpoint, and keyword arguments such as timeout, of every request sent
+        self.paths = []
+        self.sent = []
+        # build_response() is all that's used, to handle cookies exactly as usual
+        self._builder = HTTPAdapter()
+
+    # pylint: disable=arguments-differ
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        path = url.path.lstrip("/")
+        self.paths.append(path)
+        self.sent.append(kwargs)
+        answer = self.routes.get(path, self.default)
+        if callable(answer):
+            answer = answer(request, dict(parse_qsl(url.query)))
+        if isinstance(answer, Exception):
+            raise answer
+        if isinstance(answer, int):
+            answer = (answer, {})
+        if not isinstance(answer, tuple):
+            answer = (200, answer)
+        (status, body, headers) = (answer + ({},))[:3]
+        message = HTTPMessage()
+        for (name, value) in headers.items():
+            message[name] = value
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(body if isinstance(body, bytes) else json.dumps(body).encode()),
+            headers=dict(headers),
+            status=status,
+            preload_content=False,
+            original_response=SimpleNamespace(msg=message, isclosed=lambda: True),
+        )
+        return self._builder.build_response(request, raw)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(name="fake_adapter")
+def fixture_fake_adapter():
+    """Returns the FakeAdapter class, for tests building their own sessions"""
+    return FakeAdapter
+
+
+@pytest.fixture(name="fake_wlc")
+def fixture_fake_wlc():
+    """Returns a function taking routes, a default and keyword arguments for
+    CiscoWLCAPI, which returns a CiscoWLCAPI answered by a FakeAdapter, and the
+    adapter"""
+
+    def build(routes: dict = None, default=None, **kwargs) -> tuple:
+        kwargs.setdefault("base_uri", "https://127.0.0.1")
+        kwargs.setdefault("credentials", ("admin", "password"))
+        wlc = CiscoWLCAPI(**kwargs)
+        adapter = FakeAdapter(routes, default)
+        wlc.session.mount("https://", adapter)
+        return (wlc, adapter)
+
+    return build
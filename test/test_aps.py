@@ -0,0 +1,55 @@
+"""
+Tests pertaining to the AP models and CiscoWLCAPI's AP methods
+"""
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import Endpoints, Registry
+
+# The AP tables for two APs, only one of which has a 5GHz radio
+TABLES = {
+    Endpoints.APs.List: [
+        {"name": "ap1", "macaddr": "00:00:00:00:00:01", "clients": "3"},
+        {"name": "ap2", "macaddr": "00:00:00:00:00:02", "clients": "0"},
+    ],
+    Endpoints.APs.List24: [
+        {"name": "ap2", "channel": "6"},
+        {"name": "ap1", "channel": "1"},
+    ],
+    Endpoints.APs.List5: [{"name": "ap1", "channel": "36"}],
+}
+
+
+def ap_details(_request, params: dict) -> dict:
+    """Answers a request for an AP's details"""
+    return {"data": [{"key": "AP Name", "value": params["apName"]}]}
+
+
+def test_aps_join_radio_tables_and_load_details_in_bulk(fake_wlc):
+    """Test that APs are joined to their radios, and their details are only requested
+    once whether loaded in bulk or on access"""
+    routes = {path: {"data": rows, "total": len(rows)} for (path, rows) in TABLES.items()}
+    routes[Endpoints.APs.AP.Get] = ap_details
+    (wlc, adapter) = fake_wlc(routes, response_cache_ttls={})
+    (first, second) = wlc.aps
+    assert (first.Name, first.ClientCount) == ("ap1", 3)
+    assert (first.radio24["channel"], first.radio5["channel"]) == ("1", "36")
+    assert (second.radio24["channel"], second.radio5) == ("6", None)
+    assert not any(path == Endpoints.APs.AP.Get for path in adapter.paths)
+    result = wlc.load_ap_details([first, second])
+    assert result.results["ap2"] == {"AP Name": "ap2"}
+    assert first.details == {"AP Name": "ap1"}
+    assert adapter.paths.count(Endpoints.APs.AP.Get) == 2
+
+
+def test_registry_indexes_clients_by_ap():
+    """Test that clients are indexed by the AP they're associated to"""
+    registry = Registry.ClientRegistry(session=None)
+    registry.sync([{"macaddr": "aa:bb:cc:dd:ee:01", "HN": "", "IP": "", "devtype": ""}])
+    client = registry.get_by_mac("aa:bb:cc:dd:ee:01")
+    assert not registry.get_by_ap("ap1")
+    rf = {"Hostname": "host", "Device Type": "phone", "AP Name": "ap1"}
+    # pylint: disable=protected-access
+    client._apply_refresh(
+        {"rf": {"data": [{"key": k, "value": v} for (k, v) in rf.items()]}}
+    )
+    assert registry.get_by_ap("ap1") == [client]
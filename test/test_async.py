@@ -0,0 +1,69 @@
+"""
+Tests pertaining to cisco_wlc_api.Async.AsyncCiscoWLCAPI
+"""
+
+import asyncio
+
+import pytest
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import AsyncCiscoWLCAPI
+
+httpx = pytest.importorskip("httpx")
+
+
+def test_constructor_validates_args():
+    """Test that the constructor validates its arguments like CiscoWLCAPI's does"""
+    with pytest.raises(CiscoWLCExceptions.WLCAssertionException):
+        _ = AsyncCiscoWLCAPI()
+    with pytest.raises(CiscoWLCExceptions.WLCAssertionException):
+        _ = AsyncCiscoWLCAPI(base_uri="https://127.0.0.1", credentials=("1",))
+
+
+def test_client_count_logs_in_first():
+    """Test that awaiting an authenticated property logs in automatically"""
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        return httpx.Response(200, json={"total": 3})
+
+    async def run():
+        async with AsyncCiscoWLCAPI(
+            base_uri="https://127.0.0.1",
+            credentials=("admin", "password"),
+            transport=httpx.MockTransport(handler),
+        ) as wlc:
+            return await wlc.client_count
+
+    assert asyncio.run(run()) == 3
+    assert paths[0] == "/screens/dashboard.html"
+
+
+def test_session_built_outside_a_loop_limits_requests():
+    """Test that a session created before any event loop runs still limits its requests
+    to max_in_flight once used inside one"""
+    state = {"in_flight": 0, "most": 0}
+
+    async def handler(_request):
+        state["in_flight"] += 1
+        state["most"] = max(state["most"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return httpx.Response(200, json={})
+
+    wlc = AsyncCiscoWLCAPI(
+        base_uri="https://127.0.0.1",
+        credentials=("admin", "password"),
+        max_in_flight=2,
+        transport=httpx.MockTransport(handler),
+    )
+
+    async def run():
+        async with wlc:
+            await wlc.login()
+            await asyncio.gather(*(wlc.session.get("endpoint") for _ in range(6)))
+
+    asyncio.run(run())
+    assert state["most"] == 2
@@ -0,0 +1,99 @@
+"""
+Tests for the response caches in cisco_wlc_api.Cache
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import Cache, Endpoints
+
+
+def test_model_cache_fetches_once():
+    """Test that a cached response is reused rather than fetched again"""
+    cache = Cache.ModelCache()
+    calls = []
+    for _ in range(3):
+        cache.fetch("endpoint", "aa:bb:cc:dd:ee:ff", lambda: calls.append(1) or {})
+    assert len(calls) == 1
+
+
+def test_model_cache_is_bounded():
+    """Test that the cache never holds more than maxsize responses"""
+    cache = Cache.ModelCache(maxsize=2)
+    for key in range(5):
+        cache.set("endpoint", key, {})
+    assert len(cache) == 2
+
+
+def test_model_cache_invalidates_by_endpoint():
+    """Test that invalidating an endpoint only discards that endpoint's responses"""
+    cache = Cache.ModelCache()
+    cache.set("one", "mac", {"a": 1})
+    cache.set("two", "mac", {"b": 2})
+    cache.invalidate("one")
+    assert cache.get("one", "mac") is None
+    assert cache.get("two", "mac") == {"b": 2}
+    cache.invalidate()
+    assert not len(cache)
+
+
+def test_endpoint_ttls_expands_classes():
+    """Test that an Endpoints class stands for every endpoint within it,
+    and that later entries override earlier ones"""
+    ttls = Cache.endpoint_ttls(
+        {Endpoints.Clients: 5, Endpoints.Clients.Client.RF: 1}
+    )
+    assert ttls[Endpoints.Clients.List] == 5
+    assert ttls[Endpoints.Clients.Client.QoS] == 5
+    assert ttls[Endpoints.Clients.Client.RF] == 1
+    assert Endpoints.Dashboard not in ttls
+
+
+def test_response_cache_coalesces_concurrent_requests():
+    """Test that identical requests made at the same time share one call"""
+    cache = Cache.ResponseCache(ttls={"endpoint": 60})
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "response"
+
+    def fetch(params):
+        return cache.fetch("get", "endpoint", params, slow)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(fetch, {"b": 2, "a": 1}) for _ in range(3)]
+        futures.append(pool.submit(fetch, [("a", 1), ("b", 2)]))
+        while cache.coalesced < 3:
+            time.sleep(0.01)
+        release.set()
+    assert [f.result() for f in futures] == ["response"] * 4
+    assert len(calls) == 1
+    assert fetch({"a": 1, "b": 2}) == "response"
+    assert cache.hits == 1
+
+
+def test_response_cache_skips_unlisted_endpoints():
+    """Test that endpoints without a TTL are always requested"""
+    cache = Cache.ResponseCache(ttls={})
+    calls = []
+    for _ in range(2):
+        cache.fetch("get", "endpoint", None, lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_response_cache_discards_by_params():
+    """Test that discarding by parameters only drops responses to requests having all
+    of them, whatever their other parameters"""
+    cache = Cache.ResponseCache(ttls={"one": 60, "two": 60})
+    for params in ({"mac": "a", "page": 1}, {"mac": "a", "page": 2}, {"mac": "b"}):
+        cache.fetch("get", "one", params, lambda: "response")
+    cache.fetch("get", "two", {"mac": "a"}, lambda: "response")
+    cache.discard("one", {"mac": "a"})
+    assert len(cache) == 2
+    cache.discard("one")
+    assert len(cache) == 1
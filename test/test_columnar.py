@@ -0,0 +1,41 @@
+"""
+Tests for the column-oriented client tables in cisco_wlc_api.Columnar
+"""
+
+from math import isnan
+
+# pylint: disable=import-error
+from src.cisco_wlc_api.Columnar import ClientColumns
+
+
+def rf(ap: str, rssi: str) -> dict:
+    """Builds a minimal Endpoints.Clients.Client.RF response"""
+    return {
+        "data": [
+            {"key": "AP Name", "value": ap},
+            {"key": "RSSI", "value": rssi},
+            {"key": "volume", "value": "100"},
+        ]
+    }
+
+
+def test_columns_filter_group_and_aggregate():
+    """Test building a table, then filtering, grouping and aggregating it"""
+    table = ClientColumns.from_responses(
+        {
+            "aa:bb:cc:dd:ee:01": rf("ap1", "-40"),
+            "aa:bb:cc:dd:ee:02": rf("ap1", "-80"),
+            "aa:bb:cc:dd:ee:03": rf("ap2", "-60"),
+            "aa:bb:cc:dd:ee:04": {"data": []},
+        }
+    )
+    assert len(table) == 4
+    assert table.row("aa:bb:cc:dd:ee:03")["rf_rssi"] == -60
+    assert isnan(table.row("aa:bb:cc:dd:ee:04")["rf_rssi"])
+    weak = table.select(table.mask("rf_rssi", lambda v: v < -50))
+    assert weak.macs == ["aa:bb:cc:dd:ee:02", "aa:bb:cc:dd:ee:03"]
+    groups = table.group_by("ap")
+    assert groups["ap1"].total("bytes_total") == 200
+    assert groups["ap1"].percentile("rf_rssi", 50) == -60
+    assert table.percentile("rf_rssi", 100) == -40
+    assert table.mean("rf_rssi") == -60
@@ -0,0 +1,58 @@
+"""
+Tests for the concurrent request helpers in cisco_wlc_api.Concurrency
+"""
+
+import threading
+
+import pytest
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import Concurrency
+
+
+def test_fan_out_returns_results_by_key():
+    """Test that each call's result is returned under its own key"""
+    assert Concurrency.fan_out({"a": lambda: 1, "b": lambda: 2}) == {"a": 1, "b": 2}
+    assert not Concurrency.fan_out({})
+
+
+def test_fan_out_runs_concurrently():
+    """Test that calls are actually in flight at the same time"""
+    barrier = threading.Barrier(3, timeout=5)
+    results = Concurrency.fan_out(
+        {key: barrier.wait for key in range(3)}, max_workers=3
+    )
+    assert sorted(results.values()) == [0, 1, 2]
+
+
+def test_fan_out_raises_first_exception():
+    """Test that an exception in any call is raised to the caller"""
+
+    def fail():
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        Concurrency.fan_out({"ok": lambda: 1, "bad": fail})
+
+
+def test_sweep_isolates_failures():
+    """Test that a failing call only fails the item it belongs to, and that
+    the finish callback and progress reporting see every item"""
+    seen = []
+
+    def fail():
+        raise KeyError("boom")
+
+    result = Concurrency.sweep(
+        {
+            "good": {"a": lambda: 1, "b": lambda: 2},
+            "bad": {"a": lambda: 1, "b": fail},
+        },
+        finish=lambda key, results: sum(results.values()),
+        max_workers=2,
+        progress=lambda done, total: seen.append((done, total)),
+    )
+    assert result.results == {"good": 3}
+    assert isinstance(result.errors["bad"], KeyError)
+    assert not result.ok
+    assert seen[-1] == (2, 2)
@@ -0,0 +1,172 @@
+"""
+Tests pertaining to cisco_wlc_api.Emulator, and the library running against it
+"""
+
+import asyncio
+
+import pytest
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import AsyncCiscoWLCAPI, CiscoWLCAPI, Endpoints
+from src.cisco_wlc_api.Emulator import (
+    Fixtures,
+    RecordingAdapter,
+    Recordings,
+    WLCEmulator,
+)
+
+
+def wlc_for(emulator: WLCEmulator, **kwargs) -> CiscoWLCAPI:
+    """Builds a CiscoWLCAPI answered in-process by an emulator"""
+    return CiscoWLCAPI(
+        base_uri="https://127.0.0.1",
+        credentials=("admin", "password"),
+        transport=emulator.adapter(),
+        backoff=(0, 0),
+        **kwargs,
+    )
+
+
+def test_clients_are_paged_and_refreshed():
+    """Test that every client is listed over several pages, and can be refreshed"""
+    emulator = WLCEmulator(Fixtures(clients=1250, aps=4, apps=3))
+    wlc = wlc_for(emulator)
+    clients = wlc.clients
+    assert len(clients) == wlc.client_count == 1250
+    assert [c.MAC for c in clients] == sorted(c.MAC for c in clients)
+    result = wlc.refresh_all_clients(clients[:10])
+    assert result.ok
+    assert clients[0].assocap == "AP-0000"
+    assert len(wlc.aps) == 4
+    assert wlc.system.status.client_count == 1250
+    assert emulator.logins == 1
+
+
+def test_wrong_credentials_are_refused():
+    """Test that the emulator only accepts the credentials it's given"""
+    wlc = CiscoWLCAPI(
+        base_uri="https://127.0.0.1",
+        credentials=("admin", "wrong"),
+        transport=WLCEmulator().adapter(),
+    )
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseStatusError):
+        wlc.login()
+    assert not wlc.authenticated
+
+
+def test_expiry_and_errors_are_recovered_from():
+    """Test that expired sessions are renewed and server errors retried transparently"""
+    emulator = WLCEmulator(Fixtures(clients=20), expire_after=3, error_rate=0.2, seed=4)
+    wlc = wlc_for(emulator, response_cache_ttls={}, retries=5)
+    for _ in range(6):
+        assert wlc.client_count == 20
+    assert emulator.logins > 1
+    assert wlc.session.stats.statuses.get(503, 0) > 0
+
+
+
+def test_concurrent_sweeps_survive_expiry():
+    """Test that sessions expiring midway through concurrent sweeps are renewed for
+    every request, including those sent while another thread was logging in"""
+    emulator = WLCEmulator(Fixtures(clients=100), expire_after=50, seed=1)
+    wlc = wlc_for(emulator, max_in_flight=8, response_cache_ttls={})
+    clients = wlc.clients
+    for _ in range(2):
+        result = wlc.refresh_all_clients(clients)
+        assert result.errors == {}
+        assert wlc.authenticated
+    assert emulator.logins > 2
+
+def test_recorded_responses_replay_without_fixtures(tmp_path):
+    """Test that responses recorded from a WLC served over HTTP replay in-process"""
+    recorder = RecordingAdapter()
+    with WLCEmulator(Fixtures(clients=5)).serve() as server:
+        live = CiscoWLCAPI(
+            base_uri=server.base_uri,
+            credentials=("admin", "password"),
+            transport=recorder,
+        )
+        macs = [c.MAC for c in live.clients]
+    recorder.recordings.save(str(tmp_path / "wlc.json"))
+    recordings = Recordings.load(str(tmp_path / "wlc.json"))
+    assert len(recordings) == len(recorder.recordings) > 0
+    replay = wlc_for(WLCEmulator(fixtures=None, recordings=recordings))
+    assert [c.MAC for c in replay.clients] == macs
+    assert replay.session.get(Endpoints.System.Status).status_code == 404
+
+
+def test_async_transport():
+    """Test that the async client can be answered by the emulator in-process"""
+    pytest.importorskip("httpx")
+    emulator = WLCEmulator(Fixtures(clients=7))
+
+    async def run():
+        async with AsyncCiscoWLCAPI(
+            base_uri="https://127.0.0.1",
+            credentials=("admin", "password"),
+            transport=emulator.async_transport(),
+        ) as wlc:
+            return await wlc.client_count
+
+    assert asyncio.run(run()) == 7
+
+
+def test_iter_clients_requests_pages_lazily():
+    """Test that pages are only requested as the generator reaches them, iteration
+    stops at the first short page, and prefetching yields the same clients"""
+    emulator = WLCEmulator(Fixtures(clients=25))
+    wlc = wlc_for(emulator)
+    wlc.login()
+    before = emulator.requests
+    clients = wlc.iter_clients(page_size=10)
+    assert emulator.requests == before
+    macs = [next(clients).MAC]
+    assert emulator.requests == before + 1
+    macs += [next(clients).MAC for _ in range(9)]
+    assert emulator.requests == before + 1
+    macs.append(next(clients).MAC)
+    assert emulator.requests == before + 2
+    macs += [client.MAC for client in clients]
+    # pages of 10, 10 and 5; the short page means no fourth is requested
+    assert emulator.requests == before + 3
+    assert macs == [row["macaddr"] for row in emulator.fixtures.clients]
+    assert [c.MAC for c in wlc.iter_clients(page_size=10, prefetch=True)] == macs
+
+
+
+def test_invalidated_client_is_requested_again():
+    """Test that invalidating a client discards its responses from the session's
+    response cache too, so that the next refresh reaches the WLC"""
+    emulator = WLCEmulator(Fixtures(clients=3))
+    wlc = wlc_for(emulator)
+    client = wlc.clients[0]
+    client.refresh_rf()
+    before = emulator.requests
+    client.refresh_rf()
+    assert emulator.requests == before
+    client.invalidate("rf")
+    client.refresh_rf()
+    assert emulator.requests == before + 1
+    client.invalidate()
+    client.refresh_rf()
+    assert emulator.requests == before + 2
+
+def test_async_sweeps_survive_expiry():
+    """Test that the async client renews sessions expiring under concurrent requests"""
+    pytest.importorskip("httpx")
+    emulator = WLCEmulator(Fixtures(clients=40), expire_after=50, latency=0.002)
+
+    async def run():
+        async with AsyncCiscoWLCAPI(
+            base_uri="https://127.0.0.1",
+            credentials=("admin", "password"),
+            transport=emulator.async_transport(),
+            max_in_flight=8,
+        ) as wlc:
+            clients = await wlc.clients
+            await asyncio.gather(*(client.refresh() for client in clients))
+            return wlc.authenticated
+
+    assert asyncio.run(run())
+    assert emulator.logins > 2
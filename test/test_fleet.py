@@ -0,0 +1,35 @@
+"""
+Tests pertaining to cisco_wlc_api.Fleet.CiscoWLCFleet
+"""
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import CiscoWLCFleet
+
+
+def test_add_sizes_pools_to_budget():
+    """Test that each WLC's connection pool and in-flight limit follow its budget"""
+    fleet = CiscoWLCFleet(budget=3)
+    small = fleet.add("small", "https://127.0.0.1", ("admin", "password"))
+    large = fleet.add("large", "https://127.0.0.2", ("admin", "password"), budget=12)
+    assert len(fleet) == 2
+    assert fleet["small"] is small
+    assert small.session.max_in_flight == 3
+    # pylint: disable=protected-access
+    assert small.session.get_adapter("https://127.0.0.1")._pool_maxsize == 3
+    assert large.session.get_adapter("https://127.0.0.2")._pool_maxsize == 12
+
+
+def test_each_records_failures():
+    """Test that a failing WLC is recorded in errors without failing the others"""
+    fleet = CiscoWLCFleet()
+    fleet.add("one", "https://127.0.0.1", ("admin", "password"))
+    fleet.add("two", "https://127.0.0.2", ("admin", "password"))
+
+    def only_one(controller):
+        if controller is fleet["two"]:
+            raise ConnectionError("unreachable")
+        return 1
+
+    result = fleet.each(only_one)
+    assert result.results == {"one": 1}
+    assert list(fleet.errors) == ["two"]
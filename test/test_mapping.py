@@ -0,0 +1,55 @@
+"""
+Tests for the key-value mappers in cisco_wlc_api.Mapping
+"""
+
+import pytest
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import Endpoints
+from src.cisco_wlc_api.Mapping import KVMapper
+
+
+def kv(values: dict) -> list:
+    """Builds a key-value list like those returned by the WLC"""
+    return [{"key": k, "value": v} for (k, v) in values.items()]
+
+
+def test_maps_coerces_and_converts():
+    """Test that wanted keys are renamed, coerced and converted in one pass"""
+    mapper = KVMapper(Endpoints.Clients.Client.Maps.Network, types={"VLAN": int})
+    assert mapper(
+        kv(
+            {
+                "IP Address": "10.0.0.1",
+                "IPv6 Address": "Unknown",
+                "VLAN": "10",
+                "Fastlane Client": "No",
+                "Mobility Role": "Local",
+                "Not Mapped": "Yes",
+            }
+        )
+    ) == {
+        "IP4": "10.0.0.1",
+        "IP6": None,
+        "VLAN": 10,
+        "is_fastlane": False,
+        "mobility_role": "Local",
+    }
+
+
+def test_errors():
+    """Test that missing data and unconvertible values raise the module's exceptions"""
+    mapper = KVMapper({"VLAN": "VLAN"}, types={"VLAN": int})
+    with pytest.raises(CiscoWLCExceptions.QueryReturnedNoResultsError):
+        mapper(None)
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseValueError):
+        mapper(kv({"VLAN": "ten"}))
+
+
+def test_batch():
+    """Test that many lists, or the responses holding them, are mapped at once"""
+    mapper = KVMapper({"WMM": "wmm"})
+    assert mapper.batch(
+        {"a": kv({"WMM": "Yes"}), "b": {"data": kv({"WMM": "no"})}}
+    ) == {"a": {"wmm": True}, "b": {"wmm": False}}
@@ -0,0 +1,169 @@
+"""
+Tests for the models in cisco_wlc_api.Models
+"""
+
+import pytest
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import Endpoints
+from src.cisco_wlc_api.Cache import ModelCache
+from src.cisco_wlc_api.Models import Application, Client
+
+
+def test_models_are_compact():
+    """Test that models don't carry a per-instance __dict__, or raw responses
+    unless asked to"""
+    client = Client(session=None, macaddr="aa:bb:cc:dd:ee:ff")
+    app = Application(name="web", bytes_total=1, session=None)
+    assert not hasattr(client, "__dict__")
+    assert not hasattr(app, "__dict__")
+    # pylint: disable=protected-access
+    assert client._last is None
+    assert Client(session=None, macaddr="aa:bb:cc:dd:ee:ff", keep_raw=True)._last
+
+
+def kv(values: dict) -> dict:
+    """Builds a response body holding a key-value list like those returned by the WLC"""
+    return {"data": [{"key": k, "value": v} for (k, v) in values.items()]}
+
+
+def test_fields_are_parsed_lazily():
+    """Test that detail fields are parsed on first access, remembered, and discarded
+    by the next refresh of their group"""
+    client = Client(session=None, macaddr="aa:bb:cc:dd:ee:ff")
+    assert client.VLAN is None
+    # pylint: disable=protected-access
+    client._apply_refresh(
+        {
+            "network": kv(
+                {"IP Address": "10.0.0.1", "IPv6 Address": "::1", "VLAN": "10"}
+            ),
+            "security": kv({"ACL (IP/IPv6)": "v4acl/v6acl"}),
+        }
+    )
+    assert client.IP4 == "10.0.0.1"
+    assert client._parsed is None
+    assert client.VLAN == 10
+    assert client._parsed == {"VLAN": 10}
+    assert (client.security_acl_v4, client.security_acl_v6) == ("v4acl", "v6acl")
+    client._apply_refresh({"security": kv({"ACL (IP/IPv6)": "none/none"})})
+    assert client.security_acl_v6 == "none"
+    assert client.VLAN == 10
+
+
+def test_bad_fields_raise_on_access():
+    """Test that a malformed value only raises once the field it belongs to is read"""
+    client = Client(session=None, macaddr="aa:bb:cc:dd:ee:ff")
+    # pylint: disable=protected-access
+    client._apply_refresh(
+        {"rf": kv({"Hostname": "host", "Device Type": "phone", "RSSI": "n/a"})}
+    )
+    assert client.Hostname == "host"
+    assert client.rf_snr is None
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseValueError):
+        _ = client.rf_rssi
+
+
+def test_missing_keys_dont_fail_refresh():
+    """Test that bodies missing the keys set straight away still refresh, keeping the
+    current values of those attributes"""
+    client = Client(session=None, macaddr="aa:bb:cc:dd:ee:ff", hostname="old")
+    # pylint: disable=protected-access
+    client._apply_refresh({"network": kv({"VLAN": "10"}), "rf": kv({"RSSI": "-50"})})
+    assert (client.Hostname, client.IP4) == ("old", None)
+    assert (client.VLAN, client.rf_rssi) == (10, -50)
+
+
+class RecordingSession:
+    """Stands in for a CiscoWLCAPISession, answering every detail endpoint with an
+    RF-shaped key-value list and recording which endpoints were requested"""
+
+    def __init__(self):
+        self.endpoints = []
+
+    def get_json(self, url, params=None):
+        """Records the endpoint and returns a key-value list"""
+        self.endpoints.append(url)
+        return kv({"Hostname": "host", "Device Type": "phone", "RSSI": "-50"})
+
+
+def test_selective_refresh():
+    """Test that refreshing some fields only requests the endpoints they come from"""
+    assert Client.groups_for(["rf_rssi", "VLAN", "uptime"]) == ("network", "rf")
+    with pytest.raises(CiscoWLCExceptions.NoPropertyError):
+        Client.groups_for(["MAC"])
+    session = RecordingSession()
+    client = Client(session=session, macaddr="aa:bb:cc:dd:ee:ff")
+    client.refresh(fields=["rf_rssi", "Hostname"], concurrent=True)
+    assert session.endpoints == [Endpoints.Clients.Client.RF]
+    assert client.rf_rssi == -50
+
+
+class FailingSession(RecordingSession):
+    """Stands in for a CiscoWLCAPISession whose network endpoint fails once told to,
+    and whose RF details change on every request"""
+
+    def __init__(self):
+        super().__init__()
+        self.fail = False
+
+    def get_json(self, url, params=None):
+        """Raises for the network endpoint if failing, else returns a key-value list"""
+        self.endpoints.append(url)
+        if url == Endpoints.Clients.Client.Network:
+            if self.fail:
+                raise CiscoWLCExceptions.UnexpectedResponseStatusError("HTTP 500")
+            return kv({"IP Address": "10.0.0.1", "VLAN": "10"})
+        rssi = -50 - len(self.endpoints)
+        return kv({"Hostname": "host", "Device Type": "phone", "RSSI": str(rssi)})
+
+
+def test_failed_concurrent_refresh_changes_nothing():
+    """Test that when one endpoint of a concurrent refresh fails, the exception is
+    raised and none of the other endpoints' data is applied"""
+    session = FailingSession()
+    client = Client(session=session, macaddr="aa:bb:cc:dd:ee:ff", cache_ttl=0)
+    client.refresh(fields=["rf_rssi", "VLAN"], concurrent=True)
+    before = (client.rf_rssi, client.VLAN, client.IP4)
+    session.fail = True
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseStatusError):
+        client.refresh(fields=["rf_rssi", "VLAN"], concurrent=True)
+    assert session.endpoints.count(Endpoints.Clients.Client.RF) == 2
+    assert (client.rf_rssi, client.VLAN, client.IP4) == before
+
+
+class AppsSession:
+    """Stands in for a CiscoWLCAPISession serving a client's applications a page at
+    a time, ignoring any filtering like the WLC does"""
+
+    def __init__(self, count: int):
+        self.rows = [{"name": f"app{n}", "bytes_total": str(n)} for n in range(count)]
+        self.tables = ModelCache(maxsize=64)
+        self.max_in_flight = 2
+        self.requests = 0
+
+    def get_json(self, url, params=None):
+        """Serves a page of rows according to skip and take"""
+        assert url == Endpoints.Clients.Client.Apps
+        self.requests += 1
+        page = self.rows[params["skip"] : params["skip"] + params["take"]]
+        return {"data": page, "total": len(self.rows)}
+
+
+def test_client_apps_are_paged_and_shared():
+    """Test that a client's applications are paged through in full once, and every
+    Application of the client refreshes from that one table"""
+    session = AppsSession(count=250)
+    client = Client(session=session, macaddr="aa:bb:cc:dd:ee:ff")
+    apps = client.apps
+    assert len(apps) == 250
+    assert session.requests == 3
+    for app in apps[:10]:
+        app.BytesTotal = None
+        app.refresh()
+    assert [app.BytesTotal for app in apps[:3]] == [0, 1, 2]
+    assert session.requests == 3
+    apps[0].invalidate()
+    apps[0].refresh()
+    assert session.requests == 6
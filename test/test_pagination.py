@@ -0,0 +1,87 @@
+"""
+Tests for the query building and pagination in cisco_wlc_api.Pagination
+"""
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import Pagination
+
+
+class FakeResponse:
+    """Stands in for a requests.Response with a JSON body"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        """Returns the body this response was created with"""
+        return self.body
+
+
+class FakeSession:
+    """Stands in for a CiscoWLCAPISession serving a Kendo-style table"""
+
+    def __init__(self, rows, total=True):
+        self.rows = rows
+        self.total = total
+        self.requests = []
+
+    def get(self, url, params=None):
+        """Serves a page of rows according to skip and take"""
+        self.requests.append((url, params))
+        page = self.rows[params["skip"] : params["skip"] + params["take"]]
+        return FakeResponse(
+            {"data": page, "total": len(self.rows)} if self.total else {"data": page}
+        )
+
+    def get_json(self, url, params=None):
+        """Serves a page of rows, already decoded"""
+        return self.get(url, params=params).json()
+
+
+def test_query_params():
+    """Test that sorting, filtering and paging are built into Kendo parameters"""
+    params = Pagination.Query(
+        sort=[("bytes_total", "desc")],
+        filters=[("name", "eq", "web")],
+        page_size=50,
+        extra={"deviceMacAddress": "aa:bb:cc:dd:ee:ff"},
+    ).params(page=3)
+    assert params == {
+        "deviceMacAddress": "aa:bb:cc:dd:ee:ff",
+        "take": 50,
+        "pageSize": 50,
+        "page": 3,
+        "skip": 100,
+        "sort[0][field]": "bytes_total",
+        "sort[0][dir]": "desc",
+        "filter[logic]": "and",
+        "filter[filters][0][field]": "name",
+        "filter[filters][0][operator]": "eq",
+        "filter[filters][0][value]": "web",
+    }
+
+
+def test_paginate_requests_every_page():
+    """Test that every page is requested once, and rows are returned in order"""
+    session = FakeSession(list(range(23)))
+    rows = Pagination.paginate(session, "table", Pagination.Query(page_size=5))
+    assert rows == list(range(23))
+    assert sorted(p["skip"] for (_, p) in session.requests) == [0, 5, 10, 15, 20]
+
+
+def test_paginate_without_total():
+    """Test that tables without a total are walked until a short page"""
+    session = FakeSession(list(range(10)), total=False)
+    rows = Pagination.paginate(session, "table", Pagination.Query(page_size=5))
+    assert rows == list(range(10))
+    assert len(session.requests) == 3
+
+
+def test_iter_rows_prefetch():
+    """Test that rows are yielded lazily in order, with or without prefetching"""
+    for prefetch in (False, True):
+        session = FakeSession(list(range(12)))
+        rows = Pagination.iter_rows(
+            session, "table", Pagination.Query(page_size=5), prefetch=prefetch
+        )
+        assert list(rows) == list(range(12))
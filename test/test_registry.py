@@ -0,0 +1,85 @@
+"""
+Tests for the incrementally-updated tables in cisco_wlc_api.Registry
+"""
+
+import pytest
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import Registry
+
+
+def row(mac: str, hostname: str, ip4: str) -> dict:
+    """Builds a row of the client table"""
+    return {"macaddr": mac, "HN": hostname, "IP": ip4, "devtype": "phone"}
+
+
+def test_sync_reports_deltas_and_reuses_clients():
+    """Test that syncing reports joined, left and changed clients, and reuses
+    Client objects for clients that are still present"""
+    registry = Registry.ClientRegistry(session=None)
+    delta = registry.sync(
+        [
+            row("aa:bb:cc:dd:ee:01", "one", "10.0.0.1"),
+            row("aa:bb:cc:dd:ee:02", "two", "10.0.0.2"),
+        ]
+    )
+    assert len(delta.joined) == 2
+    (first, second) = delta.joined
+
+    delta = registry.sync(
+        [
+            row("aa:bb:cc:dd:ee:01", "one", "10.0.0.11"),
+            row("aa:bb:cc:dd:ee:03", "three", "10.0.0.3"),
+        ]
+    )
+    assert [c.MAC for c in delta.joined] == ["aa:bb:cc:dd:ee:03"]
+    assert delta.left == [second]
+    assert delta.changed == {first: ("IP4",)}
+    assert first.IP4 == "10.0.0.11"
+    assert "aa:bb:cc:dd:ee:02" not in registry
+
+    assert not registry.sync(
+        [
+            row("aa:bb:cc:dd:ee:01", "one", "10.0.0.11"),
+            row("aa:bb:cc:dd:ee:03", "three", "10.0.0.3"),
+        ]
+    )
+
+
+def test_lookups_follow_changes():
+    """Test that clients can be looked up by MAC, IP and hostname, and that
+    the indexes follow clients whose addresses change"""
+    registry = Registry.ClientRegistry(session=None)
+    registry.sync(
+        [
+            row("AA:BB:CC:DD:EE:01", "Laptop", "10.0.0.1"),
+            row("aa:bb:cc:dd:ee:02", "phone", "10.0.0.2"),
+        ]
+    )
+    laptop = registry.get_by_mac("aa:bb:cc:dd:ee:01")
+    assert registry.get_by_mac("AA:BB:CC:DD:EE:01") is laptop
+    assert registry.get_by_ip("10.0.0.1") is laptop
+    assert registry.get_by_hostname("laptop") == [laptop]
+
+    registry.sync(
+        [
+            row("aa:bb:cc:dd:ee:01", "laptop", "10.0.0.2"),
+            row("aa:bb:cc:dd:ee:02", "phone", "10.0.0.3"),
+        ]
+    )
+    assert registry.get_by_ip("10.0.0.1") is None
+    assert registry.get_by_ip("10.0.0.2") is laptop
+    assert registry.get_by_ip("10.0.0.3").Hostname == "phone"
+
+    registry.sync([row("aa:bb:cc:dd:ee:02", "phone", "10.0.0.3")])
+    assert registry.get_by_mac("aa:bb:cc:dd:ee:01") is None
+    assert registry.get_by_ip("10.0.0.2") is None
+    assert not registry.get_by_hostname("laptop")
+
+
+def test_lookup_by_mac_validates():
+    """Test that malformed MAC addresses are rejected"""
+    registry = Registry.ClientRegistry(session=None)
+    with pytest.raises(CiscoWLCExceptions.WLCAssertionException):
+        registry.get_by_mac("aabbccddee01")
@@ -0,0 +1,83 @@
+"""
+Tests pertaining to bulk RF metrics in cisco_wlc_api.WLC.CiscoWLCAPI.refresh_rf_stats
+"""
+
+import pytest
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import Endpoints
+from src.cisco_wlc_api.Models import Client
+
+# The client performance table, which lacks a client and one of another client's columns
+TABLE = [
+    {
+        "macaddr": "aa:bb:cc:dd:ee:01",
+        "RSSI": "-40",
+        "SNR": "50",
+        "ConnRate": "866",
+        "ConnScore": "100",
+        "Channel": "36",
+    },
+    {
+        "macaddr": "aa:bb:cc:dd:ee:02",
+        "RSSI": "-70",
+        "ConnRate": "144",
+        "ConnScore": "40",
+        "Channel": "1",
+    },
+]
+# Every client's RF details
+RF = {"Hostname": "host", "Device Type": "phone", "SNR": "20"}
+ROUTES = {
+    Endpoints.RF.Performance.ClientStats: {"data": TABLE, "total": len(TABLE)},
+    Endpoints.Clients.Client.RF: {
+        "data": [{"key": k, "value": v} for (k, v) in RF.items()]
+    },
+}
+
+
+def test_rf_stats_fill_clients_and_fall_back(fake_wlc):
+    """Test that the performance table fills every client it covers with a single
+    request, and only clients missing from it are refreshed individually"""
+    (wlc, adapter) = fake_wlc(ROUTES, response_cache_ttls={})
+    wlc.registry.sync(
+        [
+            {"macaddr": f"aa:bb:cc:dd:ee:0{n}", "HN": "", "IP": "", "devtype": ""}
+            for n in (1, 2, 3)
+        ]
+    )
+    result = wlc.refresh_rf_stats()
+    assert result.ok
+    (first, second, third) = (
+        wlc.registry.get_by_mac(f"aa:bb:cc:dd:ee:0{n}") for n in (1, 2, 3)
+    )
+    assert (first.rf_rssi, first.rf_snr, first.rf_channel) == (-40, 50, 36)
+    assert (second.rf_rssi, second.rf_snr) == (-70, 20)
+    assert third.rf_snr == 20
+    assert result.results["aa:bb:cc:dd:ee:02"]["rf_rate"] == 144
+    assert adapter.paths.count(Endpoints.RF.Performance.ClientStats) == 1
+    assert adapter.paths.count(Endpoints.Clients.Client.RF) == 2
+
+
+def test_rf_stats_match_macs_in_any_case(fake_wlc):
+    """Test that table rows match clients whose MACs differ only in case, without
+    falling back to per-client requests"""
+    (wlc, adapter) = fake_wlc(ROUTES, response_cache_ttls={})
+    client = Client(session=wlc.session, macaddr="AA:BB:CC:DD:EE:01")
+    result = wlc.refresh_rf_stats([client])
+    assert result.ok
+    assert (client.rf_rssi, client.rf_snr) == (-40, 50)
+    assert adapter.paths.count(Endpoints.Clients.Client.RF) == 0
+
+
+def test_rf_stats_columns_are_validated(fake_wlc):
+    """Test that columns may map to plain attributes, but not to unknown fields"""
+    (wlc, adapter) = fake_wlc(ROUTES, response_cache_ttls={})
+    with pytest.raises(CiscoWLCExceptions.NoPropertyError):
+        wlc.refresh_rf_stats([], columns={"RSSI": "rf_nonsense"})
+    assert Endpoints.RF.Performance.ClientStats not in adapter.paths
+    client = Client(session=wlc.session, macaddr="aa:bb:cc:dd:ee:01")
+    result = wlc.refresh_rf_stats([client], columns={"macaddr": "Hostname"})
+    assert result.ok
+    assert client.Hostname == "aa:bb:cc:dd:ee:01"
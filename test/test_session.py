@@ -0,0 +1,170 @@
+"""
+Tests pertaining to the transport and authentication behaviour of
+cisco_wlc_api.Core.CiscoWLCAPISession
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import Endpoints
+from src.cisco_wlc_api.Core import CiscoWLCAPISession
+
+
+def session_with(fake_adapter, outcomes, **kwargs) -> tuple:
+    """Builds a session whose requests are answered with each scripted outcome in
+    turn, either a status code or an exception to raise"""
+    session = CiscoWLCAPISession(
+        base_uri="https://127.0.0.1",
+        credentials=("admin", "password"),
+        backoff=(0, 0),
+        response_cache_ttls={},
+        **kwargs,
+    )
+    outcomes = list(outcomes)
+    adapter = fake_adapter(default=lambda _request, _params: outcomes.pop(0))
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def test_get_retries_connection_errors_and_5xx(fake_adapter):
+    """Test that GETs are retried after connection errors and 5xx responses"""
+    (session, adapter) = session_with(
+        fake_adapter, [requests.ConnectionError(), 503, 200], timeout=(1, 2)
+    )
+    assert session.get("endpoint").status_code == 200
+    assert [sent["timeout"] for sent in adapter.sent] == [(1, 2)] * 3
+    assert session.stats.requests == 3
+    assert session.stats.retries == 2
+    assert session.stats.failures == 1
+    assert session.stats.statuses == {503: 1, 200: 1}
+
+
+def test_retries_are_bounded(fake_adapter):
+    """Test that the final failure is returned or raised once retries run out"""
+    (session, _) = session_with(fake_adapter, [500, 500], retries=1)
+    assert session.get("endpoint").status_code == 500
+    (session, _) = session_with(
+        fake_adapter, [requests.Timeout(), requests.Timeout()], retries=1
+    )
+    with pytest.raises(requests.Timeout):
+        session.get("endpoint")
+
+
+def test_failed_responses_are_not_decoded(fake_adapter):
+    """Test that get_json raises a status error for a 5xx left once retries run out,
+    and for other failed responses, rather than decoding their bodies"""
+    (session, _) = session_with(fake_adapter, [503, 503, 404], retries=1)
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseStatusError):
+        session.get_json("endpoint")
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseStatusError):
+        session.get_json("endpoint")
+
+
+def test_post_is_not_retried(fake_adapter):
+    """Test that requests which aren't idempotent are never retried"""
+    (session, adapter) = session_with(fake_adapter, [503, 200])
+    assert session.post("endpoint").status_code == 503
+    assert len(adapter.sent) == 1
+
+
+class ExpiringWLC:
+    """The state of a WLC whose session can be expired on demand; every request but
+    the dashboard gets a 401 until the dashboard has been requested again"""
+
+    def __init__(self, challenge: bool = False):
+        self.challenge = challenge
+        # whether the credentials have stopped being accepted altogether
+        self.locked = False
+        self.valid = False
+        self.logins = 0
+        self.lock = threading.Lock()
+
+    def dashboard(self, _request, _params) -> int:
+        """Answers a login"""
+        with self.lock:
+            self.logins += 1
+            # optionally challenge the first attempt, like some WLC firmware does
+            status = 401 if self.challenge and self.logins == 1 else 200
+            status = 401 if self.locked else status
+            self.valid = status == 200
+            return status
+
+    def endpoint(self, _request, _params) -> int:
+        """Answers any other request"""
+        with self.lock:
+            return 200 if self.valid else 401
+
+
+def expiring_wlc(fake_wlc, **kwargs) -> tuple:
+    """Builds a CiscoWLCAPI whose requests are answered by an ExpiringWLC, and the
+    ExpiringWLC"""
+    state = ExpiringWLC(**kwargs)
+    (wlc, _) = fake_wlc(
+        {Endpoints.Dashboard: state.dashboard},
+        default=state.endpoint,
+        response_cache_ttls={},
+    )
+    return wlc, state
+
+
+def test_login_takes_one_round_trip(fake_wlc):
+    """Test that login only repeats its request when challenged"""
+    (wlc, controller) = expiring_wlc(fake_wlc)
+    assert wlc.login()
+    assert controller.logins == 1
+    (wlc, controller) = expiring_wlc(fake_wlc, challenge=True)
+    assert wlc.login()
+    assert controller.logins == 2
+    assert wlc.authenticated
+
+
+def test_expired_session_is_renewed_once_for_all_callers(fake_wlc):
+    """Test that concurrent requests on an expired session share one re-login"""
+    (wlc, controller) = expiring_wlc(fake_wlc)
+    wlc.login()
+    controller.valid = False
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(
+            pool.map(lambda _: wlc.session.get("endpoint").status_code, range(16))
+        )
+    assert statuses == [200] * 16
+    assert controller.logins == 2
+    assert wlc.authenticated
+
+
+def test_failed_renewal_raises_session_expired(fake_wlc):
+    """Test that a session which can't be renewed raises SessionExpiredError"""
+    (wlc, controller) = expiring_wlc(fake_wlc)
+    wlc.login()
+    (controller.valid, controller.locked) = (False, True)
+    with pytest.raises(CiscoWLCExceptions.SessionExpiredError):
+        wlc.session.get("endpoint")
+    assert not wlc.authenticated
+
+
+def test_responses_are_decoded_once(fake_adapter):
+    """Test that a response's body is decoded by json_decoder only once"""
+    calls = []
+
+    def decoder(body):
+        calls.append(body)
+        return {"data": []}
+
+    (session, _) = session_with(fake_adapter, [200], json_decoder=decoder)
+    response = session.get("endpoint")
+    assert session.decode() is session.decode(response)
+    assert session.map_kv({}) == {}
+    assert calls == [b"{}"]
+
+
+def test_invalid_json_raises(fake_adapter):
+    """Test that a body which isn't JSON raises UnexpectedResponseValueError"""
+    (session, _) = session_with(fake_adapter, [200])
+    session.get("endpoint")._content = b"<html>"
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseValueError):
+        session.decode()
@@ -0,0 +1,110 @@
+"""
+Tests pertaining to cisco_wlc_api.Store.SessionStore
+"""
+
+import json
+import os
+
+import pytest
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import Endpoints
+from src.cisco_wlc_api.Store import SessionStore
+
+
+class CookieWLC:
+    """The state of a WLC that issues a session cookie from the dashboard, and answers
+    every other request with a 401 unless it carries the current cookie"""
+
+    def __init__(self):
+        self.token = None
+        self.logins = 0
+
+    def dashboard(self, _request, _params) -> tuple:
+        """Answers a login with a new cookie"""
+        self.logins += 1
+        self.token = f"token{self.logins}"
+        return (200, {}, {"Set-Cookie": f"session={self.token}; Path=/"})
+
+    def endpoint(self, request, _params) -> int:
+        """Answers any other request"""
+        cookie = request.headers.get("Cookie", "")
+        return 200 if self.token and cookie == f"session={self.token}" else 401
+
+
+@pytest.fixture(name="wlc_with")
+def fixture_wlc_with(fake_wlc):
+    """Returns a function building a CiscoWLCAPI whose requests are answered by a
+    CookieWLC"""
+
+    def build(controller: CookieWLC, store, user: str = "admin"):
+        (wlc, _) = fake_wlc(
+            {Endpoints.Dashboard: controller.dashboard},
+            default=controller.endpoint,
+            credentials=(user, "password"),
+            response_cache_ttls={},
+            session_store=store,
+        )
+        return wlc
+
+    return build
+
+
+def test_saved_session_skips_login(tmp_path, wlc_with):
+    """Test that a new session restored from the store goes straight to requests"""
+    (adapter, store) = (CookieWLC(), SessionStore(str(tmp_path / "sessions")))
+    wlc_with(adapter, store).login()
+    assert oct(os.stat(store.path("https://127.0.0.1")).st_mode & 0o777) == "0o600"
+    wlc = wlc_with(adapter, store)
+    assert wlc.authenticated
+    assert wlc.session.get("endpoint").status_code == 200
+    assert adapter.logins == 1
+    # another user's saved session is never used
+    assert not wlc_with(adapter, store, user="other").authenticated
+
+
+def test_rejected_session_falls_back_to_login(tmp_path, wlc_with):
+    """Test that a saved session the WLC rejects is replaced by logging in again"""
+    (adapter, store) = (CookieWLC(), SessionStore(str(tmp_path)))
+    wlc_with(adapter, store).login()
+    adapter.token = "restarted"
+    wlc = wlc_with(adapter, store)
+    assert wlc.session.get("endpoint").status_code == 200
+    assert adapter.logins == 2
+    # the replacement was saved, so the next process is warm again
+    assert wlc_with(adapter, store).session.get("endpoint").status_code == 200
+    assert adapter.logins == 2
+
+
+def test_expired_session_is_not_restored(tmp_path, wlc_with):
+    """Test that sessions older than max_age are ignored"""
+    adapter = CookieWLC()
+    wlc_with(adapter, SessionStore(str(tmp_path))).login()
+    assert not wlc_with(adapter, SessionStore(str(tmp_path), max_age=0)).authenticated
+
+
+@pytest.mark.parametrize(
+    "mangle",
+    [
+        lambda saved: [saved],
+        lambda saved: {**saved, "saved": "yesterday"},
+        lambda saved: {**saved, "cookies": ["session=token1"]},
+        lambda saved: {**saved, "cookies": saved["cookies"] + [{"name": "other"}]},
+        lambda saved: {**saved, "cookies": [{**saved["cookies"][0], "expires": "soon"}]},
+    ],
+)
+def test_badly_shaped_session_is_not_restored(tmp_path, wlc_with, mangle):
+    """Test that a saved session file of the wrong shape is ignored, restoring nothing,
+    rather than raising"""
+    (adapter, store) = (CookieWLC(), SessionStore(str(tmp_path)))
+    wlc_with(adapter, store).login()
+    path = store.path("https://127.0.0.1")
+    with open(path, encoding="utf-8") as file:
+        saved = json.load(file)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(mangle(saved), file)
+    wlc = wlc_with(adapter, store)
+    assert not wlc.authenticated
+    assert len(wlc.session.cookies) == 0
+    assert wlc.login()
+    assert adapter.logins == 2
@@ -0,0 +1,95 @@
+"""
+Tests pertaining to the WLC's status and information, and the SystemPoller
+"""
+
+import threading
+
+# pylint: disable=import-error
+from src.cisco_wlc_api import Endpoints, Models, SystemPoller
+
+
+def kv(values: dict) -> dict:
+    """Builds a response body holding a key-value list like those returned by the WLC"""
+    return {"data": [{"key": k, "value": v} for (k, v) in values.items()]}
+
+
+def controller(fake_wlc, cpu: list = None) -> tuple:
+    """Returns a CiscoWLCAPI answering the system endpoints, with CPU usage taken from
+    the end of cpu, so that it only changes when told to, and its adapter"""
+    cpu = cpu if cpu is not None else ["12%"]
+    return fake_wlc(
+        {
+            Endpoints.System.Status: lambda _request, _params: kv(
+                {
+                    "CPU Usage": cpu[-1],
+                    "Memory Usage": "40 %",
+                    "Up Time": "2 days, 3 hours 4 mins 5 secs",
+                    "Clients": "40",
+                }
+            ),
+            Endpoints.System.Info: kv(
+                {"System Name": "wlc1", "Product Version": "8.10.151.0"}
+            ),
+        },
+        response_cache_ttls={},
+    )
+
+
+def test_status_and_info_are_parsed(fake_wlc):
+    """Test that status counters are converted, and missing ones are None"""
+    (wlc, _) = controller(fake_wlc)
+    status = wlc.system.status
+    assert status == Models.SystemStatus(
+        cpu=12.0,
+        memory=40.0,
+        uptime=2 * 86400 + 3 * 3600 + 4 * 60 + 5,
+        temperature=None,
+        ap_count=None,
+        client_count=40,
+    )
+    assert (wlc.system.info.name, wlc.system.info.version) == ("wlc1", "8.10.151.0")
+
+
+def test_poller_emits_only_changes_and_reuses_info(fake_wlc):
+    """Test that the first poll reports every field, later polls only what changed,
+    and information is only requested once"""
+    cpu = ["12%"]
+    (wlc, adapter) = controller(fake_wlc, cpu)
+    emitted = []
+    poller = SystemPoller({"wlc1": wlc}, emit=lambda *args: emitted.append(args))
+    try:
+        first = poller.poll()
+        assert first["wlc1"]["cpu"] == 12.0
+        assert first["wlc1"]["name"] == "wlc1"
+        assert poller.poll() == {}
+        cpu.append("55%")
+        assert poller.poll() == {"wlc1": {"cpu": 55.0}}
+    finally:
+        poller.stop()
+    assert emitted == [("wlc1", first["wlc1"]), ("wlc1", {"cpu": 55.0})]
+    assert adapter.paths.count(Endpoints.System.Status) == 3
+    assert adapter.paths.count(Endpoints.System.Info) == 1
+    assert adapter.paths.count(Endpoints.Dashboard) == 1
+
+
+def test_poller_keeps_running_when_emit_raises(fake_wlc):
+    """Test that an exception raised by emit is recorded, and polling carries on"""
+    cpu = ["12%"]
+    (wlc, _) = controller(fake_wlc, cpu)
+    polled = threading.Event()
+
+    def emit(_name, _fields):
+        # changing the CPU usage makes every poll emit, and so fail
+        cpu.append(f"{len(cpu) + 12}%")
+        if len(cpu) > 3:
+            polled.set()
+        raise RuntimeError("emit failed")
+
+    poller = SystemPoller({"wlc1": wlc}, interval=0.01, emit=emit)
+    poller.start()
+    try:
+        assert polled.wait(5)
+    finally:
+        poller.stop()
+    assert isinstance(poller.errors[None], RuntimeError)
+    assert poller.samples["wlc1"][1].cpu >= 14.0
@@ -175,3 +175,12 @@ def test_response_code_expected_response_code():
     assert CiscoWLCAPIValidators.response_code(response_test_a)
     assert CiscoWLCAPIValidators.response_code(response_test_b, expect=(200, 401))
     assert CiscoWLCAPIValidators.response_code(response_test_c, expect=(503,))
+
+
+def test_mac_validation():
+    """Test that MAC addresses are validated against Patterns.MAC"""
+    assert CiscoWLCAPIValidators.mac("aa:BB:cc:00:11:22")
+    with pytest.raises(CiscoWLCAPIExceptions.IncorrectTypeError):
+        CiscoWLCAPIValidators.mac(42)
+    with pytest.raises(CiscoWLCAPIExceptions.WLCAssertionException):
+        CiscoWLCAPIValidators.mac("aa-bb-cc-00-11-22")
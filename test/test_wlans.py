@@ -0,0 +1,74 @@
+"""
+Tests pertaining to the WLAN and AVC profile models and per-WLAN client usage
+"""
+
+import pytest
+
+# pylint: disable=import-error
+import src.cisco_wlc_api.Exceptions as CiscoWLCExceptions
+from src.cisco_wlc_api import Endpoints, Models, Registry
+
+# The WLAN, AVC profile and client tables
+TABLES = {
+    Endpoints.RF.List: [
+        {"wlanid": "1", "ssid": "corp", "profile": "corp", "avc_profile": "avc1"},
+        {"wlanid": "2", "ssid": "guest", "profile": "guest", "avc_profile": ""},
+    ],
+    Endpoints.RF.AVCProfile: [{"name": "avc1", "status": "Enabled"}],
+    Endpoints.Clients.List: [
+        {"macaddr": "aa:bb:cc:dd:ee:01", "ssid": "corp", "bytes_total": "100"},
+        {"macaddr": "aa:bb:cc:dd:ee:02", "ssid": "corp", "bytes_total": "23"},
+        {"macaddr": "aa:bb:cc:dd:ee:03", "ssid": "lab", "bytes_total": None},
+    ],
+}
+
+
+def test_wlans_and_usage_come_from_tables(fake_wlc):
+    """Test that WLANs and AVC profiles are built from their tables, which are cached,
+    and that per-WLAN usage only needs the client table"""
+    (wlc, adapter) = fake_wlc(
+        {path: {"data": rows, "total": len(rows)} for (path, rows) in TABLES.items()}
+    )
+    (corp, guest) = wlc.wlans
+    assert (corp.ID, corp.SSID, corp.AVCProfile) == (1, "corp", "avc1")
+    assert guest.SSID == "guest"
+    (profile,) = wlc.avc_profiles
+    assert (profile.Name, profile.Status) == ("avc1", "Enabled")
+    usage = wlc.wlan_usage()
+    assert usage == {
+        "corp": Models.WLANUsage(clients=2, bytes_total=123),
+        "guest": Models.WLANUsage(clients=0, bytes_total=0),
+        "lab": Models.WLANUsage(clients=1, bytes_total=0),
+    }
+    assert adapter.paths.count(Endpoints.RF.List) == 1
+    assert not any(path.startswith("data/client/") for path in adapter.paths)
+
+
+def test_registry_indexes_clients_by_ssid():
+    """Test that clients are indexed by the SSID in their row of the client table"""
+    registry = Registry.ClientRegistry(session=None)
+    row = {"macaddr": "aa:bb:cc:dd:ee:01", "HN": "", "IP": "", "devtype": ""}
+    registry.sync([dict(row, ssid="corp")])
+    client = registry.get_by_mac("aa:bb:cc:dd:ee:01")
+    assert registry.get_by_ssid("corp") == [client]
+    registry.sync([dict(row, ssid="guest")])
+    assert not registry.get_by_ssid("corp")
+    assert registry.get_by_ssid("guest") == [client]
+
+
+def test_usage_columns_are_mapped_and_checked(fake_wlc, monkeypatch):
+    """Test that usage is read from the columns in Endpoints.Clients.Maps.Usage, and
+    that a client table lacking them raises rather than reporting zeros"""
+    rows = [{"macaddr": "aa:bb:cc:dd:ee:01", "wlan": "corp", "volume": "7"}]
+    (wlc, _) = fake_wlc(
+        {
+            Endpoints.RF.List: {"data": TABLES[Endpoints.RF.List], "total": 2},
+            Endpoints.Clients.List: {"data": rows, "total": 1},
+        }
+    )
+    with pytest.raises(CiscoWLCExceptions.UnexpectedResponseValueError):
+        wlc.wlan_usage()
+    monkeypatch.setattr(
+        Endpoints.Clients.Maps, "Usage", {"wlan": "ssid", "volume": "bytes_total"}
+    )
+    assert wlc.wlan_usage()["corp"] == Models.WLANUsage(clients=1, bytes_total=7)